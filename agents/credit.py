@@ -1,38 +1,57 @@
-from typing import Dict, Any
-from utils.mock_data import get_customer_data
+from typing import Dict, Any, List, Optional
+from utils.credit_bureau import CREDIT_BUREAU, BUREAU_NAME, BureauClient
 
 class CreditAgent:
     """
     Credit Agent - Worker Agent
-    Fetches credit score from mock credit bureau API
+    Fetches credit score from the credit bureau (utils/credit_bureau.py)
     """
     
-    def __init__(self):
-        self.credit_bureau_name = "CIBIL"
+    def __init__(self, bureau: Optional[BureauClient] = None):
+        self.credit_bureau_name = BUREAU_NAME
+        self.bureau = bureau or CREDIT_BUREAU
     
     def get_credit_score(self, phone: str) -> Dict[str, Any]:
         """
-        Fetch credit score from customer database
-        In production: calls CIBIL/Experian/Equifax API
+        Fetch the customer's credit report; reports are cached per phone
+        until they are REPORT_VALIDITY_DAYS old.
+        Raises BureauError if the bureau cannot be reached. "score" is None
+        when the bureau has no record of the customer; neither case is a
+        passing score.
         """
+        report = self.bureau.pull(self._clean_phone(phone))
+        if report is None:
+            return {
+                "score": None,
+                "bureau": self.credit_bureau_name,
+                "max_score": 900,
+                "report_date": None,
+                "factors": {}
+            }
         
-        # Fetch customer data
-        customer = get_customer_data(phone)
-        
-        if customer and 'credit_score' in customer:
-            credit_score = customer['credit_score']
-        else:
-            # Fallback to a default score
-            credit_score = 700
-        
+        credit_score = report["score"]
         return {
             "score": credit_score,
-            "bureau": self.credit_bureau_name,
-            "max_score": 900,
-            "report_date": "2025-10-27",
+            "bureau": report.get("bureau", self.credit_bureau_name),
+            "max_score": report.get("max_score", 900),
+            "report_date": report["report_date"],
             "factors": self._get_credit_factors(credit_score)
         }
     
+    def get_credit_scores(self, phones: List[str]) -> List[Optional[int]]:
+        """
+        Scores only, for many customers at once with a bulk pull (batch
+        decisioning); None where the bureau has no record. Raises BureauError
+        if the bureau cannot be reached.
+        """
+        clean_phones = [self._clean_phone(phone) for phone in phones]
+        reports = self.bureau.pull_many(clean_phones)
+        return [reports[phone]["score"] if reports[phone] else None for phone in clean_phones]
+    
+    @staticmethod
+    def _clean_phone(phone: str) -> str:
+        return ''.join(filter(str.isdigit, phone))[-10:]
+    
     def _get_credit_factors(self, score: int) -> Dict[str, str]:
         """Get factors affecting credit score"""
         if score >= 800:
@@ -2,7 +2,7 @@ import joblib
 import pandas as pd
 import shap
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 class RiskAgent:
     """
@@ -122,6 +122,29 @@ class RiskAgent:
             print(f"❌ Error during risk prediction: {e}")
             return {"safety_score": 0.50, "explanation": "Error calculating score.", "error": str(e)}
 
+    def score_batch(self, customers: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Safety scores for many customers in one predict_proba call, without
+        explanations (batch decisioning). Same features and fallback as
+        get_safety_score.
+        """
+        fallback = np.full(len(customers), 0.50)
+        if self.model_pipeline is None or not customers:
+            return fallback
+        try:
+            customer_df = pd.DataFrame([{
+                "age": c.get('age', 30),
+                "salary": c.get('salary', c.get('monthly_income', 0)),
+                "preapproved_limit": c.get('preapproved_limit', c.get('pre_approved_limit', 0)),
+                "has_current_loan": 1 if c.get('current_loans', 'None') != 'None' else 0,
+                "has_collateral": 1 if c.get('collateral', 'None') != 'None' else 0,
+                "city": c.get('city', 'Unknown')
+            } for c in customers])
+            return np.round(self.model_pipeline.predict_proba(customer_df)[:, 0], 2)
+        except Exception as e:
+            print(f"❌ Error during batch risk prediction: {e}")
+            return fallback
+
     def _generate_text_explanation(self, shap_values, feature_names):
         """
         Converts SHAP numerical values into a simple English sentence.
@@ -1,10 +1,88 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Tuple
 import json
 import re
 import os
+import threading
+from collections import deque
 from dotenv import load_dotenv
-from groq import Groq
-from deep_translator import GoogleTranslator
+from utils.translation_pipeline import TRANSLATION_PIPELINE
+from utils.model_router import get_model_router
+from utils.keyword_matcher import INTENT_MATCHER
+from utils.conversation_context import recent_context
+from utils.native_numerals import normalize_numerals, structured_english
+
+# Token budget for conversation history in negotiation prompts (system prompt excluded)
+NEGOTIATION_CONTEXT_TOKENS = 1500
+
+# End of a streamed sentence: ., ? or ! followed by whitespace (so "11.5%" is
+# never split), except after abbreviations such as "Rs." and "approx.", or a newline
+SENTENCE_END = re.compile(
+    r"(?<!\bRs)(?<!\bapprox)(?<!\bMr)(?<!\bMrs)(?<!\bDr)(?<!\be\.g)(?<!\bi\.e)"
+    r"[.?!]\s|\n",
+    re.IGNORECASE,
+)
+
+# --- INFO-GATHERING FAST PATH ---
+# Messages matching the "off_script" keyword set (questions, negotiation, other
+# topics) always go to the LLM; see utils/keyword_matcher.py.
+GATHER_INFO_QUESTIONS = {
+    "amount": "How much would you like to borrow? Your pre-approved limit is Rs. {limit:,}.",
+    "purpose": "What will you be using the loan for?",
+    "tenure": "Over how many months or years would you like to repay it?",
+}
+
+PURPOSE_PHRASES = {
+    "business": "your business",
+    "wedding": "the wedding",
+    "medical": "medical expenses",
+    "education": "education",
+    "travel": "travel",
+    "renovation": "home renovation",
+    "debt": "paying off existing debt",
+    "vehicle": "a vehicle",
+    "personal": "personal needs",
+}
+
+
+# Multilingual greetings (shared by every session)
+GREETINGS = {
+    "en": "Hello 👋 I'm Arjun, your personal loan advisor at Tata Capital.\n\nTo get started, could you please share your registered phone number?",
+    "hi": "नमस्ते 👋 मैं अर्जुन हूं, टाटा कैपिटल में आपका व्यक्तिगत ऋण सलाहकार।\n\nशुरू करने के लिए, क्या आप कृपया अपना पंजीकृत फोन नंबर साझा कर सकते हैं?",
+    "ta": "வணக்கம் 👋 நான் அர்ஜுன், டாடா கேபிடலில் உங்கள் தனிப்பட்ட கடன் ஆலோசகர்.\n\nதொடங்க, உங்கள் பதிவு செய்யப்பட்ட தொலைபேசி எண்ணைப் பகிரவும்?",
+    "te": "నమస్కారం 👋 నేను అర్జున్, టాటా క్యాపిటల్‌లో మీ వ్యక్తిగత లోన్ సలహాదారుడు.\n\nప్రారంభించడానికి, దయచేసి మీ నమోదు చేసుకున్న ఫోన్ నంబర్‌ను షేర్ చేయగలరా?",
+    "bn": "নমস্কার 👋 আমি অর্জুন, টাটা ক্যাপিটালে আপনার ব্যক্তিগত ঋণ পরামর্শদাতা।\n\nশুরু করতে, আপনি কি আপনার নিবন্ধিত ফোন নম্বর শেয়ার করতে পারেন?",
+    "mr": "नमस्कार 👋 मी अर्जुन, टाटा कॅपिटलमधील तुमचा वैयक्तिक कर्ज सल्लागार.\n\nसुरुवात करण्यासाठी, कृपया तुमचा नोंदणीकृत फोन नंबर शेअर करू शकता का?",
+    "gu": "નમસ્તે 👋 હું અર્જુન છું, ટાટા કેપિટલમાં તમારો વ્યક્તિગત લોન સલાહકાર.\n\nશરૂ કરવા માટે, શું તમે તમારો નોંધાયેલ ફોન નંબર શેર કરી શકો છો?"
+}
+
+
+class FastPathStats:
+    """Process-wide hit/miss counters for the info-gathering fast path"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "llm_fallbacks": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+fast_path_stats = FastPathStats()
+
 
 class SalesAgent:
     """
@@ -14,29 +92,31 @@ class SalesAgent:
     """
     
     def __init__(self, api_key: str):
-        self.client = Groq(api_key=api_key)
-        self.model = "openai/gpt-oss-120b"
-        self.conversation_context = []
+        # Negotiation turns are routed to the large model tier
+        self.llm = get_model_router(api_key)
         self.user_language = "en"
-    
-    # Multilingual greetings
-        self.greetings = {
-        "en": "Hello 👋 I'm Arjun, your personal loan advisor at Tata Capital.\n\nTo get started, could you please share your registered phone number?",
-        "hi": "नमस्ते 👋 मैं अर्जुन हूं, टाटा कैपिटल में आपका व्यक्तिगत ऋण सलाहकार।\n\nशुरू करने के लिए, क्या आप कृपया अपना पंजीकृत फोन नंबर साझा कर सकते हैं?",
-        "ta": "வணக்கம் 👋 நான் அர்ஜுன், டாடா கேபிடலில் உங்கள் தனிப்பட்ட கடன் ஆலோசகர்.\n\nதொடங்க, உங்கள் பதிவு செய்யப்பட்ட தொலைபேசி எண்ணைப் பகிரவும்?",
-        "te": "నమస్కారం 👋 నేను అర్జున్, టాటా క్యాపిటల్‌లో మీ వ్యక్తిగత లోన్ సలహాదారుడు.\n\nప్రారంభించడానికి, దయచేసి మీ నమోదు చేసుకున్న ఫోన్ నంబర్‌ను షేర్ చేయగలరా?",
-        "bn": "নমস্কার 👋 আমি অর্জুন, টাটা ক্যাপিটালে আপনার ব্যক্তিগত ঋণ পরামর্শদাতা।\n\nশুরু করতে, আপনি কি আপনার নিবন্ধিত ফোন নম্বর শেয়ার করতে পারেন?",
-        "mr": "नमस्कार 👋 मी अर्जुन, टाटा कॅपिटलमधील तुमचा वैयक्तिक कर्ज सल्लागार.\n\nसुरुवात करण्यासाठी, कृपया तुमचा नोंदणीकृत फोन नंबर शेअर करू शकता का?",
-        "gu": "નમસ્તે 👋 હું અર્જુન છું, ટાટા કેપિટલમાં તમારો વ્યક્તિગત લોન સલાહકાર.\n\nશરૂ કરવા માટે, શું તમે તમારો નોંધાયેલ ફોન નંબર શેર કરી શકો છો?"
-    }
+        self.details_tracker = LoanDetailsTracker(self)
 
     def set_language(self, language: str):
         """Set the conversation language"""
         self.user_language = language
 
+    def snapshot(self, conversation_history: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Per-conversation state; the tracker is only kept if it follows conversation_history"""
+        tracker = self.details_tracker
+        return {
+            "user_language": self.user_language,
+            "tracker": tracker.to_dict() if tracker._history is conversation_history else None,
+        }
+
+    def restore(self, data: Dict[str, Any], conversation_history: List[Dict[str, str]]):
+        self.user_language = data.get("user_language", "en")
+        if data.get("tracker"):
+            self.details_tracker.restore(data["tracker"], conversation_history)
+
     def get_initial_greeting(self) -> str:
         """Get greeting in user's language"""
-        return self.greetings.get(self.user_language, self.greetings["en"])
+        return GREETINGS.get(self.user_language, GREETINGS["en"])
 
     def negotiate_loan(
         self, 
@@ -49,19 +129,155 @@ class SalesAgent:
         """
         Negotiate loan terms with customer using LLM
         """
+        messages, final_details, fast_reply = self._prepare_turn(
+            user_message, customer_data, conversation_history,
+            current_loan_details, personality_instructions
+        )
+        
+        # Deterministic fast path: on-script info-gathering turn, no LLM call
+        if fast_reply:
+            return {
+                "message": self._translate_reply(fast_reply),
+                "ready_for_next_stage": False,
+                "loan_details": final_details
+            }
+        
+        try:
+            assistant_message = self.llm.complete(
+                "negotiation",
+                messages,
+                stage="needs_assessment",
+                temperature=0.6, # Slightly lower temperature for more stable formatting
+                max_tokens=600,
+                timeout=30,
+            )
+            
+            # CRITICAL: Force remove asterisks and emojis if LLM leaks them
+            assistant_message = self._strip_formatting(assistant_message)
+            
+            translated_response = self._translate_reply(assistant_message)
+            
+            return self._build_result(assistant_message, translated_response, customer_data, final_details)
+                
+        except Exception as e:
+            print(f"Error calling Groq API: {e}")
+            return self._fallback_result(current_loan_details)
+
+    def negotiate_loan_stream(
+        self, 
+        user_message: str, 
+        customer_data: Dict[str, Any],
+        conversation_history: List[Dict[str, str]],
+        current_loan_details: Dict[str, Any],
+        personality_instructions: str
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming variant of negotiate_loan.
+        Yields {"type": "token", "text": ...} events as the LLM generates, with the
+        [EXTRACTION:...] tag held back, then one {"type": "result", ...} event
+        carrying the same dict negotiate_loan would return.
+        Non-English replies are translated and emitted one sentence at a time.
+        """
+        messages, final_details, fast_reply = self._prepare_turn(
+            user_message, customer_data, conversation_history,
+            current_loan_details, personality_instructions
+        )
+        
+        if fast_reply:
+            message = self._translate_reply(fast_reply)
+            yield {"type": "token", "text": message}
+            yield {"type": "result", "message": message, "ready_for_next_stage": False, "loan_details": final_details}
+            return
+        
+        tag_filter = ExtractionTagFilter()
+        raw_parts = []
+        translated_parts = []
+        pending_sentence = ""
+        # Sentences being translated in the background, emitted in order
+        in_flight = deque()
+        
+        def drain(wait: bool) -> Iterator[Dict[str, Any]]:
+            while in_flight and (wait or in_flight[0][0].done()):
+                job, trailing = in_flight.popleft()
+                # The translator trims whitespace; keep segment boundaries readable
+                translated = job.result() + trailing
+                translated_parts.append(translated)
+                yield {"type": "token", "text": translated}
+        
+        def emit(visible: str) -> Iterator[Dict[str, Any]]:
+            nonlocal pending_sentence
+            if not visible:
+                return
+            if self.user_language == "en":
+                translated_parts.append(visible)
+                yield {"type": "token", "text": visible}
+                return
+            # Translate whole sentences so the translator has context, without
+            # pausing the LLM stream while each one is translated
+            pending_sentence += visible
+            boundary = sentence_boundary(pending_sentence)
+            if boundary:
+                sentence = pending_sentence[:boundary]
+                pending_sentence = pending_sentence[boundary:]
+                self._queue_segment(in_flight, sentence)
+            yield from drain(wait=False)
+        
+        try:
+            for delta in self.llm.stream(
+                "negotiation",
+                messages,
+                stage="needs_assessment",
+                temperature=0.6,
+                max_tokens=600,
+                timeout=30,
+            ):
+                delta = self._strip_formatting(delta)
+                raw_parts.append(delta)
+                yield from emit(tag_filter.feed(delta))
+            
+            yield from emit(tag_filter.flush())
+            if pending_sentence:
+                self._queue_segment(in_flight, pending_sentence)
+            yield from drain(wait=True)
+            
+            assistant_message = "".join(raw_parts).strip()
+            translated_response = "".join(translated_parts)
+            result = self._build_result(assistant_message, translated_response, customer_data, final_details)
+        
+        except Exception as e:
+            print(f"Error streaming from Groq API: {e}")
+            result = self._fallback_result(current_loan_details)
+            if not raw_parts:
+                yield {"type": "token", "text": result["message"]}
+        
+        yield {"type": "result", **result}
+
+    def _prepare_turn(
+        self,
+        user_message: str,
+        customer_data: Dict[str, Any],
+        conversation_history: List[Dict[str, str]],
+        current_loan_details: Dict[str, Any],
+        personality_instructions: str
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Any], Optional[str]]:
+        """
+        Extract details seen so far and build the LLM message list for this turn.
+        Also returns a templated English reply when the turn can skip the LLM.
+        """
         if self.user_language != "en":
-            try:
-                translated_input = GoogleTranslator(source=self.user_language, target='en').translate(user_message)
-            except:
-                translated_input = user_message
+            # Amount/tenure answers are read natively; only free text is translated
+            translated_input = structured_english(user_message) or TRANSLATION_PIPELINE.translate(
+                user_message, 'en', source=self.user_language
+            )
         else:
             translated_input = user_message
     
-        all_history = conversation_history + [{"role": "user", "content": translated_input}]
-        extracted_details = self._extract_loan_details(all_history)
+        # Only messages added since the last turn are scanned
+        self.details_tracker.sync(conversation_history)
+        extracted_details = self.details_tracker.details_with(translated_input)
         
         final_details = current_loan_details.copy()
-        final_details.update(extracted_details) 
+        final_details.update(extracted_details or {})
         
         has_all_info = self._has_complete_info(final_details)
         
@@ -79,64 +295,117 @@ class SalesAgent:
         )
         
         messages = [{"role": "system", "content": system_prompt}]
-        for msg in conversation_history[-10:]:
-            if msg["role"] in ["user", "assistant"]:
-                messages.append(msg)
+        messages.extend(recent_context(conversation_history, NEGOTIATION_CONTEXT_TOKENS))
         
         if not conversation_history or conversation_history[-1]["content"] != user_message:
             messages.append({"role": "user", "content": user_message})
         
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.6, # Slightly lower temperature for more stable formatting
-                max_tokens=600, 
-            )
-            
-            assistant_message = response.choices[0].message.content.strip()
-            
-            # CRITICAL: Force remove asterisks and emojis if LLM leaks them
-            assistant_message = assistant_message.replace('*', '').replace('✨', '').replace('🎉', '')
-            
-            if self.user_language != "en":
-                try:
-                    translated_response = GoogleTranslator(source='en', target=self.user_language).translate(assistant_message)
-                    print(f"Translated to {self.user_language}: {translated_response[:100]}...")
-                except Exception as e:
-                    print(f"Translation failed for {self.user_language}: {e}")
-                    translated_response = assistant_message
+        fast_reply = None
+        if mode == "gather_info":
+            fast_reply = self._gather_info_reply(translated_input, final_details, customer_data)
+            fast_path_stats.record(hit=fast_reply is not None)
+        
+        return messages, final_details, fast_reply
+
+    def _gather_info_reply(self, message: str, loan_details: Dict[str, Any], customer_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Templated reply for an on-script needs-assessment turn: the user just gave
+        us amount/tenure/purpose and we only need to ask for what is still missing.
+        Returns None (use the LLM) when the message is a question or off-script.
+        """
+        text = message.lower().strip()
+        if not text or "off_script" in INTENT_MATCHER.classify(text):
+            return None
+        
+        # Only answer locally when this message actually moved the form forward
+        provided = {
+            "amount": self._extract_amount(text),
+            "tenure": self._extract_tenure(text),
+            "purpose": self._extract_purpose(text),
+        }
+        if not any(provided.values()):
+            return None
+        
+        acknowledged = ["a loan"]
+        if loan_details.get("amount"):
+            acknowledged.append(f"of Rs. {loan_details['amount']:,}")
+        if loan_details.get("purpose"):
+            acknowledged.append(f"for {PURPOSE_PHRASES.get(loan_details['purpose'], loan_details['purpose'])}")
+        if loan_details.get("tenure"):
+            tenure = loan_details["tenure"]
+            if tenure % 12 == 0:
+                years = tenure // 12
+                acknowledged.append(f"over {years} year{'s' if years != 1 else ''}")
             else:
-                translated_response = assistant_message
-            extraction_match = re.search(r'\[EXTRACTION:amount=(\d+),tenure=(\d+),purpose=([^\]]+)\]', assistant_message)
-            if extraction_match:
-                final_loan = {
-                    "amount": int(extraction_match.group(1)),
-                    "tenure": int(extraction_match.group(2)),
-                    "purpose": extraction_match.group(3).strip()
-                }
-                final_loan = self._finalize_loan_details(final_loan, customer_data)
-                clean_message = self._clean_message(translated_response)
-                
-                return {
-                    "message": clean_message,
-                    "ready_for_next_stage": True,
-                    "loan_details": final_loan 
-                }
+                acknowledged.append(f"over {tenure} months")
+        
+        missing = [key for key in ["amount", "purpose", "tenure"] if not loan_details.get(key)]
+        questions = [
+            GATHER_INFO_QUESTIONS[key].format(limit=customer_data.get("pre_approved_limit", 0))
+            for key in missing
+        ]
+        
+        reply = f"Thank you, {customer_data['name'].split()[0]}. I have noted {' '.join(acknowledged)}.\n\n"
+        if len(questions) == 1:
+            reply += questions[0]
+        else:
+            reply += "Could you also help me with a couple of details?\n" + "\n".join(
+                f"{i}. {q}" for i, q in enumerate(questions, 1)
+            )
+        return reply
 
-            return {
-                "message": self._clean_message(translated_response),
-                "ready_for_next_stage": False, 
-                "loan_details": final_details
+    def _translate_reply(self, text: str) -> str:
+        """Translate a complete English reply to the user's language, falling back to English"""
+        if self.user_language == "en":
+            return text
+        # Falls back to English if the translator fails or misses its deadline
+        return TRANSLATION_PIPELINE.translate(text, self.user_language, source='en')
+
+    def _build_result(
+        self,
+        assistant_message: str,
+        translated_response: str,
+        customer_data: Dict[str, Any],
+        final_details: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Turn the (English) LLM reply into the negotiate_loan result dict"""
+        extraction_match = re.search(r'\[EXTRACTION:amount=(\d+),tenure=(\d+),purpose=([^\]]+)\]', assistant_message)
+        if extraction_match:
+            final_loan = {
+                "amount": int(extraction_match.group(1)),
+                "tenure": int(extraction_match.group(2)),
+                "purpose": extraction_match.group(3).strip()
             }
-                
-        except Exception as e:
-            print(f"Error calling Groq API: {e}")
+            final_loan = self._finalize_loan_details(final_loan, customer_data)
+            clean_message = self._clean_message(translated_response)
+            
             return {
-                "message": "I'd love to help you with your loan! Could you tell me more about what you're looking for?",
-                "ready_for_next_stage": False,
-                "loan_details": current_loan_details 
+                "message": clean_message,
+                "ready_for_next_stage": True,
+                "loan_details": final_loan 
             }
+
+        return {
+            "message": self._clean_message(translated_response),
+            "ready_for_next_stage": False, 
+            "loan_details": final_details
+        }
+
+    def _fallback_result(self, current_loan_details: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "message": "I'd love to help you with your loan! Could you tell me more about what you're looking for?",
+            "ready_for_next_stage": False,
+            "loan_details": current_loan_details 
+        }
+
+    def _queue_segment(self, in_flight: deque, text: str):
+        """Start translating one English segment; the result keeps its trailing whitespace"""
+        stripped = text.strip()
+        trailing = (text[len(text.rstrip()):] or " ") if stripped else ""
+        in_flight.append((TRANSLATION_PIPELINE.submit(stripped or text, self.user_language, source='en'), trailing))
+
+    def _strip_formatting(self, text: str) -> str:
+        return text.replace('*', '').replace('✨', '').replace('🎉', '')
     
     def _create_system_prompt(self, customer_data: Dict[str, Any], current_loan_details: Dict[str, Any], personality_instructions: str, mode: str) -> str:
         """Create a detailed system prompt for the sales agent"""
@@ -251,6 +520,7 @@ INSTRUCTIONS:
     
     def _extract_amount(self, text: str) -> Optional[int]:
         """Extract loan amount from text"""
+        text = normalize_numerals(text)
         # 1. Lakhs/Lacs
         lakh_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:lakh|lac|l)', text, re.IGNORECASE)
         if lakh_match:
@@ -281,6 +551,7 @@ INSTRUCTIONS:
     
     def _extract_tenure(self, text: str) -> Optional[int]:
         """Extract loan tenure from text"""
+        text = normalize_numerals(text)
         # Years
         year_match = re.search(r'(\d+)\s*(?:years?|yrs?|y)', text, re.IGNORECASE)
         if year_match:
@@ -295,22 +566,7 @@ INSTRUCTIONS:
     
     def _extract_purpose(self, text: str) -> Optional[str]:
         """Extract loan purpose from text"""
-        purpose_keywords = {
-            "business": ["business", "startup", "venture", "shop", "expansion"],
-            "wedding": ["wedding", "marriage", "shaadi", "function"],
-            "medical": ["medical", "health", "hospital", "surgery", "treatment"],
-            "education": ["education", "study", "college", "fees", "school"],
-            "travel": ["travel", "vacation", "holiday", "trip"],
-            "renovation": ["renovate", "renovation", "repair", "construction", "interior"],
-            "debt": ["debt", "loan", "card", "pay off"],
-            "vehicle": ["car", "bike", "vehicle", "scooter"],
-            "personal": ["personal", "urgent", "need"]
-        }
-        for purpose, keywords in purpose_keywords.items():
-            for keyword in keywords:
-                if keyword in text:
-                    return purpose
-        return None
+        return INTENT_MATCHER.first_of(INTENT_MATCHER.classify(text), "purpose:")
     
     def _has_complete_info(self, loan_details: Dict) -> bool:
         """Check if we have all required information"""
@@ -365,4 +621,145 @@ INSTRUCTIONS:
     def _clean_message(self, message: str) -> str:
         """Remove extraction markers from message"""
         cleaned = re.sub(r'\[EXTRACTION:.*?\]', '', message)
-        return cleaned.strip()
\ No newline at end of file
+        return cleaned.strip()
+
+
+def sentence_boundary(text: str) -> int:
+    """Length of the leading run of complete sentences in streamed text (0 if none yet)"""
+    end = 0
+    for match in SENTENCE_END.finditer(text):
+        end = match.end()
+    return end
+
+
+class ExtractionTagFilter:
+    """
+    Incremental filter for streamed LLM text.
+    Passes text through as soon as it is known not to be part of an
+    [EXTRACTION:...] tag, and drops the tag itself.
+    """
+    TAG_PREFIX = "[EXTRACTION:"
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, text: str) -> str:
+        """Add a streamed delta; return the part that is safe to show"""
+        self._buffer += text
+        out = []
+        while self._buffer:
+            start = self._buffer.find("[")
+            if start < 0:
+                out.append(self._buffer)
+                self._buffer = ""
+                break
+            out.append(self._buffer[:start])
+            self._buffer = self._buffer[start:]
+            if self._buffer.startswith(self.TAG_PREFIX):
+                end = self._buffer.find("]")
+                if end < 0:
+                    break  # tag still arriving
+                self._buffer = self._buffer[end + 1:]
+            elif self.TAG_PREFIX.startswith(self._buffer):
+                break  # could still become a tag
+            else:
+                out.append("[")
+                self._buffer = self._buffer[1:]
+        return "".join(out)
+
+    def flush(self) -> str:
+        """Return whatever is still held back once the stream has ended"""
+        rest = self._buffer
+        self._buffer = ""
+        if rest.startswith(self.TAG_PREFIX):
+            return ""
+        return rest
+
+
+class LoanDetailsTracker:
+    """
+    Incremental version of SalesAgent._extract_loan_details for one conversation.
+    Keeps the running most-recent amount/tenure/purpose and scans each user
+    message once, instead of rescanning the whole history every turn.
+    """
+
+    def __init__(self, agent: SalesAgent):
+        self.agent = agent
+        self.reset()
+
+    def reset(self):
+        self._history = None
+        self._processed = 0
+        self._last_user_text = None
+        self.amount = None
+        self.tenure = None
+        self.purpose = None
+        # Purpose that only appears across two adjacent messages (the original
+        # fallback scanned all user text joined together, newest first)
+        self.joined_purpose = None
+
+    def sync(self, conversation_history: List[Dict[str, str]]):
+        """Consume user messages appended to the history since the last call"""
+        # A ConversationContext is a ring buffer, so count appends rather than length
+        total = getattr(conversation_history, "total_appended", len(conversation_history))
+        if conversation_history is not self._history or total < self._processed:
+            self.reset()
+            self._history = conversation_history
+        new_messages = total - self._processed
+        if new_messages:
+            for msg in conversation_history[-new_messages:]:
+                if msg["role"] == "user":
+                    self._add(msg["content"].lower())
+        self._processed = total
+
+    def details_with(self, pending_message: Optional[str] = None) -> Dict[str, Any]:
+        """Current details, with an uncommitted newest message applied on top"""
+        amount, tenure, purpose, joined = self.amount, self.tenure, self.purpose, self.joined_purpose
+        if pending_message is not None:
+            text = pending_message.lower()
+            amount = self.agent._extract_amount(text) or amount
+            tenure = self.agent._extract_tenure(text) or tenure
+            found = self.agent._extract_purpose(text)
+            purpose = found or purpose
+            if not purpose and not joined:
+                joined = self._joined_purpose(text)
+
+        details = {}
+        if amount:
+            details["amount"] = amount
+        if tenure:
+            details["tenure"] = tenure
+        if purpose or joined:
+            details["purpose"] = purpose or joined
+        return details
+
+    def _add(self, text: str):
+        self.amount = self.agent._extract_amount(text) or self.amount
+        self.tenure = self.agent._extract_tenure(text) or self.tenure
+        found = self.agent._extract_purpose(text)
+        if found:
+            self.purpose = found
+        elif not self.purpose and not self.joined_purpose:
+            self.joined_purpose = self._joined_purpose(text)
+        self._last_user_text = text
+
+    def _joined_purpose(self, text: str) -> Optional[str]:
+        # Neither message has a purpose keyword on its own, so any match here
+        # spans the boundary between the newer and the previous message
+        if self._last_user_text is None:
+            return None
+        return self.agent._extract_purpose(text + " " + self._last_user_text)
+
+    # --- serialization (session stores) ---
+    SNAPSHOT_FIELDS = ("_processed", "_last_user_text", "amount", "tenure", "purpose", "joined_purpose")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.SNAPSHOT_FIELDS}
+
+    def restore(self, data: Dict[str, Any], conversation_history: List[Dict[str, str]]):
+        """Resume tracking a restored history without rescanning it"""
+        self.reset()
+        self._history = conversation_history
+        for field in self.SNAPSHOT_FIELDS:
+            if field in data:
+                setattr(self, field, data[field])
@@ -1,5 +1,11 @@
 from typing import Dict, Any
 
+# Underwriting policy (see utils/vector_underwriting.py for the array version)
+MIN_CREDIT_SCORE = 700
+MAX_EMI_RATIO = 50  # EMI should be <= 50% of salary
+INSTANT_APPROVAL_RATIO = 1.0  # x pre-approved limit
+SALARY_SLIP_RATIO = 2.0
+
 class UnderwritingAgent:
     """
     Underwriting Agent - Worker Agent
@@ -7,8 +13,8 @@ class UnderwritingAgent:
     """
     
     def __init__(self):
-        self.min_credit_score = 700
-        self.max_emi_ratio = 50  # EMI should be <= 50% of salary
+        self.min_credit_score = MIN_CREDIT_SCORE
+        self.max_emi_ratio = MAX_EMI_RATIO
     
     def evaluate_loan(
         self,
@@ -38,7 +44,7 @@ class UnderwritingAgent:
         # Amount-based decision
         ratio = requested_amount / pre_approved_limit
         
-        if ratio <= 1.0:
+        if ratio <= INSTANT_APPROVAL_RATIO:
             # Instant approval
             return {
                 "decision": "APPROVED",
@@ -47,7 +53,7 @@ class UnderwritingAgent:
                 "requires_documents": False
             }
         
-        elif ratio <= 2.0:
+        elif ratio <= SALARY_SLIP_RATIO:
             # Requires salary slip verification
             return {
                 "decision": "REQUIRES_SALARY_SLIP",
@@ -62,7 +68,7 @@ class UnderwritingAgent:
                 "decision": "REJECTED",
                 "reason": f"Requested amount (₹{requested_amount:,}) exceeds maximum limit",
                 "ratio": ratio,
-                "alternative": f"Maximum approved amount: ₹{int(pre_approved_limit * 2):,}"
+                "alternative": f"Maximum approved amount: ₹{int(pre_approved_limit * SALARY_SLIP_RATIO):,}"
             }
     
     def evaluate_with_salary(
@@ -1,43 +1,24 @@
-from typing import Dict, Any
-import random
+from typing import Dict, Any, Optional, Tuple
+from utils.kyc import KYCOrchestrator
 
 class VerificationAgent:
     """
     Verification Agent - Worker Agent
-    Verifies customer KYC details from mock CRM
+    Verifies customer KYC details
     """
     
-    def __init__(self):
+    def __init__(self, kyc: Optional[KYCOrchestrator] = None):
         self.crm_database = {}  # Mock CRM
+        self.kyc = kyc or KYCOrchestrator()
     
-    def verify_customer(self, customer_data: Dict[str, Any]) -> Dict[str, bool]:
+    def verify_customer(self, customer_data: Dict[str, Any], cache: Optional[Dict[Tuple, str]] = None) -> Dict[str, Any]:
         """
-        Verify customer details against CRM database
-        In production: calls actual CRM API
+        Run the phone, address and identity checks concurrently (see
+        utils/kyc.py). Pass the session's cache so passed or failed checks
+        are not repeated; checks that miss their deadline come back as
+        pending.
         """
-        
-        # Mock verification logic
-        # In real scenario: check phone, address, PAN, Aadhaar
-        
-        verification_checks = {
-            "phone_verified": True,
-            "address_verified": True,
-            "identity_verified": True,
-            "overall_verified": True
-        }
-        
-        # Simulate 95% success rate
-        if random.random() < 0.95:
-            verification_checks["overall_verified"] = True
-        else:
-            verification_checks["overall_verified"] = False
-            verification_checks["phone_verified"] = False
-        
-        return {
-            "verified": verification_checks["overall_verified"],
-            "checks": verification_checks,
-            "message": "Verification successful" if verification_checks["overall_verified"] else "Verification failed"
-        }
+        return self.kyc.verify(customer_data, cache)
     
     def verify_phone_otp(self, phone: str, otp: str) -> bool:
         """Verify OTP (mock implementation)"""
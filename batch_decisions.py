@@ -0,0 +1,165 @@
+"""
+Bulk decisioning for pre-approved campaigns: runs the credit, risk,
+underwriting and secured-offer chain for every customer against a list of
+hypothetical loan requests, without the chat (no LLM, no sessions).
+Customers are sharded across a process pool and scored with array
+operations; one row per customer and request goes to a CSV file.
+
+    python batch_decisions.py [--requests requests.json] [--out decisions.csv] [--workers N]
+
+The requests file is a JSON list of {"amount": ..., "tenure": ...} objects.
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agents.credit import CreditAgent
+from utils.mock_data import OFFER_BOOK, get_all_customers
+from utils.vector_underwriting import (
+    DECISIONS, APPROVED, REQUIRES_SALARY_SLIP, REJECTED, SALARY_CHECK_RATE,
+    emi, evaluate_loan, evaluate_with_salary, interest_rate,
+)
+
+DEFAULT_REQUESTS = [
+    {"amount": 100000, "tenure": 12},
+    {"amount": 300000, "tenure": 36},
+    {"amount": 500000, "tenure": 60},
+    {"amount": 1000000, "tenure": 60},
+]
+SHARDS_PER_WORKER = 4
+
+FIELDS = [
+    "customer_id", "phone", "request", "amount", "tenure", "credit_score", "safety_score",
+    "interest_rate", "emi", "limit_ratio", "underwriting_decision", "salary_emi_ratio",
+    "final_decision", "secured_max_amount", "secured_interest_rate",
+]
+
+_credit_agent = CreditAgent()
+# Loaded once per worker process by _init_worker
+_risk_agent = None
+
+
+def _init_worker(model_path: str):
+    global _risk_agent
+    from agents.risk import RiskAgent
+    _risk_agent = RiskAgent(model_path)
+
+
+def decide(customers: Sequence[Dict[str, Any]], requests: Sequence[Dict[str, Any]],
+           safety_scores: Sequence[float]) -> List[Tuple]:
+    """
+    The chat's decision chain for every customer x request pair, as rows in
+    FIELDS order. Requests needing a salary slip are checked against the
+    income on record, as the document-upload stage would; rejected pairs
+    carry the customer's secured offer, if any.
+    """
+    n, m = len(customers), len(requests)
+    # No bureau record -> NaN, which evaluate_loan rejects
+    credit = np.array(_credit_agent.get_credit_scores([c["phone"] for c in customers]), dtype=np.float64)[:, None]
+    safety = np.asarray(safety_scores, dtype=np.float64)[:, None]
+    limit = np.array([c["pre_approved_limit"] for c in customers], dtype=np.float64)[:, None]
+    salary = np.array([c.get("salary") or c.get("monthly_income") or 0 for c in customers], dtype=np.float64)[:, None]
+    amount = np.array([r["amount"] for r in requests], dtype=np.int64)[None, :]
+    tenure = np.array([r["tenure"] for r in requests], dtype=np.int64)[None, :]
+
+    rate = interest_rate(amount, tenure, credit, safety)
+    # SalesAgent._calculate_emi truncates to whole rupees
+    monthly_emi = np.floor(emi(amount, rate, tenure)).astype(np.int64)
+    decision, ratio = evaluate_loan(amount, limit, credit)
+    salary_ok, salary_ratio = evaluate_with_salary(salary, np.round(emi(amount, SALARY_CHECK_RATE, tenure), 2))
+    needs_slip = decision == REQUIRES_SALARY_SLIP
+    final = np.where(needs_slip, np.where(salary_ok, APPROVED, REJECTED), decision)
+
+    secured = [OFFER_BOOK.secured_offer(c.get("collateral", "None")) for c in customers]
+    secured_amount = np.array([o.get("max_amount", 0) for o in secured])[:, None]
+    secured_rate = np.array([o.get("interest_rate", 0.0) for o in secured])[:, None]
+    offer_secured = (final == REJECTED) & (secured_amount > 0)
+
+    shape = (n, m)
+    columns = [
+        np.repeat([c["id"] for c in customers], m),
+        np.repeat([c["phone"] for c in customers], m),
+        np.tile(np.arange(m), n),
+        np.broadcast_to(amount, shape).ravel(),
+        np.broadcast_to(tenure, shape).ravel(),
+        np.where(np.isnan(credit), None, np.nan_to_num(credit).astype(np.int64)).repeat(m, axis=1).ravel(),
+        np.broadcast_to(safety, shape).ravel(),
+        rate.ravel(),
+        monthly_emi.ravel(),
+        np.round(np.broadcast_to(ratio, shape), 2).ravel(),
+        DECISIONS[decision].ravel(),
+        np.where(needs_slip, np.round(salary_ratio, 1), None).ravel(),
+        DECISIONS[final].ravel(),
+        np.where(offer_secured, secured_amount, None).ravel(),
+        np.where(offer_secured, secured_rate, None).ravel(),
+    ]
+    return list(zip(*(column.tolist() for column in columns)))
+
+
+def _decide_shard(customers: List[Dict[str, Any]], requests: List[Dict[str, Any]]) -> List[Tuple]:
+    return decide(customers, requests, _risk_agent.score_batch(customers))
+
+
+def run(customers: List[Dict[str, Any]], requests: List[Dict[str, Any]], workers: int,
+        model_path: str = "risk_model.joblib") -> List[Tuple]:
+    if workers <= 1:
+        _init_worker(model_path)
+        return _decide_shard(customers, requests)
+    size = max(1, -(-len(customers) // (workers * SHARDS_PER_WORKER)))
+    shards = [customers[i:i + size] for i in range(0, len(customers), size)]
+    rows: List[Tuple] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_path,)) as pool:
+        for shard_rows in pool.map(_decide_shard, shards, [requests] * len(shards)):
+            rows.extend(shard_rows)
+    return rows
+
+
+def write_decisions(path: str, rows: List[Tuple]):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+
+
+def load_requests(path: Optional[str]) -> List[Dict[str, Any]]:
+    if not path:
+        return DEFAULT_REQUESTS
+    with open(path, "r", encoding="utf-8") as f:
+        return [{"amount": int(r["amount"]), "tenure": int(r["tenure"])} for r in json.load(f)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decide hypothetical loan requests for every customer")
+    parser.add_argument("--requests", help="JSON list of {amount, tenure} requests")
+    parser.add_argument("--out", default="decisions.csv")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--model", default="risk_model.joblib")
+    args = parser.parse_args()
+
+    customers = list(get_all_customers().values())
+    requests = load_requests(args.requests)
+
+    start = time.perf_counter()
+    rows = run(customers, requests, args.workers, args.model)
+    decided = time.perf_counter() - start
+    write_decisions(args.out, rows)
+    total = time.perf_counter() - start
+
+    counts = Counter(row[FIELDS.index("final_decision")] for row in rows)
+    print(f"{len(rows):,} decisions ({len(customers):,} customers x {len(requests)} requests) "
+          f"with {args.workers} workers")
+    print(f"decide {decided:.2f}s ({len(rows) / decided:,.0f}/s), with file {total:.2f}s ({len(rows) / total:,.0f}/s)")
+    for name in DECISIONS:
+        print(f"  {name:22}{counts.get(name, 0):>10,}")
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: credit checks against a stub bureau with latency, for sessions
+that re-check the same customers. Compares a new connection per pull, the
+pooled client, and the pooled client behind the report cache, then single
+vs bulk pulls for a campaign-sized batch.
+
+    python bench_credit_bureau.py [checks] [latency_seconds]
+"""
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from stub_bureau import start_stub_bureau
+from utils.credit_bureau import CachedBureau, HTTPBureau
+from utils.mock_data import get_all_customers
+
+THREADS = 16
+
+
+class UnpooledBureau(HTTPBureau):
+    # A fresh connection per pull, as a naive client would do
+    def pull(self, phone):
+        response = httpx.get(f"{self.base_url}/reports/{phone}", timeout=5.0)
+        return None if response.status_code == 404 else response.json()
+
+
+def run_checks(bureau, phones):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        list(pool.map(bureau.pull, phones))
+    return time.perf_counter() - start
+
+
+def main():
+    checks = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    customers = list(get_all_customers())
+    rng = random.Random(0)
+    # Session traffic: the same customers come back within minutes
+    phones = [rng.choice(customers) for _ in range(checks)]
+
+    server = start_stub_bureau(latency=latency, jitter=latency / 5, seed=0)
+    try:
+        rows = []
+        for name, bureau in (
+            ("new connection per pull", UnpooledBureau(server.url)),
+            ("pooled", HTTPBureau(server.url)),
+            ("pooled + cache", CachedBureau(HTTPBureau(server.url))),
+        ):
+            before = server.requests
+            elapsed = run_checks(bureau, phones)
+            rows.append((name, elapsed, server.requests - before))
+            bureau.close()
+
+        print(f"{checks} credit checks, {THREADS} threads, bureau latency {latency * 1000:.0f}ms")
+        print(f"{'':26}{'seconds':>10}{'checks/s':>10}{'bureau calls':>14}")
+        for name, elapsed, calls in rows:
+            print(f"{name:26}{elapsed:>10.2f}{checks / elapsed:>10.0f}{calls:>14}")
+
+        client = HTTPBureau(server.url)
+        start = time.perf_counter()
+        for phone in customers:
+            client.pull(phone)
+        single = time.perf_counter() - start
+        start = time.perf_counter()
+        client.pull_many(customers)
+        bulk = time.perf_counter() - start
+        client.close()
+        print(f"\n{len(customers)} customers, one at a time: {single:.2f}s; one bulk pull: {bulk:.2f}s")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: intent classification with the old chains of `keyword in text`
+substring checks vs the compiled word-boundary matcher in
+utils/keyword_matcher.py, and the messages where the two disagree.
+
+    python bench_keyword_matcher.py [runs]
+"""
+import sys
+import timeit
+
+from utils.keyword_matcher import INTENT_KEYWORDS, INTENT_MATCHER
+
+LEGACY_PURPOSES = {
+    "business": ["business", "startup", "venture", "shop", "expansion"],
+    "wedding": ["wedding", "marriage", "shaadi", "function"],
+    "medical": ["medical", "health", "hospital", "surgery", "treatment"],
+    "education": ["education", "study", "college", "fees", "school"],
+    "travel": ["travel", "vacation", "holiday", "trip"],
+    "renovation": ["renovate", "renovation", "repair", "construction", "interior"],
+    "debt": ["debt", "loan", "card", "pay off"],
+    "vehicle": ["car", "bike", "vehicle", "scooter"],
+    "personal": ["personal", "urgent", "need"],
+}
+
+MESSAGES = [
+    "Yes, that is correct",
+    "No, please change the amount to 4 lakhs",
+    "I need 5 lakh for my daughter's wedding over 3 years",
+    "Residential Property - 2BHK Apartment (Estimated Value: ₹45,00,000)",
+    "Gold Jewelry - 250 grams (Estimated Value: ₹15,00,000)",
+    "Can you tell me what the interest rate would be if I took it for 60 months instead?",
+    "My address is 12 MG Road, Bengaluru and my email is riya@example.com",
+    "ok",
+]
+
+
+def legacy_classify(text: str):
+    # The checks MasterAgent, SalesAgent and SecuredLoanAgent used to run
+    text = text.lower()
+    affirmative = any(w in text for w in ["yes", "yep", "ya", "y", "sure", "ok", "okay", "proceed", "accept", "correct"])
+    negative = any(w in text for w in ["no", "n", "nope", "nah", "cancel", "stop"])
+    purpose = None
+    for name, keywords in LEGACY_PURPOSES.items():
+        if any(k in text for k in keywords):
+            purpose = name
+            break
+    loan_change = any(w in text for w in ["purpose", "amount", "tenure", "year", "month", "lacs", "lakh"]) and \
+        any(w in text for w in ["change", "update", "modify", "wrong"])
+    collateral = None
+    if any(x in text for x in ["fixed deposit", " fd", "deposit"]):
+        collateral = "fd"
+    elif any(x in text for x in ["property", "flat", "house", "villa", "apartment", "shop", "bhk", "residential"]):
+        collateral = "property"
+    elif any(x in text for x in ["vehicle", "car", "bike", "scooter"]):
+        collateral = "vehicle"
+    elif any(x in text for x in ["gold", "jewelry"]):
+        collateral = "gold"
+    elif any(x in text for x in ["mutual fund", "mf", "stock", "share"]):
+        collateral = "stocks"
+    return affirmative, negative, purpose, loan_change, collateral
+
+
+def matcher_classify(text: str):
+    labels = INTENT_MATCHER.classify(text)
+    return (
+        "affirmative" in labels,
+        "negative" in labels,
+        INTENT_MATCHER.first_of(labels, "purpose:"),
+        "loan_field" in labels and "change_request" in labels,
+        INTENT_MATCHER.first_of(labels, "collateral:"),
+    )
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    # Best of five, so a noisy neighbour does not decide the comparison
+    legacy_time = min(timeit.repeat(lambda: [legacy_classify(m) for m in MESSAGES], number=runs, repeat=5))
+    matcher_time = min(timeit.repeat(lambda: [matcher_classify(m) for m in MESSAGES], number=runs, repeat=5))
+    per_msg = runs * len(MESSAGES)
+    print(f"Keyword sets: {len(INTENT_KEYWORDS)}")
+    print(f"Legacy `in` chains : {legacy_time / per_msg * 1e6:.2f} µs/message")
+    print(f"Compiled matcher   : {matcher_time / per_msg * 1e6:.2f} µs/message (all {len(INTENT_KEYWORDS)} sets)")
+    print("\nWhere results differ (legacy substring vs word-boundary):")
+    for m in MESSAGES:
+        old, new = legacy_classify(m), matcher_classify(m)
+        if old != new:
+            print(f"  {m!r}\n    legacy : {old}\n    matcher: {new}")
+
+
+if __name__ == "__main__":
+    main()
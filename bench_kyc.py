@@ -0,0 +1,53 @@
+"""
+Benchmark: latency of a verification turn against stub KYC services, with
+the checks called one after another (the old flow) vs fanned out
+concurrently, and for a repeat turn served from the session cache.
+
+    python bench_kyc.py [turns]
+"""
+import sys
+import time
+
+from stub_kyc import start_stub_kyc
+from utils.kyc import KYCOrchestrator, KYCStats, default_checks
+from utils.mock_data import get_all_customers
+
+LATENCY = {"phone": 0.3, "address": 0.8, "identity": 1.2}
+
+
+def sequential(checks, customer):
+    return all(check.run(check.subject(customer)) for check in checks)
+
+
+def timed(fn, customers):
+    start = time.perf_counter()
+    for customer in customers:
+        fn(customer)
+    return (time.perf_counter() - start) / len(customers) * 1000
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    customers = list(get_all_customers().values())[:turns]
+    server = start_stub_kyc(latency=LATENCY)
+    try:
+        checks = default_checks(server.url)
+        kyc = KYCOrchestrator(checks, stats=KYCStats())
+        caches = {customer["phone"]: {} for customer in customers}
+
+        rows = [
+            ("sequential", timed(lambda c: sequential(checks, c), customers)),
+            ("concurrent", timed(lambda c: kyc.verify(c, caches[c["phone"]]), customers)),
+            ("concurrent, cached", timed(lambda c: kyc.verify(c, caches[c["phone"]]), customers)),
+        ]
+        print("check latency (ms): " + ", ".join(f"{k} {v * 1000:.0f}" for k, v in LATENCY.items()))
+        print(f"{'':22}{'ms/turn':>10}")
+        for name, ms in rows:
+            print(f"{name:22}{ms:>10.0f}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: session creation time and per-session memory, with worker agents
+built per session (the old MasterAgent) vs shared process-wide singletons.
+
+    python bench_session_creation.py [sessions]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+from dotenv import load_dotenv
+
+from main import MasterAgent, WorkerAgents, get_worker_agents
+
+
+def per_session_workers(api_key):
+    # What MasterAgent.__init__ used to do: every worker agent built per session
+    agent = MasterAgent(api_key)
+    workers = WorkerAgents()
+    for name, worker in vars(workers).items():
+        setattr(agent, name, worker)
+    return agent
+
+
+def measure(build, api_key, sessions):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    held = [build(api_key) for _ in range(sessions)]
+    elapsed = time.perf_counter() - start
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return elapsed / sessions * 1000, (after - before) / sessions
+
+
+def main():
+    load_dotenv()
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    api_key = os.getenv("GROQ_API_KEY") or "benchmark-key"
+
+    # Warm-up: shared model router, worker singletons, imports
+    get_worker_agents()
+    MasterAgent(api_key)
+
+    old_ms, old_bytes = measure(per_session_workers, api_key, sessions)
+    new_ms, new_bytes = measure(MasterAgent, api_key, sessions)
+
+    print(f"{'':24}{'per-session workers':>22}{'shared workers':>18}")
+    print(f"{'create ms/session':24}{old_ms:>22.3f}{new_ms:>18.3f}")
+    print(f"{'bytes/session':24}{old_bytes:>22.0f}{new_bytes:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: per-session memory and serialization cost of the orchestrator state,
+old plain dict vs the slotted ConversationState in state.py.
+
+    python bench_session_state.py [sessions]
+"""
+import json
+import sys
+import time
+import tracemalloc
+import zlib
+
+from state import ConversationState, ConversationStage
+from utils.mock_data import get_customer_data
+
+
+def legacy_state(customer):
+    # The dict MasterAgent.state used to be
+    return {
+        "stage": "underwriting",
+        "customer_data": customer,
+        "temp_customer_data": None,
+        "awaiting_profile_permission": False,
+        "awaiting_secured_loan_decision": False,
+        "awaiting_detail_correction": False,
+        "awaiting_secured_loan_application": False,
+        "awaiting_manual_data_entry": False,
+        "manual_data_step": 0,
+        "secured_loan_offer": None,
+        "loan_request": {"amount": 300000, "purpose": "wedding", "tenure": 36, "interest_rate": 11.5, "emi": 9893},
+        "verification_status": True,
+        "credit_score": 782,
+        "underwriting_result": None,
+        "documents_uploaded": False,
+        "final_decision": None,
+        "waiting_for_manual_upload": False,
+        "user_personality": "friendly",
+    }
+
+
+def typed_state(customer):
+    state = ConversationState()
+    state.stage = ConversationStage.UNDERWRITING
+    state.customer_data = customer
+    state.loan_request = {"amount": 300000, "purpose": "wedding", "tenure": 36, "interest_rate": 11.5, "emi": 9893}
+    state.verification_status = True
+    state.credit_score = 782
+    return state
+
+
+def bytes_per_session(build, customer, sessions):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = [build(customer) for _ in range(sessions)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return (after - before) / sessions
+
+
+def per_call_us(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeat = 20000
+    # Customer records are shared with the database, as in a live session
+    customer = get_customer_data("7303201137")
+
+    legacy, typed = legacy_state(customer), typed_state(customer)
+    legacy_blob = json.dumps(legacy, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    typed_blob = typed.to_bytes()
+
+    rows = [
+        ("resident bytes/session", bytes_per_session(legacy_state, customer, sessions),
+         bytes_per_session(typed_state, customer, sessions)),
+        ("serialized bytes", len(legacy_blob), len(typed_blob)),
+        ("serialized bytes (zlib)", len(zlib.compress(legacy_blob)), len(zlib.compress(typed_blob))),
+        ("serialize us", per_call_us(lambda: json.dumps(legacy, separators=(",", ":"), ensure_ascii=False), repeat),
+         per_call_us(typed.to_bytes, repeat)),
+        ("deserialize us", per_call_us(lambda: json.loads(legacy_blob), repeat),
+         per_call_us(lambda: ConversationState.from_bytes(typed_blob), repeat)),
+    ]
+
+    print(f"{'':26}{'dict + JSON':>14}{'typed + binary':>16}")
+    for name, old, new in rows:
+        print(f"{name:26}{old:>14.1f}{new:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import os
-from typing import Dict, List, Any
-from groq import Groq
+import threading
+from typing import Dict, List, Any, Iterator
 from agents.sales import SalesAgent
 from agents.verification import VerificationAgent
 from agents.underwriting import UnderwritingAgent
@@ -8,8 +8,14 @@ from agents.document import DocumentAgent
 from agents.credit import CreditAgent
 from agents.upload import UploadAgent
 from agents.risk import RiskAgent
-from utils.mock_data import get_customer_data
+from utils.mock_data import get_customer_data, get_offer_data, update_customer, OFFER_BOOK
+from utils.offer_book import COLLATERAL_LTV, COLLATERAL_RATES
+from utils.model_router import get_model_router
+from utils.faq_index import FAQ_INDEX
+from utils.keyword_matcher import INTENT_MATCHER
+from utils.conversation_context import ConversationContext
 import json
+import base64
 from dotenv import load_dotenv
 import platform
 import subprocess
@@ -17,17 +23,28 @@ import re
 from user_store import add_application
 from uuid import uuid4
 from datetime import datetime
-from deep_translator import GoogleTranslator
+from utils.translation_pipeline import TRANSLATION_PIPELINE
+from utils.message_catalog import CATALOG
 
-# You may need to install langdetect: pip install langdetect
-try:
-    from langdetect import detect
-except ImportError:
-    detect = None
+from utils.language_detect import LANGUAGE_DETECTOR
+from utils.native_numerals import structured_english, read_monthly_income
+from state import ConversationState, ConversationStage
+from utils.prefetch import PrefetchCache
+from utils.credit_bureau import BureauError
 
 # Load environment variables
 load_dotenv()
 
+# A correction that is only a phone number ("+91 98765-43210")
+PHONE_ONLY = re.compile(r"\+?(?:\d[\s()-]*){10,}")
+
+# Token budget for conversation history in post-completion Q&A prompts
+POST_QA_CONTEXT_TOKENS = 600
+
+# Seconds to wait for the LLM to mirror the user's language before using the
+# plain machine translation (started alongside it) or English
+STYLED_TRANSLATION_DEADLINE = 6.0
+
 def open_pdf(filepath):
     """Open PDF file with default PDF viewer"""
     if not os.path.exists(filepath):
@@ -56,126 +73,22 @@ class SecuredLoanAgent:
     Secured Loan Agent - Handles collateral-based loan offers
     """
     def __init__(self):
-        # LTV Ratios
-        self.collateral_ltv = {
-            "property": 0.65, "vehicle": 0.75, "gold": 0.75,
-            "fd": 0.90, "mutual_funds": 0.70, "stocks": 0.60, "land": 0.60
-        }
-        
-        # Interest Rates
-        self.interest_rates = {
-            "property": 9.5, "vehicle": 10.5, "gold": 9.0,
-            "fd": 8.0, "mutual_funds": 11.0, "stocks": 12.0, "land": 10.0
-        }
-    
-    def parse_collateral(self, collateral_str: str) -> Dict[str, Any]:
-        """Parse collateral string to extract type and value - ROBUST"""
-        if not collateral_str or collateral_str.lower() in ["none", "no", "nil", "na", "nothing"]:
-            return None
-        
-        value = None
-        clean_str = collateral_str.replace('â', '').replace('¹', '').strip()
-        
-        # Logic to handle 'lacks', 'lakhs', 'k' in description
-        patterns = [
-            r'₹\s*([\d,]+)',             
-            r'value[:\s]+([\d,]+)',      
-            r'\b([\d,]{4,})\b',          
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, clean_str, re.IGNORECASE)
-            for match in matches:
-                try:
-                    clean_val = int(match.replace(',', '').replace(' ', ''))
-                    if clean_val > 1000: 
-                        value = clean_val
-                        break
-                except: continue
-            if value: break
-
-        if not value:
-            lakh_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:lakh|lac|l)', clean_str, re.IGNORECASE)
-            if lakh_match:
-                value = int(float(lakh_match.group(1)) * 100000)
-            elif re.search(r'(\d+(?:\.\d+)?)\s*k', clean_str, re.IGNORECASE):
-                k_match = re.search(r'(\d+(?:\.\d+)?)\s*k', clean_str, re.IGNORECASE)
-                value = int(float(k_match.group(1)) * 1000)
-
-        if not value:
-            return None
-        
-        collateral_lower = clean_str.lower()
-        
-        if any(x in collateral_lower for x in ["fixed deposit", " fd", "deposit"]):
-            collateral_type = "fd"
-        elif any(x in collateral_lower for x in ["property", "flat", "house", "villa", "apartment", "shop", "bhk", "residential"]):
-            collateral_type = "property"
-        elif any(x in collateral_lower for x in ["vehicle", "car", "bike", "scooter"]):
-            collateral_type = "vehicle"
-        elif any(x in collateral_lower for x in ["gold", "jewelry"]):
-            collateral_type = "gold"
-        elif any(x in collateral_lower for x in ["mutual fund", "mf", "stock", "share"]):
-            collateral_type = "stocks"
-        else:
-            collateral_type = "property"
-        
-        ltv = self.collateral_ltv.get(collateral_type, 0.60)
-        max_loan = int(value * ltv)
-        
-        return {
-            "type": collateral_type,
-            "description": collateral_str,
-            "value": value,
-            "max_loan": max_loan,
-            "interest_rate": self.interest_rates.get(collateral_type, 10.0),
-            "ltv_ratio": ltv * 100
-        }
+        self.collateral_ltv = COLLATERAL_LTV
+        self.interest_rates = COLLATERAL_RATES
     
     def get_secured_loan_offer(self, customer_data: Dict[str, Any]) -> Dict[str, Any]:
-        collateral_info = self.parse_collateral(customer_data.get("collateral", "None"))
-        
-        if not collateral_info:
-            return {"eligible": False, "reason": "No collateral available"}
-        
-        return {
-            "eligible": True,
-            "collateral": collateral_info,
-            "max_amount": collateral_info["max_loan"],
-            "interest_rate": collateral_info["interest_rate"],
-            "min_tenure": 12,
-            "max_tenure": 120,
-            "processing_fee": "1% of loan amount"
-        }
+        """Secured offer from the customer's offer book entry; collateral is parsed once per record"""
+        return OFFER_BOOK.customer_secured_offer(customer_data)
 
 # --- MASTER AGENT ---
-class MasterAgent:
-    def __init__(self, api_key: str):
-        self.client = Groq(api_key=api_key)
-        self.conversation_history: List[Dict[str, str]] = []
-        self.user_language = "en"
-        self.state = {
-            "stage": "initial",
-            "customer_data": None,
-            "temp_customer_data": None,
-            "awaiting_profile_permission": False,
-            "awaiting_secured_loan_decision": False,
-            "awaiting_detail_correction": False,
-            "awaiting_secured_loan_application": False,
-            "awaiting_manual_data_entry": False,
-            "manual_data_step": 0,
-            "secured_loan_offer": None,
-            "loan_request": {},
-            "verification_status": False,
-            "credit_score": None,
-            "underwriting_result": None,
-            "documents_uploaded": False,
-            "final_decision": None,
-            "waiting_for_manual_upload": False,
-            "user_personality": "friendly"
-        }
-        
-        self.sales_agent = SalesAgent(api_key)
+class WorkerAgents:
+    """
+    Worker agents shared by every session in the process. They hold no
+    conversation state, so they are built once: the risk model is loaded and
+    the upload folders are created on first use, not per session.
+    """
+
+    def __init__(self):
         self.verification_agent = VerificationAgent()
         self.credit_agent = CreditAgent()
         self.underwriting_agent = UnderwritingAgent()
@@ -184,6 +97,76 @@ class MasterAgent:
         self.secured_loan_agent = SecuredLoanAgent()
         self.risk_agent = RiskAgent()
 
+
+_worker_agents = None
+_worker_agents_lock = threading.Lock()
+
+
+def get_worker_agents() -> WorkerAgents:
+    """The process-wide WorkerAgents, created on first call"""
+    global _worker_agents
+    if _worker_agents is None:
+        with _worker_agents_lock:
+            if _worker_agents is None:
+                _worker_agents = WorkerAgents()
+    return _worker_agents
+
+
+class MasterAgent:
+    def __init__(self, api_key: str):
+        # Shared pooled client; routes each call to a small or large model
+        self.llm = get_model_router(api_key)
+        # Bounded history: recent turns verbatim, older ones in a running summary
+        self.conversation_history = ConversationContext()
+        self.user_language = "en"
+        self.detected_language = None
+        # Typed, slotted orchestrator state (see state.py)
+        self.state = ConversationState()
+        
+        # The sales agent carries this conversation's language and extracted
+        # loan details; every other worker is a shared, stateless singleton
+        self.sales_agent = SalesAgent(api_key)
+        workers = get_worker_agents()
+        self.verification_agent = workers.verification_agent
+        self.credit_agent = workers.credit_agent
+        self.underwriting_agent = workers.underwriting_agent
+        self.document_agent = workers.document_agent
+        self.upload_agent = workers.upload_agent
+        self.secured_loan_agent = workers.secured_loan_agent
+        self.risk_agent = workers.risk_agent
+        # Background results for later stages, started once the customer is known
+        self.prefetch = PrefetchCache()
+        # KYC check outcomes for this conversation (see utils/kyc.py)
+        self.kyc_results = {}
+
+    # --- SESSION SNAPSHOTS (see utils/session_store.py) ---
+    def snapshot(self) -> Dict[str, Any]:
+        """Everything needed to continue this conversation in another process"""
+        return {
+            "state": base64.b64encode(self.state.to_bytes()).decode("ascii"),
+            "history": self.conversation_history.to_dict(),
+            "user_language": self.user_language,
+            "detected_language": self.detected_language,
+            "sales": self.sales_agent.snapshot(self.conversation_history),
+            # Passed/failed KYC outcomes, so a resumed session does not re-run them
+            "kyc": [[list(key), outcome] for key, outcome in list(self.kyc_results.items())],
+        }
+
+    def restore(self, snapshot: Dict[str, Any]) -> "MasterAgent":
+        """Load a snapshot into this (freshly created) agent"""
+        state = snapshot["state"]
+        # Snapshots written before the binary state format hold a plain dict
+        self.state = (
+            ConversationState.from_dict(state) if isinstance(state, dict)
+            else ConversationState.from_bytes(base64.b64decode(state))
+        )
+        self.conversation_history = ConversationContext.from_dict(snapshot["history"])
+        self.user_language = snapshot.get("user_language", "en")
+        self.detected_language = snapshot.get("detected_language")
+        self.sales_agent.restore(snapshot.get("sales", {}), self.conversation_history)
+        self.kyc_results = {tuple(key): outcome for key, outcome in snapshot.get("kyc", [])}
+        return self
+
     def _translate_like_user(self, text: str, example_user_message: str) -> str:
         """
         Use Groq to translate `text` into the same language that
@@ -192,10 +175,13 @@ class MasterAgent:
         if not text.strip():
             return text
 
+        # The plain translation runs alongside as the fallback
+        plain = TRANSLATION_PIPELINE.submit(text, self.user_language, source="en")
         try:
-            response = self.client.chat.completions.create(
-                model="openai/gpt-oss-120b",
-                messages=[
+            styled = TRANSLATION_PIPELINE.run(
+                self.llm.complete,
+                "translation",
+                [
                     {
                         "role": "system",
                         "content": (
@@ -210,20 +196,23 @@ class MasterAgent:
                         "content": f"TEXT_A:\n{text}\n\nTEXT_B:\n{example_user_message}",
                     },
                 ],
+                stage=self.state.stage.value,
                 temperature=0.0,
                 max_tokens=800,
+                timeout=STYLED_TRANSLATION_DEADLINE,
             )
-            return response.choices[0].message.content.strip()
+            localized = TRANSLATION_PIPELINE.wait(styled, None, deadline=STYLED_TRANSLATION_DEADLINE)
         except Exception as e:
             print(f"[WARN] Translation failed: {e}")
-            # Fallback to English if translation fails
-            return text
+            localized = None
+        # Plain translation, or English if that failed or is still running
+        return localized or plain.result()
         
     def _is_affirmative(self, text: str) -> bool:
-        return any(word in text.lower() for word in ["yes", "yep", "ya", "y", "sure", "ok", "okay", "proceed", "accept", "correct"])
+        return "affirmative" in INTENT_MATCHER.classify(text)
 
     def _is_negative(self, text: str) -> bool:
-        return any(word in text.lower() for word in ["no", "n", "nope", "nah", "cancel", "stop"])
+        return "negative" in INTENT_MATCHER.classify(text)
     
     def _detect_personality(self, user_message: str) -> str:
         return "friendly"
@@ -254,25 +243,57 @@ May I have your phone number to get started?"""
         2. Run state machine.
         3. Translate our English reply -> user's selected language.
         """
+        normalized_message = self._record_user_turn(user_message)
 
-        # Language Detection for the first turn (if detect is available)
-        if self.state["stage"] == "initial" and detect:
-            try:
-                detected_lang = detect(user_message)
-                if detected_lang != 'en':
-                    self.user_language = detected_lang
-            except:
-                pass
+        # SPECIAL CASE: Needs Assessment uses SalesAgent, which already
+        # does its own translation in/out (or we handle it via _translate_like_user in _handle_needs_assessment).
+        if self.state.stage == ConversationStage.NEEDS_ASSESSMENT:
+            return self._handle_needs_assessment(user_message)
+
+        return self._dispatch_stage(normalized_message)
+
+    def process_message_stream(self, user_message: str) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming variant of process_message.
+        Yields {"type": "token", "text": ...} events while the Sales Agent's LLM
+        reply is generated, then a final {"type": "done", "reply": ...} event whose
+        reply is authoritative (e.g. it becomes the verification summary once the
+        loan terms are agreed). Stages that don't call the LLM yield only "done".
+        """
+        if self.state.stage != ConversationStage.NEEDS_ASSESSMENT:
+            yield {"type": "done", "reply": self.process_message(user_message)}
+            return
+
+        self._record_user_turn(user_message)
+        personality_instructions = self._get_personality_prompt(self.state.user_personality)
+        sales_response = None
+        for event in self.sales_agent.negotiate_loan_stream(
+            user_message, self.state.customer_data, self.conversation_history,
+            self.state.loan_request, personality_instructions
+        ):
+            if event["type"] == "result":
+                sales_response = event
+            else:
+                yield event
+
+        yield {"type": "done", "reply": self._complete_needs_assessment(sales_response, user_message)}
+
+    def _record_user_turn(self, user_message: str) -> str:
+        """Detect language, normalize the message to English and add it to history"""
+        # Language detection on the first turn(s); a confident result is kept for the session
+        if self.state.stage == ConversationStage.INITIAL:
+            if self.detected_language is None:
+                self.detected_language = LANGUAGE_DETECTOR.detect(user_message)
+            if self.detected_language and self.detected_language != "en":
+                self.user_language = self.detected_language
 
         # 1) Normalize incoming to English for internal logic
         if self.user_language != "en":
-            try:
-                normalized_message = GoogleTranslator(
-                    source='auto',
-                    target="en"
-                ).translate(user_message)
-            except Exception:
-                normalized_message = user_message
+            # Numbers-and-units answers are read natively without a translation call;
+            # otherwise keeps the original text if the translator fails or misses its deadline
+            normalized_message = structured_english(user_message) or TRANSLATION_PIPELINE.translate(
+                user_message, "en", source="auto"
+            )
         else:
             normalized_message = user_message
 
@@ -283,46 +304,46 @@ May I have your phone number to get started?"""
         })
 
         # Personality detection on normalized English text
-        self.state["user_personality"] = self._detect_personality(
+        self.state.user_personality = self._detect_personality(
             normalized_message.lower()
         )
+        return normalized_message
 
-        # SPECIAL CASE: Needs Assessment uses SalesAgent, which already
-        # does its own translation in/out (or we handle it via _translate_like_user in _handle_needs_assessment).
-        if self.state["stage"] == "needs_assessment":
-            return self._handle_needs_assessment(user_message)
-
+    def _dispatch_stage(self, normalized_message: str) -> str:
         # 2) All other stages use our ENGLISH normalized text
-        if self.state["stage"] == "initial":
+        if self.state.stage == ConversationStage.INITIAL:
             response = self._handle_initial_stage(normalized_message)
-        elif self.state["stage"] == "new_customer_onboarding":
+        elif self.state.stage == ConversationStage.NEW_CUSTOMER_ONBOARDING:
             response = self._handle_new_customer_onboarding(normalized_message)
-        elif self.state["stage"] == "verification":
+        elif self.state.stage == ConversationStage.VERIFICATION:
             response = self._handle_verification(normalized_message)
-        elif self.state["stage"] == "credit_check":
+        elif self.state.stage == ConversationStage.CREDIT_CHECK:
             response = self._handle_credit_check(normalized_message)
-        elif self.state["stage"] == "underwriting":
+        elif self.state.stage == ConversationStage.UNDERWRITING:
             response = self._handle_underwriting(normalized_message)
-        elif self.state["stage"] == "document_upload":
+        elif self.state.stage == ConversationStage.DOCUMENT_UPLOAD:
             response = self._handle_document_upload(normalized_message)
-        elif self.state["stage"] == "secured_loan":
+        elif self.state.stage == ConversationStage.SECURED_LOAN:
             response = self._handle_secured_loan_flow(normalized_message)
-        elif self.state["stage"] == "approval":
+        elif self.state.stage == ConversationStage.APPROVAL:
             response = self._handle_approval(normalized_message)
-        elif self.state["stage"] == "rejection":
+        elif self.state.stage == ConversationStage.REJECTION:
             response = self._handle_rejection(normalized_message)
-        elif self.state["stage"] == "completed":
-            response = "Our conversation has ended. If you'd like to start over, please type 'restart'."
+        elif self.state.stage == ConversationStage.COMPLETED:
+            response = CATALOG.render("conversation_ended")
         else:
-            response = "I'm sorry, something went wrong. Let me restart our conversation."
+            response = CATALOG.render("something_wrong")
 
         # 3) Translate response back to user's language (except English)
         if self.user_language != "en":
             try:
-                translated_response = GoogleTranslator(
-                    source="en",
-                    target=self.user_language
-                ).translate(response)
+                # Catalog templates are pre-translated; only free text hits the translator
+                translated_response = CATALOG.localize(
+                    response, self.user_language,
+                    lambda texts, persist: TRANSLATION_PIPELINE.translate_many(
+                        texts, self.user_language, source="en", persist=persist
+                    ),
+                )
                 return translated_response
             except Exception:
                 return response
@@ -337,82 +358,95 @@ May I have your phone number to get started?"""
             customer_data = get_customer_data(phone[-10:])
             
             if customer_data:
-                self.state["temp_customer_data"] = customer_data
-                self.state["awaiting_profile_permission"] = True
-                self.state["stage"] = "verification"
-                response = "Thank you. I found an existing profile linked to this number.\n\nMay I access your profile information to provide you with personalized loan offers?\n\nPlease reply with Yes or No."
+                self._start_prefetch(customer_data)
+                self.state.temp_customer_data = customer_data
+                self.state.awaiting_profile_permission = True
+                self.state.stage = ConversationStage.VERIFICATION
+                response = CATALOG.render("profile_found")
                 self.conversation_history.append({"role": "assistant", "content": response})
                 return response
             else:
-                self.state["awaiting_manual_data_entry"] = True
-                self.state["manual_data_step"] = 1
-                self.state["temp_customer_data"] = {"phone": phone[-10:]}
-                self.state["stage"] = "new_customer_onboarding"
+                self.state.awaiting_manual_data_entry = True
+                self.state.manual_data_step = 1
+                self.state.temp_customer_data = {"phone": phone[-10:]}
+                self.state.stage = ConversationStage.NEW_CUSTOMER_ONBOARDING
                 
-                response = "I couldn't find your profile in our system. No worries, let me collect your details.\n\nWhat is your full name?"
+                response = CATALOG.render("profile_not_found")
                 self.conversation_history.append({"role": "assistant", "content": response})
                 return response
         else:
-            response = "I didn't catch a valid phone number. Could you please provide your 10-digit mobile number?"
+            response = CATALOG.render("invalid_phone")
             self.conversation_history.append({"role": "assistant", "content": response})
             return response
 
+    def _start_prefetch(self, customer: Dict[str, Any]):
+        """
+        Start risk scoring for a customer found by phone, so the profile
+        permission answer finds it ready. Risk scoring runs in process; the
+        external checks wait for the customer's permission (_start_checks).
+        Offers are not prefetched: they are precomputed in the offer book.
+        """
+        self.prefetch.start("safety_score", self.risk_agent.get_safety_score, dict(customer))
+
+    def _start_checks(self, customer: Dict[str, Any]):
+        """
+        Start the credit pull and KYC checks once the customer has agreed to
+        use their profile; several turns still separate this from the
+        verification and credit-check stages that consume them.
+        """
+        self.prefetch.start("credit_report", self.credit_agent.get_credit_score, customer["phone"])
+        self.prefetch.start("kyc", self._verify_kyc, self.verification_agent.kyc.subject(customer))
+
+    def _verify_kyc(self, subject: Dict[str, Any]) -> Dict[str, Any]:
+        return self.verification_agent.verify_customer(subject, cache=self.kyc_results)
+
+    def _secured_offer(self) -> Dict[str, Any]:
+        return self.secured_loan_agent.get_secured_loan_offer(self.state.customer_data)
+
     def _handle_new_customer_onboarding(self, user_message: str) -> str:
-        step = self.state["manual_data_step"]
+        step = self.state.manual_data_step
         
         if step == 1:
-            self.state["temp_customer_data"]["name"] = user_message.strip()
-            self.state["manual_data_step"] = 2
-            response = "Great. What is your city?"
+            self.state.temp_customer_data["name"] = user_message.strip()
+            self.state.manual_data_step = 2
+            response = CATALOG.render("ask_city")
             self.conversation_history.append({"role": "assistant", "content": response})
             return response
         
         elif step == 2:
-            self.state["temp_customer_data"]["city"] = user_message.strip()
-            self.state["manual_data_step"] = 3
-            response = "Perfect. What is your complete address?"
+            self.state.temp_customer_data["city"] = user_message.strip()
+            self.state.manual_data_step = 3
+            response = CATALOG.render("ask_address")
             self.conversation_history.append({"role": "assistant", "content": response})
             return response
 
         elif step == 3:
-            self.state["temp_customer_data"]["address"] = user_message.strip()
-            self.state["manual_data_step"] = 4
-            response = "Thank you. What is your email address?"
+            self.state.temp_customer_data["address"] = user_message.strip()
+            self.state.manual_data_step = 4
+            response = CATALOG.render("ask_email")
             self.conversation_history.append({"role": "assistant", "content": response})
             return response
 
         elif step == 4:
-            self.state["temp_customer_data"]["email"] = user_message.strip()
-            self.state["manual_data_step"] = 5
-            response = "Thanks. What is your monthly income (in rupees)?"
+            self.state.temp_customer_data["email"] = user_message.strip()
+            self.state.manual_data_step = 5
+            response = CATALOG.render("ask_income")
             self.conversation_history.append({"role": "assistant", "content": response})
             return response
 
         elif step == 5:
-            raw_text = user_message.lower().replace(',', '').strip()
-            multiplier = 1
-            if 'k' in raw_text: multiplier = 1000
-            elif 'l' in raw_text: multiplier = 100000
-            elif 'c' in raw_text: multiplier = 10000000
+            monthly_income = read_monthly_income(user_message)
             
-            income_match = re.search(r'(\d+(\.\d+)?)', raw_text)
-            
-            if income_match:
-                monthly_income = int(float(income_match.group(1)) * multiplier)
-                self.state["temp_customer_data"]["monthly_income"] = monthly_income
-                self.state["temp_customer_data"]["pre_approved_limit"] = min(monthly_income * 10, 500000)
+            if monthly_income is not None:
+                self.state.temp_customer_data["monthly_income"] = monthly_income
+                self.state.temp_customer_data["pre_approved_limit"] = min(monthly_income * 10, 500000)
                 
-                self.state["manual_data_step"] = 6
-                response = """Great. One last question:
-
-Do you have any collateral that you would like to use for a secured loan? This could be Property, Vehicle, Gold, or Fixed Deposits.
-
-Please provide details like '3BHK worth 30 lakhs' or 'Honda City Car'.
-(Or simply type 'none' if you don't have collateral)"""
+                self.state.manual_data_step = 6
+                response = CATALOG.render("ask_collateral")
                 self.conversation_history.append({"role": "assistant", "content": response})
                 return response
             else:
-                response = "I didn't catch a valid amount. Please type your monthly income (e.g., 50000)."
+                response = CATALOG.render("invalid_income")
                 self.conversation_history.append({"role": "assistant", "content": response})
                 return response
 
@@ -423,31 +457,33 @@ Please provide details like '3BHK worth 30 lakhs' or 'Honda City Car'.
             else:
                 collateral_value = user_message.strip()
             
-            self.state["temp_customer_data"].update({
+            self.state.temp_customer_data.update({
                 "credit_score": 700,
                 "employment": "Salaried",
                 "collateral": collateral_value,
-                "id": f"C{100 + hash(self.state['temp_customer_data']['phone']) % 100:02d}",
+                "id": f"C{100 + hash(self.state.temp_customer_data['phone']) % 100:02d}",
                 "age": 30
             })
             
             # --- SHAP INTEGRATION HERE ---
             # Call the Risk Agent to get the score AND the explanation
-            risk_result = self.risk_agent.get_safety_score(self.state["temp_customer_data"])
-            self.state["temp_customer_data"]["internal_safety_score"] = risk_result["safety_score"]
+            risk_result = self.risk_agent.get_safety_score(self.state.temp_customer_data)
+            self.state.temp_customer_data["internal_safety_score"] = risk_result["safety_score"]
             risk_explanation = risk_result.get("explanation", "Assessment complete.")
             # -----------------------------
 
-            self.state["customer_data"] = self.state["temp_customer_data"]
-            self.state["awaiting_manual_data_entry"] = False
-            self.state["stage"] = "needs_assessment"
+            self.state.customer_data = self.state.temp_customer_data
+            # Registered like any database customer, so the offer book parses the collateral once
+            update_customer(self.state.customer_data)
+            self.state.awaiting_manual_data_entry = False
+            self.state.stage = ConversationStage.NEEDS_ASSESSMENT
             
-            pre_approved_limit = self.state['customer_data']['pre_approved_limit']
-            collateral_info = self.secured_loan_agent.parse_collateral(collateral_value)
+            pre_approved_limit = self.state.customer_data['pre_approved_limit']
+            collateral_info = self._secured_offer().get("collateral")
             
-            summary = f"Perfect! Thank you for providing your details, {self.state['customer_data']['name']}.\n\n"
+            summary = f"Perfect! Thank you for providing your details, {self.state.customer_data['name']}.\n\n"
             summary += f"Profile Summary:\n"
-            summary += f"- Monthly Income: Rs. {self.state['temp_customer_data']['monthly_income']:,}\n"
+            summary += f"- Monthly Income: Rs. {self.state.temp_customer_data['monthly_income']:,}\n"
             # Displaying the Intelligent Recommendation
             summary += f"- AI Risk Assessment: {risk_explanation}\n"
             
@@ -468,27 +504,30 @@ Please provide details like '3BHK worth 30 lakhs' or 'Honda City Car'.
             return summary
 
     def _handle_needs_assessment(self, user_message: str) -> str:
-        personality_instructions = self._get_personality_prompt(self.state["user_personality"])
+        personality_instructions = self._get_personality_prompt(self.state.user_personality)
         sales_response = self.sales_agent.negotiate_loan(
-            user_message, self.state["customer_data"], self.conversation_history,
-            self.state["loan_request"], personality_instructions
+            user_message, self.state.customer_data, self.conversation_history,
+            self.state.loan_request, personality_instructions
         )
-        self.state["loan_request"] = sales_response.get("loan_details", self.state["loan_request"])
+        return self._complete_needs_assessment(sales_response, user_message)
+
+    def _complete_needs_assessment(self, sales_response: Dict[str, Any], user_message: str) -> str:
+        self.state.loan_request = sales_response.get("loan_details", self.state.loan_request)
         
         if sales_response.get("ready_for_next_stage"):
-            self.state["stage"] = "verification"
+            self.state.stage = ConversationStage.VERIFICATION
             
             verification_msg = f"""Perfect! Let me summarize:
-- Loan Amount: ₹{self.state['loan_request']['amount']:,}
-- Purpose: {self.state['loan_request']['purpose'].replace('_', ' ').title()}
-- Tenure: {self.state['loan_request']['tenure']} months ({self.state['loan_request']['tenure']//12} years)
-- Interest Rate: {self.state['loan_request']['interest_rate']}% p.a.
-- Monthly EMI: ₹{self.state['loan_request']['emi']:,}
+- Loan Amount: ₹{self.state.loan_request['amount']:,}
+- Purpose: {self.state.loan_request['purpose'].replace('_', ' ').title()}
+- Tenure: {self.state.loan_request['tenure']} months ({self.state.loan_request['tenure']//12} years)
+- Interest Rate: {self.state.loan_request['interest_rate']}% p.a.
+- Monthly EMI: ₹{self.state.loan_request['emi']:,}
 
 Now, for security purposes, I need to verify your details. Let me confirm:
-- Name: {self.state['customer_data']['name']}
-- Phone: {self.state['customer_data']['phone']}
-- Address: {self.state['customer_data']['address']}
+- Name: {self.state.customer_data['name']}
+- Phone: {self.state.customer_data['phone']}
+- Address: {self.state.customer_data['address']}
 
 Is this information correct? (Yes/No)"""
             
@@ -506,41 +545,39 @@ Is this information correct? (Yes/No)"""
             return response
 
     def _get_verification_summary(self) -> str:
-        return f"""Perfect. Let me summarize your request:
-- Amount: Rs. {self.state['loan_request']['amount']:,}
-- Purpose: {self.state['loan_request']['purpose']}
-- Tenure: {self.state['loan_request']['tenure']} months
-- EMI: Rs. {self.state['loan_request']['emi']:,}
-
-For security, I need to verify your details:
-- Name: {self.state['customer_data']['name']}
-- Phone: {self.state['customer_data']['phone']}
-- Address: {self.state['customer_data']['address']}
-- Email: {self.state['customer_data'].get('email', 'Not provided')}
-
-Is this correct? (Yes/No)"""
+        return CATALOG.render(
+            "verification_summary",
+            amount=self.state.loan_request['amount'],
+            purpose=self.state.loan_request['purpose'],
+            tenure=self.state.loan_request['tenure'],
+            emi=self.state.loan_request['emi'],
+            name=self.state.customer_data['name'],
+            phone=self.state.customer_data['phone'],
+            address=self.state.customer_data['address'],
+            email=self.state.customer_data.get('email', 'Not provided'),
+        )
 
     def _handle_verification(self, user_message: str) -> str:
-        user_lower = user_message.lower()
+        # Classify once against every keyword set
+        intents = INTENT_MATCHER.classify(user_message)
         
         # 1. Check for LOAN updates (Amount, Tenure, Purpose) -> Handled by Sales Agent
-        if any(word in user_lower for word in ["purpose", "amount", "tenure", "year", "month", "lacs", "lakh"]) and \
-           any(word in user_lower for word in ["change", "update", "modify", "wrong"]):
-             self.state["stage"] = "needs_assessment"
-             return "Understood. Let's update your loan details.\n" + self._handle_needs_assessment(user_message)
+        if "loan_field" in intents and "change_request" in intents:
+             self.state.stage = ConversationStage.NEEDS_ASSESSMENT
+             return CATALOG.render("update_loan_details") + self._handle_needs_assessment(user_message)
 
         # 2. Check for PERSONAL updates (Smart Capture) -> Update directly
         personal_updates = {}
         
         # Address
-        if "address" in user_lower:
+        if "field:address" in intents:
             # Matches: "change address to Delhi", "Address is Delhi", "update address: Delhi"
             addr_match = re.search(r'address\s*(?:is|to|:|->)\s*(.+)', user_message, re.IGNORECASE)
             if addr_match:
                 personal_updates["address"] = addr_match.group(1).strip()
         
         # Name
-        if "name" in user_lower:
+        if "field:name" in intents:
             name_match = re.search(r'name\s*(?:is|to|:|->)\s*([a-zA-Z\s\.]+)', user_message, re.IGNORECASE)
             if name_match:
                 name_val = name_match.group(1).strip()
@@ -549,102 +586,148 @@ Is this correct? (Yes/No)"""
         # Email
         email_match = re.search(r'[\w\.-]+@[\w\.-]+', user_message)
         if email_match:
-             if "email" in user_lower or "@" in user_message:
+             if "field:email" in intents:
                  personal_updates["email"] = email_match.group(0)
 
+        # Phone: "my number is 98765 43210", "change phone to +91 9876543210"
+        if "field:phone" in intents:
+            phone = ''.join(filter(str.isdigit, user_message))
+            if len(phone) >= 10:
+                personal_updates["phone"] = phone[-10:]
+
         # Apply updates
         if personal_updates:
-            self.state["customer_data"].update(personal_updates)
-            self.state["awaiting_detail_correction"] = False
-            return f"✅ Updated: {', '.join(personal_updates.keys())}. Let me re-verify:\n\n" + self._get_verification_summary()
+            self.state.customer_data.update(personal_updates)
+            self.state.awaiting_detail_correction = False
+            return CATALOG.render("details_updated_fields", fields=', '.join(personal_updates.keys())) + self._get_verification_summary()
 
         # 3. Handle Fallback Correction Loop (if Smart Capture failed or just "No" was said)
-        if self.state.get("awaiting_detail_correction"):
+        if self.state.awaiting_detail_correction:
             updated_data = {}
             if not updated_data and len(user_message) > 3:
                 # Naive assumption fallback
                 if "@" in user_message: updated_data["email"] = user_message.strip()
+                elif PHONE_ONLY.fullmatch(user_message.strip()):
+                    updated_data["phone"] = ''.join(filter(str.isdigit, user_message))[-10:]
                 else: updated_data["address"] = user_message.strip() 
             
             if updated_data:
-                self.state["customer_data"].update(updated_data)
-                self.state["awaiting_detail_correction"] = False
-                return "Details updated. Let me re-verify...\n\n" + self._get_verification_summary()
+                self.state.customer_data.update(updated_data)
+                self.state.awaiting_detail_correction = False
+                return CATALOG.render("details_updated") + self._get_verification_summary()
 
         # 4. Profile Permission Loop
-        if self.state.get("awaiting_profile_permission"):
-            if self._is_affirmative(user_lower):
-                customer_data = self.state["temp_customer_data"]
+        if self.state.awaiting_profile_permission:
+            if "affirmative" in intents:
+                customer_data = self.state.temp_customer_data
                 
                 # --- SHAP INTEGRATION FOR EXISTING CUSTOMERS ---
-                risk_result = self.risk_agent.get_safety_score(customer_data)
+                risk_result = self.prefetch.take(
+                    "safety_score", self.risk_agent.get_safety_score, dict(customer_data), stage=self.state.stage.value
+                )
                 customer_data["internal_safety_score"] = risk_result["safety_score"]
                 risk_explanation = risk_result.get("explanation", "")
                 # -----------------------------------------------
 
-                self.state["customer_data"] = customer_data
-                self.state["stage"] = "needs_assessment"
-                self.state["awaiting_profile_permission"] = False
+                self.state.customer_data = customer_data
+                self.state.stage = ConversationStage.NEEDS_ASSESSMENT
+                self.state.awaiting_profile_permission = False
+                self._start_checks(customer_data)
                 
-                response = f"Great. I found your profile, {customer_data['name']}. \n"
+                response = CATALOG.render("profile_welcome", name=customer_data['name'])
                 response += f"Risk Insight: {risk_explanation}\n\n"
-                response += f"You have a pre-approved limit of Rs. {customer_data['pre_approved_limit']:,}.\n\n"
-                response += "Could you tell me how much loan amount you are looking for and for what purpose?"
+                offer = get_offer_data(customer_data["phone"])
+                limit = offer["max_amount"] if offer else customer_data['pre_approved_limit']
+                response += CATALOG.render("pre_approved_limit_question", limit=limit)
                 self.conversation_history.append({"role": "assistant", "content": response})
                 return response
-            elif self._is_negative(user_lower):
-                self.state["awaiting_profile_permission"] = False
-                self.state["awaiting_manual_data_entry"] = True
-                self.state["manual_data_step"] = 1
-                self.state["stage"] = "new_customer_onboarding"
-                response = "No problem. Let's enter your details manually. What is your full name?"
+            elif "negative" in intents:
+                # The stored profile is not used: drop its prefetched risk score
+                self.prefetch.clear()
+                self.state.awaiting_profile_permission = False
+                self.state.awaiting_manual_data_entry = True
+                self.state.manual_data_step = 1
+                self.state.stage = ConversationStage.NEW_CUSTOMER_ONBOARDING
+                response = CATALOG.render("manual_entry")
                 self.conversation_history.append({"role": "assistant", "content": response})
                 return response
         
         # 5. Standard Yes/No Verification
-        if self._is_affirmative(user_lower):
-            self.state["verification_status"] = True
-            self.state["stage"] = "credit_check"
-            return "Thank you. Checking your credit profile now..." + "\n\n" + self._handle_credit_check("")
+        if "affirmative" in intents:
+            # Started when the customer was found; re-run only for corrected details or pending checks
+            kyc = self.prefetch.take(
+                "kyc", self._verify_kyc, self.verification_agent.kyc.subject(self.state.customer_data),
+                stage=self.state.stage.value,
+            )
+            if not kyc["verified"]:
+                print(f"[KYC] {kyc['message']}")
+                if kyc["failed"]:
+                    # Any failed detail, the phone included, can be corrected in the next message
+                    self.state.awaiting_detail_correction = True
+                    response = CATALOG.render("kyc_failed")
+                else:
+                    response = CATALOG.render("kyc_pending")
+                self.conversation_history.append({"role": "assistant", "content": response})
+                return response
+            self.state.verification_status = True
+            self.state.stage = ConversationStage.CREDIT_CHECK
+            return CATALOG.render("checking_credit") + "\n\n" + self._handle_credit_check("")
         
-        elif self._is_negative(user_lower):
-            self.state["awaiting_detail_correction"] = True
-            return "Oh, I see. Which personal detail is incorrect? (Name, Phone, Address, or Email)"
+        elif "negative" in intents:
+            self.state.awaiting_detail_correction = True
+            return CATALOG.render("which_detail_incorrect")
         
-        return "Please confirm if your details are correct (Yes/No). Or say 'change amount' if you want to modify the loan."
+        return CATALOG.render("confirm_details")
 
     def _handle_credit_check(self, user_message: str) -> str:
-        credit_result = self.credit_agent.get_credit_score(self.state["customer_data"]["phone"])
-        self.state["credit_score"] = credit_result["score"]
+        try:
+            credit_result = self.prefetch.take(
+                "credit_report", self.credit_agent.get_credit_score, self.state.customer_data["phone"],
+                stage=self.state.stage.value,
+            )
+        except BureauError as e:
+            # Stay in CREDIT_CHECK so the customer's next message pulls again
+            print(f"⚠️ Credit bureau unavailable: {e}")
+            response = CATALOG.render("credit_check_unavailable")
+            self.conversation_history.append({"role": "assistant", "content": response})
+            return response
+
+        if credit_result["score"] is None:
+            self.state.stage = ConversationStage.REJECTION
+            response = CATALOG.render("credit_no_record")
+            self.conversation_history.append({"role": "assistant", "content": response})
+            return response + "\n" + self._send_rejection_options()
+
+        self.state.credit_score = credit_result["score"]
         
         if credit_result["score"] < 700:
-            self.state["stage"] = "rejection"
-            response = f"I have reviewed your profile. Your credit score is {credit_result['score']}, which is below our minimum for unsecured loans."
+            self.state.stage = ConversationStage.REJECTION
+            response = CATALOG.render("credit_score_low", score=credit_result['score'])
             self.conversation_history.append({"role": "assistant", "content": response})
             return response + "\n" + self._send_rejection_options()
         else:
-            self.state["stage"] = "underwriting"
-            response = f"Your credit score of {credit_result['score']} is strong. Evaluating eligibility..."
+            self.state.stage = ConversationStage.UNDERWRITING
+            response = CATALOG.render("credit_score_ok", score=credit_result['score'])
             self.conversation_history.append({"role": "assistant", "content": response})
             return response + "\n\n" + self._handle_underwriting("")
 
     def _handle_underwriting(self, user_message: str) -> str:
         underwriting_result = self.underwriting_agent.evaluate_loan(
-            customer_data=self.state["customer_data"],
-            loan_request=self.state["loan_request"],
-            credit_score=self.state["credit_score"]
+            customer_data=self.state.customer_data,
+            loan_request=self.state.loan_request,
+            credit_score=self.state.credit_score
         )
-        self.state["underwriting_result"] = underwriting_result
+        self.state.underwriting_result = underwriting_result
         
         if underwriting_result["decision"] == "APPROVED":
-            self.state["stage"] = "approval"
-            return "Congratulations! Your loan is APPROVED.\n" + self._generate_sanction_letter()
+            self.state.stage = ConversationStage.APPROVAL
+            return CATALOG.render("loan_approved") + self._generate_sanction_letter()
         elif underwriting_result["decision"] == "REQUIRES_SALARY_SLIP":
-            self.state["stage"] = "document_upload"
-            return "We need to verify your income. Please upload your latest salary slip (type 'upload' or 'manual upload')."
+            self.state.stage = ConversationStage.DOCUMENT_UPLOAD
+            return CATALOG.render("salary_slip_needed")
         else:
-            self.state["stage"] = "rejection"
-            response = f"I have reviewed your application. The requested amount of Rs. {self.state['loan_request']['amount']:,} exceeds our unsecured limits based on your profile."
+            self.state.stage = ConversationStage.REJECTION
+            response = CATALOG.render("amount_exceeds_limit", amount=self.state.loan_request['amount'])
             self.conversation_history.append({"role": "assistant", "content": response})
             return response + "\n" + self._send_rejection_options()
 
@@ -654,48 +737,41 @@ Is this correct? (Yes/No)"""
         # 1️⃣ Handle Skip Logic
         # (I uncommented this line so the rest of the code is reachable)
         if "skip" in user_lower:
-            self.state["stage"] = "credit_check"
-            return (
-                "No problem. Let’s explore alternative options such as secured loans "
-                "or adjusting the loan amount and tenure."
-            )
+            self.state.stage = ConversationStage.CREDIT_CHECK
+            return CATALOG.render("upload_skipped")
 
         # 2️⃣ If user explicitly types 'upload' → run demo upload flow
         if user_lower == "upload":
-            customer_name = self.state["customer_data"]["name"]
+            customer_name = self.state.customer_data["name"]
             upload_result = self.upload_agent.process_upload(customer_name)
 
             # Mark document as uploaded
-            self.state["documents_uploaded"] = True
+            self.state.documents_uploaded = True
 
             # Store extracted salary if available
             if upload_result.get("monthly_salary"):
-                self.state["customer_data"]["salary"] = upload_result["monthly_salary"]
+                self.state.customer_data["salary"] = upload_result["monthly_salary"]
 
         # 3️⃣ If document is uploaded (demo OR frontend-triggered)
         if (
-            self.state.get("documents_uploaded")
+            self.state.documents_uploaded
             or "uploaded" in user_lower
             or "document" in user_lower
         ):
 
             # Extract monthly salary safely
             monthly_salary = (
-                self.state["customer_data"].get("salary")
-                or self.state["customer_data"].get("monthly_income")
+                self.state.customer_data.get("salary")
+                or self.state.customer_data.get("monthly_income")
                 or 0
             )
 
             if monthly_salary == 0:
-                return (
-                    "Unable to verify your income from the document. "
-                    "Please try uploading again by typing 'upload', "
-                    "or enter your income manually."
-                )
+                return CATALOG.render("upload_unverified")
 
             # Calculate EMI
-            loan_amount = self.state["loan_request"]["amount"]
-            tenure = self.state["loan_request"]["tenure"]
+            loan_amount = self.state.loan_request["amount"]
+            tenure = self.state.loan_request["tenure"]
             interest_rate = 12.0
 
             # Import moved inside for context, but usually better at top of file
@@ -708,101 +784,90 @@ Is this correct? (Yes/No)"""
             )
 
             if result["decision"] == "APPROVED":
-                self.state["stage"] = "approval"
-                self.state["final_decision"] = "APPROVED"
+                self.state.stage = ConversationStage.APPROVAL
+                self.state.final_decision = "APPROVED"
 
                 return (
-                    f"✅ Document verified successfully!\n\n"
-                    f"Your monthly income of ₹{monthly_salary:,} qualifies for this loan.\n"
-                    f"EMI-to-Income ratio: {result['emi_ratio']:.1f}%\n\n"
+                    CATALOG.render("upload_approved", income=monthly_salary, ratio=result['emi_ratio'])
                     + self._generate_sanction_letter()
                 )
 
             # Rejected → move to rejection flow
             # (This runs if the previous 'return' was not hit)
-            self.state["stage"] = "rejection"
-            self.state["final_decision"] = "REJECTED"
+            self.state.stage = ConversationStage.REJECTION
+            self.state.final_decision = "REJECTED"
 
             return (
-                f"❌ Based on your monthly income of ₹{monthly_salary:,}, "
-                f"the EMI of ₹{monthly_emi:,.0f} would be "
-                f"{result['emi_ratio']:.1f}% of your income, "
-                f"which exceeds our 50% limit.\n\n"
+                CATALOG.render("upload_rejected", income=monthly_salary, emi=monthly_emi, ratio=result['emi_ratio'])
                 + self._send_rejection_options()
             )
 
         # 4️⃣ Default: still waiting for document upload
-        return (
-            "Please click the upload button (📎) to upload your salary slip, "
-            "or type 'upload' (demo) or 'skip' to explore other options."
-        )
+        return CATALOG.render("upload_prompt")
 
     def _send_rejection_options(self) -> str:
-        collateral_info = self.secured_loan_agent.parse_collateral(self.state["customer_data"].get("collateral", "None"))
+        secured_offer = self._secured_offer()
+        # Kept for the customer's reply to these options
+        self.state.secured_loan_offer = secured_offer
+        collateral_info = secured_offer.get("collateral")
         
-        req_amount = self.state["loan_request"].get("amount", 0)
-        pre_approved = self.state["customer_data"]["pre_approved_limit"]
+        req_amount = self.state.loan_request.get("amount", 0)
+        pre_approved = self.state.customer_data["pre_approved_limit"]
         suggested = max(pre_approved, int(req_amount * 0.85 / 10000) * 10000)
         
-        response = "Here are your options:\n"
-        response += f"1. Try a lower amount: Rs. {suggested:,} (Reply 'Option 1')\n"
         if collateral_info:
-            response += f"2. Secured Loan: Get up to Rs. {collateral_info['max_loan']:,} using your {collateral_info['type']} (Reply 'Option 2')\n"
-            response += f"3. Accept Pre-approved: Rs. {pre_approved:,} (Reply 'Option 3')\n"
-        else:
-            response += f"2. Accept Pre-approved: Rs. {pre_approved:,} (Reply 'Option 2')\n"
-            
-        return response
+            return CATALOG.render(
+                "rejection_options_secured", suggested=suggested, max_loan=collateral_info['max_loan'],
+                collateral_type=collateral_info['type'], pre_approved=pre_approved,
+            )
+        return CATALOG.render("rejection_options", suggested=suggested, pre_approved=pre_approved)
 
     def _handle_rejection(self, user_message: str) -> str:
         user_lower = user_message.lower()
-        collateral_info = self.secured_loan_agent.parse_collateral(self.state["customer_data"].get("collateral", "None"))
+        secured_offer = self.state.secured_loan_offer or self._secured_offer()
+        collateral_info = secured_offer.get("collateral")
         
         is_option_1 = "option 1" in user_lower or "lower amount" in user_lower
         is_option_2 = "option 2" in user_lower
         is_option_3 = "option 3" in user_lower
         
         if is_option_1:
-            req_amount = self.state["loan_request"].get("amount", 0)
-            suggested = max(self.state["customer_data"]["pre_approved_limit"], int(req_amount * 0.85 / 10000) * 10000)
-            self.state["loan_request"]["amount"] = suggested
-            self.state["stage"] = "underwriting"
-            return f"Okay, let's try for Rs. {suggested:,}. Re-evaluating..." + "\n\n" + self._handle_underwriting("")
+            req_amount = self.state.loan_request.get("amount", 0)
+            suggested = max(self.state.customer_data["pre_approved_limit"], int(req_amount * 0.85 / 10000) * 10000)
+            self.state.loan_request["amount"] = suggested
+            self.state.stage = ConversationStage.UNDERWRITING
+            return CATALOG.render("retry_lower_amount", amount=suggested) + "\n\n" + self._handle_underwriting("")
 
         elif is_option_2 and collateral_info:
-            secured_offer = self.secured_loan_agent.get_secured_loan_offer(self.state["customer_data"])
-            self.state["secured_loan_offer"] = secured_offer
-            self.state["awaiting_secured_loan_application"] = True
-            self.state["stage"] = "secured_loan"
+            self.state.secured_loan_offer = secured_offer
+            self.state.awaiting_secured_loan_application = True
+            self.state.stage = ConversationStage.SECURED_LOAN
             
-            msg = f"""Perfect choice. Let me explain your Secured Loan option.
-
-Collateral: {secured_offer['collateral']['description']} (Value: Rs. {secured_offer['collateral']['value']:,})
-
-Loan Offer:
-- Maximum Amount: Rs. {secured_offer['max_amount']:,}
-- Interest Rate: {secured_offer['interest_rate']}% p.a.
-- Tenure: Up to 10 years
-
-How much would you like to borrow? (Max: Rs. {secured_offer['max_amount']:,})"""
+            msg = CATALOG.render(
+                "secured_offer",
+                description=secured_offer['collateral']['description'],
+                value=secured_offer['collateral']['value'],
+                max_amount=secured_offer['max_amount'],
+                rate=secured_offer['interest_rate'],
+            )
             self.conversation_history.append({"role": "assistant", "content": msg})
             return msg
         
         elif (is_option_3) or (is_option_2 and not collateral_info) or "yes" in user_lower:
-            self.state["loan_request"]["amount"] = self.state["customer_data"]["pre_approved_limit"]
-            self.state["stage"] = "approval"
-            self.state["final_decision"] = "APPROVED"
-            return f"Great. Processing your pre-approved loan of Rs. {self.state['loan_request']['amount']:,}." + "\n" + self._generate_sanction_letter()
+            self.state.loan_request["amount"] = self.state.customer_data["pre_approved_limit"]
+            self.state.stage = ConversationStage.APPROVAL
+            self.state.final_decision = "APPROVED"
+            return CATALOG.render("pre_approved_processing", amount=self.state.loan_request['amount']) + self._generate_sanction_letter()
 
         else:
              return self._send_rejection_options()
 
     def _handle_secured_loan_flow(self, user_message: str) -> str:
-        if not self.state.get("awaiting_secured_loan_application"):
-            return "Session expired. Type 'restart'."
+        if not self.state.awaiting_secured_loan_application:
+            return CATALOG.render("session_expired")
             
         user_lower = user_message.lower()
-        secured_offer = self.state["secured_loan_offer"]
+        secured_offer = self.state.secured_loan_offer
         
         if any(w in user_lower for w in ["max", "maximum", "full", "all"]):
             requested_amount = secured_offer["max_amount"]
@@ -814,50 +879,62 @@ How much would you like to borrow? (Max: Rs. {secured_offer['max_amount']:,})"""
                 elif val < 100: val *= 100000 
                 requested_amount = val
             else:
-                return f"Please specify an amount up to Rs. {secured_offer['max_amount']:,}."
+                return CATALOG.render("secured_amount_prompt", max_amount=secured_offer['max_amount'])
 
         if requested_amount > secured_offer["max_amount"]:
-            return f"That exceeds the limit. Maximum allowed is Rs. {secured_offer['max_amount']:,}. Would you like the maximum?"
+            return CATALOG.render("secured_amount_exceeds", max_amount=secured_offer['max_amount'])
         
-        self.state["loan_request"]["amount"] = requested_amount
-        self.state["loan_request"]["interest_rate"] = secured_offer["interest_rate"]
-        self.state["loan_request"]["loan_type"] = "secured"
+        self.state.loan_request["amount"] = requested_amount
+        self.state.loan_request["interest_rate"] = secured_offer["interest_rate"]
+        self.state.loan_request["loan_type"] = "secured"
         
         tenure = 120 
         if "year" in user_lower:
             y_match = re.search(r'(\d+)\s*y', user_lower)
             if y_match: tenure = int(y_match.group(1)) * 12
             
-        self.state["loan_request"]["tenure"] = tenure
+        self.state.loan_request["tenure"] = tenure
         r = secured_offer["interest_rate"] / (12 * 100)
         emi = int(requested_amount * r * (1+r)**tenure / ((1+r)**tenure - 1))
-        self.state["loan_request"]["emi"] = emi
+        self.state.loan_request["emi"] = emi
         
-        self.state["stage"] = "approval"
-        self.state["final_decision"] = "APPROVED_SECURED"
-        self.state["awaiting_secured_loan_application"] = False
+        self.state.stage = ConversationStage.APPROVAL
+        self.state.final_decision = "APPROVED_SECURED"
+        self.state.awaiting_secured_loan_application = False
         
-        return f"Excellent. Your Secured Loan of Rs. {requested_amount:,} is APPROVED.\n\nLoan Details:\n- Tenure: {tenure} months\n- Interest: {secured_offer['interest_rate']}%\n- EMI: Rs. {emi:,}\n\n" + self._generate_sanction_letter()
+        return (
+            CATALOG.render("secured_approved", amount=requested_amount, tenure=tenure, rate=secured_offer['interest_rate'], emi=emi)
+            + self._generate_sanction_letter()
+        )
 
     def _generate_sanction_letter(self) -> str:
         from utils.pdf_generator import generate_sanction_letter
         
         pdf_path = generate_sanction_letter(
-            customer_data=self.state["customer_data"],
-            loan_details=self.state["loan_request"]
+            customer_data=self.state.customer_data,
+            loan_details=self.state.loan_request
         )
         
-        self.state["stage"] = "completed" 
+        self.state.stage = ConversationStage.COMPLETED 
         
         try:
             open_pdf(pdf_path)
         except: pass
         
-        return f"Sanction Letter Generated: {pdf_path}\n\nOur team will contact you shortly. Is there anything else you would like to know about your loan?"
+        return CATALOG.render("sanction_generated", path=pdf_path)
 
     def _handle_approval(self, user_message: str):
         return self._handle_post_completion_qa(user_message)
 
+    def _is_generic_question(self, text: str) -> bool:
+        """
+        A question about a general loan topic ("what is prepayment?") that refers
+        neither to the customer's own loan, numbers or details nor to earlier
+        turns ("why was it rejected?"); anything else keeps its history
+        """
+        labels = INTENT_MATCHER.classify(text)
+        return "generic_topic" in labels and "context_reference" not in labels and not re.search(r"\d", text)
+
     def _handle_post_completion_qa(self, user_message: str) -> str:
         system_prompt = """You are a helpful bank agent. The user has just completed their loan application.
 Answer their questions simply and clearly. 
@@ -865,17 +942,30 @@ DO NOT use Markdown tables. Use bullet points or simple paragraphs.
 DO NOT use asterisks or emojis.
 Keep answers short and human-like."""
         
+        # Curated FAQ answers are served locally, without an LLM round trip
+        faq_answer = FAQ_INDEX.answer(user_message)
+        if faq_answer:
+            self.conversation_history.append({"role": "assistant", "content": faq_answer})
+            return faq_answer
+        
+        # Generic questions ("what is prepayment?") don't need this customer's
+        # history, so they are asked context-free and shared via the response cache
+        generic = self._is_generic_question(user_message)
+        
         messages = [{"role": "system", "content": system_prompt}]
-        messages.extend(self.conversation_history[-4:])
+        if not generic:
+            messages.extend(self.conversation_history.recent(POST_QA_CONTEXT_TOKENS))
         messages.append({"role": "user", "content": user_message})
         
         try:
-            response = self.client.chat.completions.create(
-                model="openai/gpt-oss-120b", 
-                messages=messages,
-                max_tokens=200
+            ans = self.llm.complete(
+                "post_completion_qa",
+                messages,
+                stage=self.state.stage.value,
+                cache=generic,
+                max_tokens=200,
+                timeout=20,
             )
-            ans = response.choices[0].message.content.strip()
             self.conversation_history.append({"role": "assistant", "content": ans})
             return ans
         except:
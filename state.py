@@ -1,43 +1,96 @@
-from typing import Dict, Any, List
+import json
+import marshal
+import struct
+from typing import Dict, Any, Optional
 from enum import Enum
 
-class ConversationStage(Enum):
+class ConversationStage(str, Enum):
+    """Workflow stages. A str enum, so stages compare equal to (and serialize as) their values."""
     INITIAL = "initial"
+    NEW_CUSTOMER_ONBOARDING = "new_customer_onboarding"
     NEEDS_ASSESSMENT = "needs_assessment"
     VERIFICATION = "verification"
     CREDIT_CHECK = "credit_check"
     UNDERWRITING = "underwriting"
     DOCUMENT_UPLOAD = "document_upload"
+    SECURED_LOAN = "secured_loan"
     APPROVAL = "approval"
     REJECTION = "rejection"
     COMPLETED = "completed"
 
+
+_STAGES = list(ConversationStage)
+_STAGE_INDEX = {stage: i for i, stage in enumerate(_STAGES)}
+
+# Binary layout: header (format version, stage index, boolean flags as a
+# bitfield, manual_data_step, credit_score or -1) followed by the remaining
+# fields as one marshal'd tuple
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<BBBBi")
+_FLAG_FIELDS = (
+    "awaiting_profile_permission",
+    "awaiting_secured_loan_decision",
+    "awaiting_detail_correction",
+    "awaiting_secured_loan_application",
+    "awaiting_manual_data_entry",
+    "verification_status",
+    "documents_uploaded",
+    "waiting_for_manual_upload",
+)
+_OBJECT_FIELDS = (
+    "customer_data",
+    "temp_customer_data",
+    "secured_loan_offer",
+    "loan_request",
+    "underwriting_result",
+    "final_decision",
+    "user_personality",
+    "uploaded_file",
+)
+
+
+def _plain(value: Any) -> Any:
+    # numpy scalars/arrays from the scoring code
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
 class ConversationState:
-    """Manages conversation state across the multi-agent workflow"""
-    
+    """
+    Orchestrator state for one conversation (MasterAgent.state).
+    Slotted, so a session carries no per-instance __dict__, and serializable
+    to a compact binary form with to_bytes() / from_bytes().
+    """
+
+    __slots__ = ("stage", "manual_data_step", "credit_score") + _FLAG_FIELDS + _OBJECT_FIELDS
+
     def __init__(self):
         self.stage = ConversationStage.INITIAL
-        self.customer_data: Dict[str, Any] = {}
+        self.customer_data: Optional[Dict[str, Any]] = None
+        self.temp_customer_data: Optional[Dict[str, Any]] = None
+        self.awaiting_profile_permission = False
+        self.awaiting_secured_loan_decision = False
+        self.awaiting_detail_correction = False
+        self.awaiting_secured_loan_application = False
+        self.awaiting_manual_data_entry = False
+        self.manual_data_step = 0
+        self.secured_loan_offer: Optional[Dict[str, Any]] = None
         self.loan_request: Dict[str, Any] = {}
         self.verification_status = False
-        self.credit_score: int = 0
-        self.underwriting_result: Dict[str, Any] = {}
+        self.credit_score: Optional[int] = None
+        self.underwriting_result: Optional[Dict[str, Any]] = None
         self.documents_uploaded = False
-        self.final_decision: str = None
-        self.conversation_history: List[Dict[str, str]] = []
-    
+        self.uploaded_file: Optional[str] = None
+        self.final_decision: Optional[str] = None
+        self.waiting_for_manual_upload = False
+        self.user_personality = "friendly"
+
     def transition_to(self, new_stage: ConversationStage):
         """Transition to new conversation stage"""
         print(f"[STATE] Transitioning from {self.stage.value} to {new_stage.value}")
         self.stage = new_stage
-    
-    def add_message(self, role: str, content: str):
-        """Add message to conversation history"""
-        self.conversation_history.append({
-            "role": role,
-            "content": content
-        })
-    
+
     def get_summary(self) -> Dict[str, Any]:
         """Get current state summary"""
         return {
@@ -49,3 +102,54 @@ class ConversationState:
             "documents_uploaded": self.documents_uploaded,
             "final_decision": self.final_decision
         }
+
+    # --- serialization ---
+    def to_dict(self) -> Dict[str, Any]:
+        data = {field: getattr(self, field) for field in self.__slots__}
+        data["stage"] = self.stage.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationState":
+        state = cls()
+        for field in cls.__slots__:
+            if field in data:
+                setattr(state, field, data[field])
+        state.stage = ConversationStage(state.stage)
+        return state
+
+    def to_bytes(self) -> bytes:
+        flags = 0
+        for bit, field in enumerate(_FLAG_FIELDS):
+            if getattr(self, field):
+                flags |= 1 << bit
+        header = _HEADER.pack(
+            FORMAT_VERSION,
+            _STAGE_INDEX[self.stage],
+            flags,
+            self.manual_data_step,
+            -1 if self.credit_score is None else int(self.credit_score),
+        )
+        objects = tuple(getattr(self, field) for field in _OBJECT_FIELDS)
+        try:
+            body = marshal.dumps(objects)
+        except ValueError:
+            # Non-builtin values (numpy numbers): convert to plain types first
+            body = marshal.dumps(tuple(json.loads(json.dumps(objects, default=_plain))))
+        return header + body
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "ConversationState":
+        # Only for blobs this application wrote itself: marshal is not safe for untrusted input
+        version, stage, flags, step, score = _HEADER.unpack_from(blob)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported state format {version}")
+        state = cls.__new__(cls)
+        state.stage = _STAGES[stage]
+        state.manual_data_step = step
+        state.credit_score = None if score == -1 else score
+        for bit, field in enumerate(_FLAG_FIELDS):
+            setattr(state, field, bool(flags & (1 << bit)))
+        for field, value in zip(_OBJECT_FIELDS, marshal.loads(blob[_HEADER.size:])):
+            setattr(state, field, value)
+        return state
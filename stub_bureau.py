@@ -0,0 +1,144 @@
+"""
+Local stand-in for the credit bureau API used by utils/credit_bureau.HTTPBureau,
+serving scores from the customer database with configurable latency and
+error rate, for benchmarks and manual testing.
+
+    python stub_bureau.py [--port 8081] [--latency 0.3] [--jitter 0.1] [--error-rate 0.05]
+
+Then set CREDIT_BUREAU_URL=http://localhost:8081 for the app.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from utils.mock_data import get_customer_data
+
+
+class StubBureauServer(ThreadingHTTPServer):
+    """
+    GET /reports/<phone> answers one report (404 if unknown), POST
+    /reports/bulk with {"phones": [...]} answers {"reports": {phone: report
+    or null}}. Every request sleeps latency +/- jitter seconds and fails
+    with a 503 at error_rate. Counts requests for benchmarks.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, report_age_days: int = 0, seed: Optional[int] = None):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.report_date = (date.today() - timedelta(days=report_age_days)).isoformat()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.reports_served = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def report(self, phone: str) -> Optional[Dict[str, Any]]:
+        customer = get_customer_data(phone)
+        if not customer:
+            return None
+        return {
+            "phone": customer["phone"],
+            "score": customer["credit_score"],
+            "bureau": "CIBIL",
+            "max_score": 900,
+            "report_date": self.report_date,
+        }
+
+    def delay_and_roll(self) -> bool:
+        """Sleep for this request's latency; True if it should fail"""
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            fail = self._random.random() < self.error_rate
+        time.sleep(delay)
+        return fail
+
+    def count(self, reports: int):
+        with self._lock:
+            self.reports_served += reports
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StubBureauServer
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients reuse connections
+
+    def do_GET(self):
+        if not self.path.startswith("/reports/"):
+            return self._send(404, {"error": "not found"})
+        if self.server.delay_and_roll():
+            return self._send(503, {"error": "bureau unavailable"})
+        report = self.server.report(self.path[len("/reports/"):])
+        if report is None:
+            return self._send(404, {"error": "no record"})
+        self.server.count(1)
+        self._send(200, report)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        if self.path != "/reports/bulk":
+            return self._send(404, {"error": "not found"})
+        if self.server.delay_and_roll():
+            return self._send(503, {"error": "bureau unavailable"})
+        try:
+            phones = json.loads(body)["phones"]
+        except (ValueError, KeyError):
+            return self._send(400, {"error": "expected {\"phones\": [...]}"})
+        reports = {phone: self.server.report(phone) for phone in phones}
+        self.server.count(len(phones))
+        self._send(200, {"reports": reports})
+
+    def _send(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Quiet: benchmarks make thousands of requests
+        pass
+
+
+def start_stub_bureau(**options) -> StubBureauServer:
+    """Start a stub bureau on a free local port in a background thread; call shutdown() when done"""
+    server = StubBureauServer(**options)
+    threading.Thread(target=server.serve_forever, args=(0.05,), name="stub-bureau", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stub credit bureau")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.1, help="+/- seconds around the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    parser.add_argument("--report-age-days", type=int, default=0)
+    args = parser.parse_args()
+
+    server = StubBureauServer((args.host, args.port), args.latency, args.jitter, args.error_rate, args.report_age_days)
+    print(f"Stub bureau on {server.url} (latency {args.latency}s +/- {args.jitter}s, errors {args.error_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
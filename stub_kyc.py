@@ -0,0 +1,107 @@
+"""
+Local stand-ins for the KYC verification services used by utils/kyc.HTTPCheck:
+POST /verify/<phone|address|identity> answers {"verified": bool} using the
+demo rules, after a per-check latency, failing with a 503 at error_rate.
+
+    python stub_kyc.py [--port 8082] [--latency phone=0.3,address=0.8,identity=1.2] [--error-rate 0.05]
+
+Then set KYC_SERVICE_URL=http://localhost:8082 for the app.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from utils.kyc import CHECK_SPECS
+
+RULES = {name: rule for name, _, rule in CHECK_SPECS}
+
+
+class StubKYCServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), latency: Optional[Dict[str, float]] = None,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        super().__init__(address, _Handler)
+        self.latency = dict(latency or {})
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests: Dict[str, int] = dict.fromkeys(RULES, 0)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def delay_and_roll(self, check: str) -> bool:
+        """Sleep for this check's latency; True if the request should fail"""
+        with self._lock:
+            self.requests[check] += 1
+            fail = self._random.random() < self.error_rate
+        time.sleep(self.latency.get(check, 0.0))
+        return fail
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StubKYCServer
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        check = self.path[len("/verify/"):] if self.path.startswith("/verify/") else ""
+        if check not in RULES:
+            return self._send(404, {"error": "unknown check"})
+        if self.server.delay_and_roll(check):
+            return self._send(503, {"error": f"{check} service unavailable"})
+        try:
+            subject = json.loads(body)
+        except ValueError:
+            return self._send(400, {"error": "expected a JSON object"})
+        self._send(200, {"verified": RULES[check](subject)})
+
+    def _send(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_kyc(**options) -> StubKYCServer:
+    """Start the stub services on a free local port in a background thread; call shutdown() when done"""
+    server = StubKYCServer(**options)
+    threading.Thread(target=server.serve_forever, args=(0.05,), name="stub-kyc", daemon=True).start()
+    return server
+
+
+def _latencies(text: str) -> Dict[str, float]:
+    return {name: float(value) for name, value in (item.split("=") for item in text.split(","))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stub KYC services")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--latency", type=_latencies, default=_latencies("phone=0.3,address=0.8,identity=1.2"),
+                        help="seconds per check, e.g. phone=0.3,address=0.8,identity=1.2")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    args = parser.parse_args()
+
+    server = StubKYCServer((args.host, args.port), args.latency, args.error_rate)
+    print(f"Stub KYC services on {server.url} (latency {args.latency}, errors {args.error_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Test script for the bounded conversation history in utils/conversation_context.py
+"""
+from utils.conversation_context import ConversationContext, estimate_tokens, SUMMARY_HEADER
+
+
+def _turns(n):
+    for i in range(n):
+        yield {"role": "user", "content": f"user message {i}"}
+        yield {"role": "assistant", "content": f"assistant reply {i}"}
+
+
+def test_ring_buffer_folds_old_turns_into_summary():
+    history = ConversationContext(_turns(10), max_messages=6)
+
+    assert len(history) == 6
+    assert history.total_appended == 20
+    assert history[0]["content"] == "user message 7"
+    assert history[-1]["content"] == "assistant reply 9"
+    assert history.summary.splitlines()[0] == "Customer: user message 0"
+    assert "Agent: assistant reply 6" in history.summary
+
+
+def test_summary_is_capped():
+    history = ConversationContext(max_messages=2, summary_max_tokens=50)
+    for message in _turns(200):
+        history.append(message)
+
+    assert estimate_tokens(history.summary) <= 50 + len(history.summary.splitlines())
+    assert "user message 197" in history.summary
+    assert "user message 0" not in history.summary
+
+
+def test_recent_fits_token_budget():
+    history = ConversationContext(max_messages=8)
+    history.extend(_turns(10))
+
+    context = history.recent(max_tokens=240)
+    assert context[0]["role"] == "system" and context[0]["content"].startswith(SUMMARY_HEADER)
+    assert sum(estimate_tokens(m["content"]) for m in context) <= 240
+    assert context[-1]["content"] == "assistant reply 9"
+
+    # The newest message is always sent, even when it alone exceeds the budget
+    history.append({"role": "user", "content": "x" * 1000})
+    assert history.recent(max_tokens=10)[-1]["content"] == "x" * 1000
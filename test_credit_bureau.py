@@ -0,0 +1,110 @@
+"""
+Test script for the cached credit bureau client against the local stub bureau
+"""
+import threading
+import time
+
+import httpx
+import pytest
+
+from agents.credit import CreditAgent
+from stub_bureau import start_stub_bureau
+from utils.credit_bureau import CachedBureau, HTTPBureau, BureauError, REPORT_VALIDITY_DAYS
+
+RIYA, KABIR, UNKNOWN = "7303201137", "8667765432", "9999999999"
+
+
+@pytest.fixture
+def stub():
+    server = start_stub_bureau(seed=1)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_repeat_pulls_are_served_from_cache(stub):
+    bureau = CachedBureau(HTTPBureau(stub.url))
+    first = bureau.pull(RIYA)
+    assert first["score"] == 782
+    first["score"] = 0  # callers get copies
+    assert bureau.pull(RIYA)["score"] == 782
+    assert stub.requests == 1
+    assert bureau.stats()["hits"] == 1
+
+
+def test_concurrent_pulls_for_one_phone_share_a_request(stub):
+    stub.latency = 0.1
+    bureau = CachedBureau(HTTPBureau(stub.url))
+    scores = []
+    threads = [threading.Thread(target=lambda: scores.append(bureau.pull(KABIR)["score"])) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert scores == [698] * 8
+    assert stub.requests == 1
+    assert bureau.stats()["coalesced"] + bureau.stats()["hits"] == 7
+
+
+def test_bulk_pull_fetches_only_uncached_phones(stub):
+    bureau = CachedBureau(HTTPBureau(stub.url))
+    bureau.pull(RIYA)
+    reports = bureau.pull_many([RIYA, KABIR, UNKNOWN, KABIR])
+    assert reports[RIYA]["score"] == 782 and reports[KABIR]["score"] == 698
+    assert reports[UNKNOWN] is None
+    # One single pull, one bulk request for the other two
+    assert stub.requests == 2
+    assert stub.reports_served == 3
+
+
+def test_cache_expires_with_report_date(stub):
+    now = [time.time()]
+    bureau = CachedBureau(HTTPBureau(stub.url), clock=lambda: now[0])
+    bureau.pull(RIYA)
+    now[0] += (REPORT_VALIDITY_DAYS - 1) * 86400
+    bureau.pull(RIYA)
+    assert stub.requests == 1
+    now[0] += 2 * 86400
+    bureau.pull(RIYA)
+    assert stub.requests == 2
+
+    # A report already past its validity is never cached
+    stale = start_stub_bureau(report_age_days=REPORT_VALIDITY_DAYS + 1)
+    try:
+        bureau = CachedBureau(HTTPBureau(stale.url))
+        bureau.pull(RIYA)
+        bureau.pull(RIYA)
+        assert stale.requests == 2
+    finally:
+        stale.shutdown()
+        stale.server_close()
+
+
+def test_bureau_errors_are_never_a_passing_score(stub):
+    stub.error_rate = 1.0
+    bureau = CachedBureau(HTTPBureau(stub.url))
+    with pytest.raises(BureauError):
+        bureau.pull(RIYA)
+    assert bureau.stats()["errors"] == 1
+
+    agent = CreditAgent(bureau)
+    with pytest.raises(BureauError):
+        agent.get_credit_score("+91 73032 01137")
+    with pytest.raises(BureauError):
+        agent.get_credit_scores([RIYA, KABIR])
+    stub.error_rate = 0.0
+    assert agent.get_credit_score("+91 73032 01137")["score"] == 782
+    # No record is reported as no score, not a default
+    assert agent.get_credit_score(UNKNOWN)["score"] is None
+    assert agent.get_credit_scores(["+91 73032 01137", UNKNOWN]) == [782, None]
+
+
+def test_malformed_reports_are_bureau_errors():
+    bureau = HTTPBureau("http://bureau.test")
+    for body in (b"<html>busy</html>", b"[]", b'{"phone": "7303201137"}'):
+        bureau.client = httpx.Client(
+            base_url=bureau.base_url,
+            transport=httpx.MockTransport(lambda request, body=body: httpx.Response(200, content=body)),
+        )
+        with pytest.raises(BureauError):
+            bureau.pull(RIYA)
@@ -0,0 +1,44 @@
+"""
+Test script for the confidence gate in utils/faq_index.FAQIndex: an answer
+is served locally only above MIN_SCORE, MIN_COVERAGE and MIN_MARGIN; every
+other question falls through to the LLM (answer() returns None)
+"""
+from utils.faq_index import FAQIndex, MIN_COVERAGE, MIN_MARGIN, MIN_SCORE
+
+ENTRIES = [
+    {"id": "prepayment", "questions": ["Can I prepay my loan early?"],
+     "keywords": ["prepay", "prepayment"], "answer": "prepayment answer"},
+    {"id": "late_fee", "questions": ["What is the penalty for a late monthly EMI payment?"],
+     "keywords": ["late", "overdue"], "answer": "late fee answer"},
+    {"id": "bounce", "questions": ["What is the penalty for a bounced monthly EMI payment?"],
+     "keywords": ["bounce", "mandate"], "answer": "bounce answer"},
+    {"id": "customer_care", "questions": ["How do I contact customer care?"],
+     "keywords": ["contact", "helpline"], "answer": "customer care answer"},
+]
+
+
+def test_confident_match_is_answered_locally():
+    index = FAQIndex(ENTRIES)
+    assert index.answer("Can I prepay my loan?") == "prepayment answer"
+    assert index.answer("penalty for a late monthly EMI payment") == "late fee answer"
+    assert index.stats()["hits"] == 2
+
+
+def test_low_coverage_question_falls_through():
+    index = FAQIndex(ENTRIES)
+    question = "Can I prepay my loan with my yearly bonus from work"
+    best = index.search(question)[0]
+    assert best["entry"]["id"] == "prepayment" and best["score"] >= MIN_SCORE
+    assert best["coverage"] < MIN_COVERAGE
+    assert index.answer(question) is None
+
+
+def test_ambiguous_match_between_two_entries_falls_through():
+    index = FAQIndex(ENTRIES)
+    question = "What is the penalty on a monthly EMI payment?"
+    best, runner_up = index.search(question)
+    assert {best["entry"]["id"], runner_up["entry"]["id"]} == {"late_fee", "bounce"}
+    assert best["score"] >= MIN_SCORE and best["coverage"] >= MIN_COVERAGE
+    assert best["score"] < MIN_MARGIN * runner_up["score"]
+    assert index.answer(question) is None
+    assert index.stats()["llm_fallbacks"] == 1
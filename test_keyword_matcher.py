@@ -0,0 +1,32 @@
+"""
+Test script for the shared intent matcher in utils/keyword_matcher.py,
+against the substring checks it replaced (bench_keyword_matcher.legacy_classify)
+"""
+from bench_keyword_matcher import legacy_classify, matcher_classify
+from utils.keyword_matcher import INTENT_MATCHER
+
+# Replies to "Is this correct? (Yes/No)" that the substring checks understood
+OLD_YES = ["yes", "Yes, that is correct", "yeah", "yea", "yup", "yess", "okk", "ok", "okay", "Sure",
+           "proceed", "I accept", "yes please proceed"]
+OLD_NO = ["no", "No", "nope", "nah", "cancel it", "stop"]
+
+
+def test_old_yes_and_no_phrasings_still_classify():
+    for message in OLD_YES:
+        assert legacy_classify(message)[0], message
+        assert matcher_classify(message)[0], message
+    for message in OLD_NO:
+        assert legacy_classify(message)[1], message
+        assert matcher_classify(message)[:2] == (False, True), message
+
+
+def test_more_affirmative_forms():
+    for message in ["alright", "go ahead", "Go ahead please", "confirm", "Confirmed"]:
+        assert "affirmative" in INTENT_MATCHER.classify(message), message
+
+
+def test_single_letters_only_match_as_whole_words():
+    # The substring checks read any word containing "y" or "n" as a reply
+    assert legacy_classify("Sunday")[:2] == (True, True)
+    assert matcher_classify("Sunday")[:2] == (False, False)
+    assert matcher_classify("y")[0] and matcher_classify("n")[1]
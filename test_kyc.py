@@ -0,0 +1,96 @@
+"""
+Test script for the concurrent KYC verification in utils/kyc.py
+"""
+import time
+
+from agents.verification import VerificationAgent
+from stub_kyc import start_stub_kyc
+from utils.kyc import KYCOrchestrator, KYCStats, LocalCheck, default_checks, PASSED, TIMED_OUT
+
+CUSTOMER = {
+    "name": "Riya Sharma",
+    "phone": "7303201137",
+    "address": "Block A, Sector 15, Rohini, Delhi - 110085",
+    "email": "riya.sharma@email.com",
+}
+
+
+def slow(seconds, result=True, calls=None):
+    def rule(subject):
+        if calls is not None:
+            calls.append(subject)
+        time.sleep(seconds)
+        return result
+    return rule
+
+
+def test_checks_run_concurrently():
+    kyc = KYCOrchestrator([
+        LocalCheck("phone", ("phone",), slow(0.2)),
+        LocalCheck("address", ("address",), slow(0.2)),
+        LocalCheck("identity", ("name", "email"), slow(0.2)),
+    ], stats=KYCStats())
+    start = time.monotonic()
+    result = kyc.verify(CUSTOMER)
+    assert result["verified"] and result["checks"]["overall_verified"]
+    assert time.monotonic() - start < 0.35
+
+
+def test_missed_deadline_is_pending_and_only_it_reruns():
+    calls = []
+    kyc = KYCOrchestrator([
+        LocalCheck("phone", ("phone",), slow(0.0, calls=calls)),
+        LocalCheck("address", ("address",), slow(0.3), deadline=0.1),
+    ], stats=KYCStats())
+    cache = {}
+    start = time.monotonic()
+    result = kyc.verify(CUSTOMER, cache)
+    assert time.monotonic() - start < 0.25
+    assert not result["verified"]
+    assert result["pending"] == ["address"] and result["failed"] == []
+    assert result["outcomes"] == {"phone": PASSED, "address": TIMED_OUT}
+
+    kyc.checks[1].deadline = 1.0
+    assert kyc.verify(CUSTOMER, cache)["verified"]
+    # The phone check passed the first time and came from the cache
+    assert calls == [{"phone": CUSTOMER["phone"]}]
+
+
+def test_changed_field_reruns_only_its_check():
+    calls = {"phone": 0, "address": 0}
+
+    def counted(name, result):
+        def rule(subject):
+            calls[name] += 1
+            return result(subject)
+        return rule
+
+    kyc = KYCOrchestrator([
+        LocalCheck("phone", ("phone",), counted("phone", lambda s: True)),
+        LocalCheck("address", ("address",), counted("address", lambda s: len(s["address"]) > 10)),
+    ], stats=KYCStats())
+    cache = {}
+    result = kyc.verify(dict(CUSTOMER, address="Delhi"), cache)
+    assert result["failed"] == ["address"]
+    assert kyc.verify(CUSTOMER, cache)["verified"]
+    assert calls == {"phone": 1, "address": 2}
+
+
+def test_http_checks_against_stub_services():
+    server = start_stub_kyc(latency={"phone": 0.1, "address": 0.2, "identity": 0.3})
+    try:
+        agent = VerificationAgent(KYCOrchestrator(default_checks(server.url), stats=KYCStats()))
+        start = time.monotonic()
+        result = agent.verify_customer(CUSTOMER)
+        assert result["verified"]
+        assert time.monotonic() - start < 0.5
+
+        result = agent.verify_customer(dict(CUSTOMER, email="not-an-email"))
+        assert result["failed"] == ["identity"]
+
+        server.error_rate = 1.0
+        result = agent.verify_customer(CUSTOMER)
+        assert not result["verified"] and sorted(result["pending"]) == ["address", "identity", "phone"]
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,37 @@
+"""
+Test script for the script-first language detector in utils/language_detect.py
+"""
+from utils.language_detect import LanguageDetector
+
+
+def test_indic_scripts_are_detected_without_statistics():
+    detector = LanguageDetector()
+    samples = {
+        "मुझे 5 लाख का लोन चाहिए": "hi",
+        "मला 5 लाख कर्ज हवे आहे": "mr",
+        "எனக்கு 5 லட்சம் கடன் வேண்டும்": "ta",
+        "నాకు 5 లక్షల లోన్ కావాలి": "te",
+        "আমার 5 লাখ টাকা ঋণ দরকার": "bn",
+        "મારે 5 લાખની લોન જોઈએ છે": "gu",
+    }
+    for text, language in samples.items():
+        assert detector.detect(text) == language, text
+    assert detector.stats()["script_hits"] == len(samples)
+    assert detector.stats()["statistical_calls"] == 0
+
+
+def test_short_latin_text_is_not_guessed():
+    detector = LanguageDetector()
+    for text in ["7303201137", "yes", "ok", "5 lakh", ""]:
+        assert detector.detect(text) is None, text
+
+
+def test_mixed_text_follows_the_dominant_script():
+    detector = LanguageDetector()
+    assert detector.detect("मेरा नंबर 9876543210 है, loan") == "hi"
+
+
+def test_long_latin_text_uses_the_statistical_detector():
+    detector = LanguageDetector()
+    assert detector.detect("I would like a personal loan for my daughter's wedding next year") == "en"
+    assert detector.stats()["statistical_calls"] == 1
@@ -0,0 +1,128 @@
+"""
+Test script for the LLM response cache in utils/llm_cache.py: single-flight
+dedup, TTL expiry, LRU eviction and the JSON persistence layer
+"""
+import threading
+import time
+
+import pytest
+
+from utils.llm_cache import LLMResponseCache
+
+TTL = 60.0
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeCompletion:
+    """Stands in for the LLM call; counts calls and can hold them open"""
+
+    def __init__(self, gate: threading.Event = None):
+        self.calls = 0
+        self.gate = gate
+        self.started = threading.Event()
+
+    def __call__(self) -> str:
+        self.calls += 1
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        return f"answer {self.calls}"
+
+
+def test_concurrent_identical_calls_share_one_completion():
+    cache = LLMResponseCache(ttl_seconds=TTL)
+    gate = threading.Event()
+    complete = FakeCompletion(gate)
+    results = []
+
+    def ask():
+        results.append(cache.get_or_compute("key", complete))
+
+    leader = threading.Thread(target=ask)
+    leader.start()
+    assert complete.started.wait(5)
+    followers = [threading.Thread(target=ask) for _ in range(4)]
+    for t in followers:
+        t.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    gate.set()
+    for t in [leader] + followers:
+        t.join()
+
+    assert complete.calls == 1
+    assert results == ["answer 1"] * 5
+    assert cache.stats()["misses"] == 1 and cache.stats()["coalesced"] == 4
+    # Later callers are plain hits
+    assert cache.get_or_compute("key", complete) == "answer 1"
+    assert complete.calls == 1 and cache.stats()["hits"] == 1
+
+
+def test_failed_completion_is_not_cached():
+    cache = LLMResponseCache(ttl_seconds=TTL)
+
+    def fail():
+        raise TimeoutError("LLM timed out")
+
+    with pytest.raises(TimeoutError):
+        cache.get_or_compute("key", fail)
+    complete = FakeCompletion()
+    assert cache.get_or_compute("key", complete) == "answer 1"
+    assert complete.calls == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = Clock()
+    cache = LLMResponseCache(ttl_seconds=TTL, clock=clock)
+    complete = FakeCompletion()
+    cache.get_or_compute("key", complete)
+
+    clock.now += TTL - 1
+    assert cache.get_or_compute("key", complete) == "answer 1"
+    clock.now += 2
+    assert cache.get("key") is None
+    assert cache.get_or_compute("key", complete) == "answer 2"
+    assert complete.calls == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LLMResponseCache(max_entries=2, ttl_seconds=TTL)
+    complete = FakeCompletion()
+    cache.get_or_compute("a", complete)
+    cache.get_or_compute("b", complete)
+    cache.get_or_compute("a", complete)  # "b" is now the oldest
+    cache.get_or_compute("c", complete)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "answer 1" and cache.get("c") == "answer 3"
+    assert cache.stats()["evictions"] == 1 and cache.stats()["entries"] == 2
+
+
+def test_persisted_entries_are_reloaded_until_they_expire(tmp_path):
+    path = str(tmp_path / "llm_cache.json")
+    clock = Clock()
+    cache = LLMResponseCache(ttl_seconds=TTL, path=path, clock=clock)
+    complete = FakeCompletion()
+    cache.get_or_compute("old", complete)
+    clock.now += TTL / 2
+    cache.get_or_compute("new", complete)
+    cache.persist()
+
+    reloaded = LLMResponseCache(ttl_seconds=TTL, path=path, clock=clock)
+    assert reloaded.get_or_compute("old", complete) == "answer 1"
+    assert reloaded.get_or_compute("new", complete) == "answer 2"
+    assert complete.calls == 2
+
+    # Entries past their expiry are not loaded
+    clock.now += TTL / 2 + 1
+    assert LLMResponseCache(ttl_seconds=TTL, path=path, clock=clock).stats()["entries"] == 1
+    # A reloaded cache keeps at most max_entries
+    assert LLMResponseCache(max_entries=1, ttl_seconds=TTL, path=path, clock=Clock()).stats()["entries"] == 1
@@ -0,0 +1,87 @@
+"""
+Test script for the pooled LLM gateway in utils/llm_gateway.py, with the
+Groq API replaced by an httpx.MockTransport
+"""
+import json
+
+import httpx
+import pytest
+from groq import BadRequestError, RateLimitError
+
+from utils.llm_gateway import LLMGateway, MAX_RETRIES
+
+MESSAGES = [{"role": "user", "content": "What is prepayment?"}]
+
+
+def completion(text):
+    return {
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "test-model",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 12, "completion_tokens": 5, "total_tokens": 17},
+    }
+
+
+def chunk(text):
+    return {
+        "id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 0, "model": "test-model",
+        "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}],
+    }
+
+
+class FakeGroq:
+    """Answers with the queued statuses first (retry-after 1 ms), then succeeds"""
+
+    def __init__(self, statuses=(), stream_chunks=None):
+        self.statuses = list(statuses)
+        self.stream_chunks = stream_chunks
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.statuses:
+            status = self.statuses.pop(0)
+            return httpx.Response(status, headers={"retry-after-ms": "1"}, json={"error": {"message": "busy"}})
+        if self.stream_chunks is not None:
+            body = "".join(f"data: {json.dumps(chunk(text))}\n\n" for text in self.stream_chunks) + "data: [DONE]\n\n"
+            return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body.encode("utf-8"))
+        return httpx.Response(200, json=completion("  Paying early.  "))
+
+
+def gateway(fake):
+    return LLMGateway("test-key", transport=httpx.MockTransport(fake))
+
+
+def test_completion_retries_rate_limits_and_server_errors():
+    fake = FakeGroq(statuses=[429, 503])
+    text, usage = gateway(fake).complete_with_usage(MESSAGES, model="test-model", max_tokens=50, timeout=7)
+
+    assert text == "Paying early."
+    assert usage == {"prompt_tokens": 12, "completion_tokens": 5}
+    assert len(fake.requests) == 3
+    body = json.loads(fake.requests[-1].content)
+    assert body["model"] == "test-model" and body["max_tokens"] == 50
+    # The per-call timeout reaches the HTTP request
+    assert fake.requests[-1].extensions["timeout"]["read"] == 7
+
+
+def test_retries_are_bounded():
+    fake = FakeGroq(statuses=[429] * (MAX_RETRIES + 2))
+    with pytest.raises(RateLimitError):
+        gateway(fake).complete(MESSAGES)
+    assert len(fake.requests) == MAX_RETRIES + 1
+
+
+def test_client_errors_are_not_retried():
+    fake = FakeGroq(statuses=[400])
+    with pytest.raises(BadRequestError):
+        gateway(fake).complete(MESSAGES)
+    assert len(fake.requests) == 1
+
+
+def test_streamed_chunks_pass_through_in_order():
+    fake = FakeGroq(statuses=[500], stream_chunks=["Paying ", "", "part of the loan ", "early."])
+    deltas = list(gateway(fake).stream(MESSAGES, model="test-model"))
+    # Empty deltas are skipped; the failed first attempt is retried
+    assert deltas == ["Paying ", "part of the loan ", "early."]
+    assert len(fake.requests) == 2
+    assert json.loads(fake.requests[-1].content)["stream"] is True
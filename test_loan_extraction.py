@@ -0,0 +1,63 @@
+"""
+Test script to verify the incremental loan-detail tracker matches the
+full-history extraction in SalesAgent._extract_loan_details
+"""
+import random
+from agents.sales import SalesAgent, LoanDetailsTracker
+
+SAMPLE_MESSAGES = [
+    "7303201137", "yes", "I need 5 lakh", "for my wedding", "3 years", "actually 24 months",
+    "make it 2.5 lakhs", "medical emergency", "I want to pay", "off my credit card dues",
+    "i want to repay", "off", "hello", "business expansion please", "50000", "1 crore for a car",
+    "ok", "what is the interest rate?", "change tenure to 5 yrs", "80k for travel",
+]
+
+
+def _expected(agent, history, pending):
+    return agent._extract_loan_details(history + [{"role": "user", "content": pending}]) or {}
+
+
+def test_tracker_matches_full_scan():
+    """Random conversations: tracker result equals a full rescan on every turn"""
+    agent = SalesAgent("test-key")
+    rng = random.Random(7)
+
+    for _ in range(300):
+        tracker = LoanDetailsTracker(agent)
+        history = []
+        for _ in range(rng.randint(1, 12)):
+            pending = rng.choice(SAMPLE_MESSAGES)
+            tracker.sync(history)
+            assert tracker.details_with(pending) == _expected(agent, history, pending)
+
+            history.append({"role": "user", "content": pending})
+            history.append({"role": "assistant", "content": "Noted."})
+
+
+def test_tracker_resets_when_history_is_replaced():
+    """A new history list (e.g. after __INIT__) starts a fresh extraction"""
+    agent = SalesAgent("test-key")
+    tracker = LoanDetailsTracker(agent)
+
+    tracker.sync([{"role": "user", "content": "5 lakh for wedding over 3 years"}])
+    assert tracker.details_with() == {"amount": 500000, "tenure": 36, "purpose": "wedding"}
+
+    tracker.sync([{"role": "assistant", "content": "Hello"}])
+    assert tracker.details_with("2 years") == {"tenure": 24}
+
+
+def test_tracker_keeps_details_evicted_from_bounded_history():
+    """Details from turns folded out of a ConversationContext are not lost"""
+    from utils.conversation_context import ConversationContext
+
+    agent = SalesAgent("test-key")
+    tracker = LoanDetailsTracker(agent)
+    history = ConversationContext(max_messages=4)
+    for text in ["I need 5 lakh", "for my wedding", "hello", "ok", "3 years"]:
+        history.append({"role": "user", "content": text})
+        history.append({"role": "assistant", "content": "Noted."})
+        tracker.sync(history)
+
+    assert len(history) == 4
+    assert tracker.details_with() == {"amount": 500000, "tenure": 36, "purpose": "wedding"}
+
@@ -0,0 +1,122 @@
+"""
+Test script for MasterAgent stage handling that depends on outside
+services (credit bureau, KYC), run against the local stubs
+"""
+import json
+
+import pytest
+
+# main.py loads the risk model, which needs the ML stack
+for _module in ("joblib", "pandas", "shap"):
+    pytest.importorskip(_module)
+
+from agents.credit import CreditAgent  # noqa: E402
+from agents.verification import VerificationAgent  # noqa: E402
+from main import MasterAgent  # noqa: E402
+from state import ConversationStage  # noqa: E402
+from stub_bureau import start_stub_bureau  # noqa: E402
+from utils.credit_bureau import CachedBureau, HTTPBureau  # noqa: E402
+from utils.kyc import KYCOrchestrator, KYCStats, LocalCheck, phone_rule, address_rule  # noqa: E402
+from utils.message_catalog import CATALOG  # noqa: E402
+from utils.mock_data import CUSTOMER_DATABASE, OFFER_BOOK, get_customer_data  # noqa: E402
+
+RIYA, UNKNOWN, NEW = "7303201137", "9999999999", "9000000042"
+
+
+@pytest.fixture
+def stub():
+    server = start_stub_bureau(seed=1)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _at_credit_check(stub, customer):
+    agent = MasterAgent("test-key")
+    agent.credit_agent = CreditAgent(CachedBureau(HTTPBureau(stub.url)))
+    agent.state.customer_data = customer
+    # Above the pre-approved limit, so underwriting asks for a salary slip
+    agent.state.loan_request = {"amount": 800000, "tenure": 36, "purpose": "wedding", "interest_rate": 10.5, "emi": 26003}
+    agent.state.stage = ConversationStage.CREDIT_CHECK
+    return agent
+
+
+def test_bureau_outage_asks_to_retry_and_stays_in_credit_check(stub):
+    stub.error_rate = 1.0
+    agent = _at_credit_check(stub, get_customer_data(RIYA))
+
+    reply = agent.process_message("ok")
+    assert str(reply) == str(CATALOG.render("credit_check_unavailable"))
+    assert agent.state.stage == ConversationStage.CREDIT_CHECK
+    assert agent.state.credit_score is None
+    assert agent.conversation_history[-1]["content"] == reply
+
+    # The next message pulls again
+    stub.error_rate = 0.0
+    agent.process_message("ok")
+    assert agent.state.credit_score == 782
+    assert agent.state.stage == ConversationStage.DOCUMENT_UPLOAD
+
+
+def test_no_bureau_record_is_rejected(stub):
+    agent = _at_credit_check(stub, dict(get_customer_data(RIYA), phone=UNKNOWN))
+
+    reply = agent.process_message("ok")
+    assert str(reply).startswith(str(CATALOG.render("credit_no_record")))
+    assert agent.state.stage == ConversationStage.REJECTION
+    assert agent.state.credit_score is None
+
+
+def test_failed_phone_check_can_be_corrected(stub):
+    agent = _at_credit_check(stub, dict(get_customer_data(RIYA), phone="73032"))
+    agent.verification_agent = VerificationAgent(KYCOrchestrator([
+        LocalCheck("phone", ("phone",), phone_rule),
+        LocalCheck("address", ("address",), address_rule),
+    ], stats=KYCStats()))
+    agent.state.stage = ConversationStage.VERIFICATION
+
+    for _ in range(2):
+        reply = agent.process_message("yes")
+        assert str(reply) == str(CATALOG.render("kyc_failed"))
+        assert agent.conversation_history[-1]["content"] == reply
+        assert agent.state.stage == ConversationStage.VERIFICATION
+
+    assert str(agent.process_message("+91 73032 01137")).startswith(str(CATALOG.render("details_updated")))
+    assert agent.state.customer_data["phone"] == RIYA
+    agent.process_message("yes")
+    assert agent.state.verification_status
+    assert agent.state.credit_score == 782
+
+
+def test_kyc_outcomes_survive_a_snapshot(stub):
+    agent = _at_credit_check(stub, get_customer_data(RIYA))
+    agent.state.stage = ConversationStage.VERIFICATION
+    agent.process_message("yes")
+    assert agent.kyc_results
+
+    restored = MasterAgent("test-key").restore(json.loads(json.dumps(agent.snapshot())))
+    assert restored.kyc_results == agent.kyc_results
+
+
+@pytest.fixture
+def new_customer():
+    yield NEW
+    CUSTOMER_DATABASE.pop(NEW, None)
+    OFFER_BOOK.remove(NEW)
+
+
+def test_onboarded_customer_gets_an_offer_book_entry(new_customer):
+    agent = MasterAgent("test-key")
+    for message in (new_customer, "Asha Verma", "Pune", "12, FC Road, Pune - 411004",
+                    "asha@email.com", "50000", "Gold jewellery worth 3 lakh"):
+        reply = agent.process_message(message)
+    assert "Secured Loan: Up to Rs. 225,000" in reply
+    assert agent.state.stage == ConversationStage.NEEDS_ASSESSMENT
+
+    # Registered like a database customer; later offers come from the book
+    assert get_customer_data(new_customer) is agent.state.customer_data
+    assert new_customer in OFFER_BOOK
+    builds = OFFER_BOOK.stats()["builds"]
+    assert agent._secured_offer()["max_amount"] == 225000
+    agent._send_rejection_options()
+    assert OFFER_BOOK.stats()["builds"] == builds
@@ -0,0 +1,62 @@
+"""
+Test script for the pre-translated response catalog in utils/message_catalog.py
+"""
+from utils.message_catalog import CATALOG, CATALOG_LANGUAGES, MESSAGES
+
+
+def _no_translation(texts, persist=()):
+    raise AssertionError(f"unexpected runtime translation: {texts!r}")
+
+
+def test_every_language_is_fully_translated():
+    for language in CATALOG_LANGUAGES:
+        assert CATALOG.coverage()[language] == 1.0, language
+
+
+def test_rendered_text_matches_english_template():
+    text = CATALOG.render("credit_score_ok", score=742)
+    assert text == "Your credit score of 742 is strong. Evaluating eligibility..."
+
+
+def test_templates_are_localized_without_translation():
+    reply = CATALOG.render("checking_credit") + "\n\n" + CATALOG.render("credit_score_ok", score=742)
+    localized = CATALOG.localize(reply, "hi", _no_translation)
+    assert "742" in localized and "क्रेडिट" in localized
+    assert "\n\n" in localized
+
+
+def test_free_text_runs_are_translated_in_one_call():
+    calls = []
+
+    def fake_translate(texts, persist=()):
+        calls.append(texts)
+        return [f"<{text}>" for text in texts]
+
+    reply = CATALOG.render("profile_welcome", name="Riya") + "Risk Insight: Low risk\n\n" + CATALOG.render("pre_approved_limit_question", limit=200000) + "\nCall us anytime."
+    localized = CATALOG.localize(reply, "ta", fake_translate)
+
+    assert calls == [["Risk Insight: Low risk", "Call us anytime."]]
+    assert "<Risk Insight: Low risk>\n\n" in localized
+    assert localized.endswith("\n<Call us anytime.>")
+    assert "Riya" in localized and "200,000" in localized
+
+
+def test_english_is_returned_unchanged():
+    reply = CATALOG.render("ask_city")
+    assert CATALOG.localize(reply, "en", _no_translation) == MESSAGES["ask_city"]
+
+
+def test_only_parameter_free_catalog_text_may_be_persisted():
+    persisted = []
+
+    def fake_translate(texts, persist=()):
+        persisted.extend(persist)
+        return texts
+
+    # Kannada has no pre-translated templates, so every part is translated at runtime
+    reply = CATALOG.render("ask_city") + "\n" + CATALOG.render("profile_welcome", name="Riya")
+    CATALOG.localize(reply, "kn", fake_translate)
+    assert persisted == []
+
+    CATALOG.localize(CATALOG.render("checking_credit") + "\n\n" + CATALOG.render("ask_city"), "kn", fake_translate)
+    assert persisted == [MESSAGES["checking_credit"] + "\n\n" + MESSAGES["ask_city"]]
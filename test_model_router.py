@@ -0,0 +1,114 @@
+"""
+Test script for the model router in utils/model_router.py: which tier each
+task is routed to, and the per-route latency, token and cost stats
+"""
+import pytest
+
+import utils.model_router as model_router
+from utils.model_router import DEFAULT_POLICY, ModelRouter, get_routing_stats
+
+SMALL = DEFAULT_POLICY["tiers"]["small"]["model"]
+LARGE = DEFAULT_POLICY["tiers"]["large"]["model"]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeGateway:
+    """Answers instantly, advancing the fake clock by each call's latency"""
+
+    def __init__(self, clock, latencies_ms=(), fail=False):
+        self.clock = clock
+        self.latencies_ms = list(latencies_ms)
+        self.fail = fail
+        self.models = []
+
+    def _advance(self, model):
+        self.models.append(model)
+        self.clock.now += (self.latencies_ms.pop(0) if self.latencies_ms else 0) / 1000
+
+    def complete_with_usage(self, messages, model, **kwargs):
+        self._advance(model)
+        if self.fail:
+            raise TimeoutError("LLM timed out")
+        return "ok", {"prompt_tokens": 1000, "completion_tokens": 500}
+
+    def stream(self, messages, model, **kwargs):
+        self._advance(model)
+        yield from ["Hello ", "there"]
+
+
+def _messages(chars=100):
+    return [{"role": "user", "content": "x" * chars}]
+
+
+def test_routing_table():
+    router = ModelRouter(FakeGateway(FakeClock()), policy=DEFAULT_POLICY)
+    cases = [
+        ("negotiation", 100, "negotiation", "large"),
+        ("negotiation", 20000, "negotiation", "large"),
+        ("translation", 100, "translation", "small"),
+        ("translation", 4001, "translation:default", "large"),
+        ("post_completion_qa", 100, "post_completion_qa", "small"),
+        ("post_completion_qa", 3001, "post_completion_qa:default", "large"),
+        ("summary", 100, "summary:default", "large"),
+    ]
+    for task, chars, name, tier in cases:
+        route = router.route(task, _messages(chars))
+        assert route == {"name": name, "tier": tier, "model": DEFAULT_POLICY["tiers"][tier]["model"]}, task
+
+
+def test_stage_rules_match_only_their_stages():
+    policy = dict(DEFAULT_POLICY, routes=[
+        {"name": "early_qa", "task": "post_completion_qa", "stages": ["initial"], "tier": "small"},
+    ])
+    router = ModelRouter(FakeGateway(FakeClock()), policy=policy)
+    assert router.route("post_completion_qa", _messages(), stage="initial")["tier"] == "small"
+    assert router.route("post_completion_qa", _messages(), stage="completed")["tier"] == "large"
+
+
+def test_stats_count_latency_percentiles_tokens_and_cost():
+    clock = FakeClock()
+    gateway = FakeGateway(clock, latencies_ms=[10 * i for i in range(1, 21)])
+    router = ModelRouter(gateway, policy=DEFAULT_POLICY, clock=clock)
+    for _ in range(20):
+        assert router.complete("translation", _messages()) == "ok"
+
+    stats = router.stats()["translation"]
+    assert gateway.models == [SMALL] * 20
+    assert stats["model"] == SMALL
+    assert stats["calls"] == 20 and stats["errors"] == 0
+    assert stats["p50_latency_ms"] == 110.0 and stats["p95_latency_ms"] == 200.0
+    assert stats["prompt_tokens"] == 20000 and stats["completion_tokens"] == 10000
+    # small tier: $0.075 / $0.30 per 1M input / output tokens
+    assert stats["cost_usd"] == pytest.approx(20 * (1000 * 0.075 + 500 * 0.30) / 1_000_000)
+
+
+def test_errors_cache_hits_and_streams_are_recorded(monkeypatch):
+    clock = FakeClock()
+    router = ModelRouter(FakeGateway(clock, fail=True), policy=DEFAULT_POLICY, clock=clock)
+    with pytest.raises(TimeoutError):
+        router.complete("negotiation", _messages())
+    assert router.stats()["negotiation"]["errors"] == 1
+
+    router.gateway = FakeGateway(clock, latencies_ms=[40, 40])
+    router.complete("post_completion_qa", _messages(), cache=True)
+    router.complete("post_completion_qa", _messages(), cache=True)
+    assert router.gateway.models == [SMALL]
+    qa = router.stats()["post_completion_qa"]
+    assert qa["calls"] == 1 and qa["cache_hits"] == 1
+
+    assert "".join(router.stream("negotiation", _messages(400))) == "Hello there"
+    negotiation = router.stats()["negotiation"]
+    assert negotiation["model"] == LARGE
+    assert negotiation["calls"] == 2 and negotiation["errors"] == 1
+    # Streamed token counts are estimated at four characters per token
+    assert negotiation["prompt_tokens"] == 100 and negotiation["completion_tokens"] == 2
+
+    monkeypatch.setattr(model_router, "_routers", {"test-key": router})
+    assert get_routing_stats() == router.stats()
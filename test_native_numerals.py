@@ -0,0 +1,64 @@
+"""
+Test script for native-language number reading in utils/native_numerals.py
+"""
+from agents.sales import SalesAgent
+from utils.native_numerals import normalize_numerals, structured_english, read_monthly_income
+
+
+def test_native_digits_and_units_reach_the_extractors():
+    agent = SalesAgent("test-key")
+    amounts = {
+        "मुझे ५ लाख का लोन चाहिए": 500000,
+        "मला अडीच लाख कर्ज हवे आहे": 250000,
+        "எனக்கு 5 லட்சம் கடன் வேண்டும்": 500000,
+        "నాకు రెండు లక్షల లోన్ కావాలి": 200000,
+        "আমার ৮০ হাজার টাকা দরকার": 80000,
+        "મારે ૧ કરોડની લોન જોઈએ છે": 10000000,
+    }
+    for text, amount in amounts.items():
+        assert agent._extract_amount(text) == amount, text
+
+    tenures = {
+        "तीन साल": 36,
+        "२४ महीने": 24,
+        "மூன்று ஆண்டுகள்": 36,
+        "18 నెలలు": 18,
+        "দুই বছর": 24,
+        "બે વર્ષ": 24,
+    }
+    for text, tenure in tenures.items():
+        assert agent._extract_tenure(text) == tenure, text
+
+
+def test_number_words_need_a_unit():
+    # "एक" is also the indefinite article; "নয়" is also "not"
+    assert normalize_numerals("एक बात बताइए") == "एक बात बताइए"
+    assert normalize_numerals("এটা নয়") == "এটা নয়"
+    assert normalize_numerals("5 lakh") == "5 lakh"
+
+
+def test_structured_answers_skip_translation():
+    assert structured_english("मुझे ५ लाख चाहिए") == "5 lakh"
+    assert structured_english("मला दोन वर्षांसाठी") == "2 years"
+    assert structured_english("7303201137") == "7303201137"
+    # Anything that carries meaning beyond numbers still needs translating
+    for text in ["मुझे शादी के लिए लोन चाहिए", "haan 5 lakh", "yes", ""]:
+        assert structured_english(text) is None, text
+
+
+def test_income_units_need_a_word_boundary():
+    incomes = {
+        "50000": 50000,
+        "50k": 50000,
+        "1.2 lakh": 120000,
+        "2 lacs": 200000,
+        "५० हजार": 50000,
+        "60000 ctc": 60000,
+        "50000 cash": 50000,
+        "6 lpa": 50000,
+        "12 lakh per annum": 100000,
+        "1 cr": 10000000,
+    }
+    for text, income in incomes.items():
+        assert read_monthly_income(text) == income, text
+    assert read_monthly_income("I'd rather not say") is None
@@ -0,0 +1,70 @@
+"""
+Test script for the precomputed offer book in utils/offer_book.py
+"""
+from utils.offer_book import OfferBook, parse_collateral
+from utils.mock_data import OFFER_BOOK, CUSTOMER_DATABASE, get_offer_data
+
+
+def customer(phone, limit=500000, collateral="Residential Property - 2BHK Apartment (Estimated Value: ₹45,00,000)"):
+    return {"id": "C" + phone[-2:], "phone": phone, "pre_approved_limit": limit, "collateral": collateral}
+
+
+def test_book_covers_database_and_matches_direct_parse():
+    assert len(OFFER_BOOK) == len(CUSTOMER_DATABASE)
+    for phone, record in CUSTOMER_DATABASE.items():
+        offer = OFFER_BOOK.secured_offer(record["collateral"])
+        assert offer.get("collateral") == parse_collateral(record["collateral"])
+        assert get_offer_data(phone)["max_amount"] == record["pre_approved_limit"]
+
+
+def test_secured_offer_is_ltv_capped():
+    offer = OfferBook({"9000000001": customer("9000000001")}).secured_offer(
+        "Residential Property - 2BHK Apartment (Estimated Value: ₹45,00,000)"
+    )
+    assert offer["eligible"]
+    assert offer["collateral"]["type"] == "property"
+    assert offer["max_amount"] == int(4500000 * 0.65)
+    assert offer["interest_rate"] == 9.5
+
+
+def test_only_changed_records_are_rebuilt():
+    records = {p: customer(p) for p in ("9000000001", "9000000002", "9000000003")}
+    book = OfferBook(records)
+    # Three customers pledging the same asset share one parsed offer
+    assert book.stats() == {"customers": 3, "collateral_strings": 1, "builds": 3}
+
+    records["9000000002"] = customer("9000000002", limit=250000, collateral="Gold jewellery worth 3 lakh")
+    del records["9000000003"]
+    book.sync(records)
+    assert book.stats() == {"customers": 2, "collateral_strings": 2, "builds": 4}
+    assert book.pre_approved_offer(records["9000000002"])["max_amount"] == 250000
+    assert book.secured_offer("Gold jewellery worth 3 lakh")["max_amount"] == 225000
+
+
+def test_record_edited_in_place_is_detected_on_lookup():
+    record = customer("9000000001")
+    book = OfferBook({"9000000001": record})
+    record["pre_approved_limit"] = 100000
+    assert book.pre_approved_offer(record)["max_amount"] == 100000
+
+
+def test_callers_get_copies_and_free_text_is_parsed():
+    book = OfferBook({"9000000001": customer("9000000001")})
+    offer = book.secured_offer(customer("9000000001")["collateral"])
+    offer["collateral"]["max_loan"] = 1
+    assert book.secured_offer(customer("9000000001")["collateral"])["collateral"]["max_loan"] == int(4500000 * 0.65)
+    assert book.secured_offer("none") == {"eligible": False, "reason": "No collateral available"}
+    assert book.secured_offer("fixed deposit of 2 lakh")["max_amount"] == 180000
+
+
+def test_customer_lookup_builds_once_and_returns_copies():
+    record = customer("9000000001", collateral="Gold jewellery worth 3 lakh")
+    book = OfferBook({"9000000001": record})
+    offer = book.customer_secured_offer(record)
+    offer["collateral"]["max_loan"] = 1
+    assert book.customer_secured_offer(record)["max_amount"] == 225000
+    assert book.customer_secured_offer(record)["collateral"]["max_loan"] == 225000
+    assert book.stats() == {"customers": 1, "collateral_strings": 1, "builds": 1}
+    # Records that were never registered are not added on lookup
+    assert book.customer_secured_offer(customer("9000000002"))["max_amount"] == int(4500000 * 0.65)
+    assert len(book) == 1
@@ -0,0 +1,51 @@
+"""
+Test script for the per-session prefetch cache in utils/prefetch.py
+"""
+import threading
+import time
+
+from utils.prefetch import PrefetchCache, PrefetchStats
+
+
+def test_prefetched_result_is_used_once_and_saves_latency():
+    stats = PrefetchStats()
+    cache = PrefetchCache(stats=stats)
+    calls = []
+
+    def slow_score(phone):
+        calls.append(phone)
+        time.sleep(0.05)
+        return {"score": 782}
+
+    cache.start("credit_report", slow_score, "7303201137")
+    time.sleep(0.1)
+    assert cache.take("credit_report", slow_score, "7303201137", stage="credit_check") == {"score": 782}
+    # Second take has nothing prefetched and calls inline
+    cache.take("credit_report", slow_score, "7303201137", stage="credit_check")
+    assert calls == ["7303201137", "7303201137"]
+
+    row = stats.snapshot()["credit_check"]
+    assert (row["hits"], row["misses"]) == (1, 1)
+    assert row["latency_saved_ms"] >= 40
+
+
+def test_take_waits_for_a_running_prefetch():
+    cache = PrefetchCache(stats=PrefetchStats())
+    release = threading.Event()
+    cache.start("offer", lambda: release.wait(1) and "ready")
+    threading.Timer(0.02, release.set).start()
+    assert cache.take("offer", lambda: "inline", stage="verification") == "ready"
+
+
+def test_different_arguments_or_failures_fall_back_inline():
+    stats = PrefetchStats()
+    cache = PrefetchCache(stats=stats)
+    cache.start("safety_score", lambda customer: customer["name"], {"name": "Riya"})
+    assert cache.take("safety_score", lambda customer: "inline", {"name": "Kabir"}, stage="verification") == "inline"
+
+    def broken():
+        raise RuntimeError("bureau down")
+
+    cache.start("credit_report", broken)
+    assert cache.take("credit_report", lambda: "inline", stage="credit_check") == "inline"
+    assert stats.snapshot()["verification"]["misses"] == 1
@@ -0,0 +1,66 @@
+"""
+Test script for the Sales Agent's deterministic info-gathering fast path:
+on-script answers get a templated reply without an LLM call
+"""
+from agents.sales import SalesAgent, fast_path_stats
+from utils.mock_data import get_customer_data
+
+CUSTOMER = get_customer_data("7303201137")
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def complete(self, task, messages, stage=None, **kwargs):
+        self.calls += 1
+        return "Your EMI comes to about Rs. 16,310 a month. Does that fit your budget?"
+
+
+def _turn(message, details=None):
+    agent = SalesAgent("test-key")
+    agent.llm = FakeLLM()
+    history = [{"role": "user", "content": message}]
+    before = fast_path_stats.snapshot()
+    result = agent.negotiate_loan(message, CUSTOMER, history, dict(details or {}), "")
+    after = fast_path_stats.snapshot()
+    moved = {"hits": after["hits"] - before["hits"], "llm_fallbacks": after["llm_fallbacks"] - before["llm_fallbacks"]}
+    return agent.llm.calls, result, moved
+
+
+def test_answer_missing_one_detail_gets_the_template():
+    calls, result, moved = _turn("I need 5 lakh for my wedding")
+    assert calls == 0
+    assert result["message"] == (
+        "Thank you, Riya. I have noted a loan of Rs. 500,000 for the wedding.\n\n"
+        "Over how many months or years would you like to repay it?"
+    )
+    assert not result["ready_for_next_stage"]
+    assert result["loan_details"] == {"amount": 500000, "purpose": "wedding"}
+    assert moved == {"hits": 1, "llm_fallbacks": 0}
+
+
+def test_answer_missing_two_details_asks_for_both():
+    calls, result, moved = _turn("3 years")
+    assert calls == 0
+    assert result["message"] == (
+        "Thank you, Riya. I have noted a loan over 3 years.\n\n"
+        "Could you also help me with a couple of details?\n"
+        "1. How much would you like to borrow? Your pre-approved limit is Rs. 500,000.\n"
+        "2. What will you be using the loan for?"
+    )
+    assert moved == {"hits": 1, "llm_fallbacks": 0}
+
+
+def test_questions_and_complete_details_go_to_the_llm():
+    # A question while details are still missing is a fast-path miss
+    calls, result, moved = _turn("what is the interest rate for 5 lakh?")
+    assert calls == 1
+    assert moved == {"hits": 0, "llm_fallbacks": 1}
+
+    # Once amount, purpose and tenure are known the EMI is presented by the LLM;
+    # the fast path is not consulted
+    calls, result, moved = _turn("3 years", {"amount": 500000, "purpose": "wedding"})
+    assert calls == 1
+    assert result["loan_details"]["tenure"] == 36 and result["loan_details"]["emi"] > 0
+    assert moved == {"hits": 0, "llm_fallbacks": 0}
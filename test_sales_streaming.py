@@ -0,0 +1,64 @@
+"""
+Test script for the streamed Sales Agent reply: sentence boundaries for
+per-sentence translation and the [EXTRACTION:...] tag filter
+"""
+from agents.sales import SalesAgent, ExtractionTagFilter, sentence_boundary
+from utils.mock_data import get_customer_data
+
+TAG = "[EXTRACTION:amount=500000,tenure=36,purpose=wedding]"
+
+
+class FakeStreamingLLM:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.calls = 0
+
+    def stream(self, task, messages, stage=None, **kwargs):
+        self.calls += 1
+        yield from self.chunks
+
+
+def _filtered(chunks):
+    tag_filter = ExtractionTagFilter()
+    return "".join(tag_filter.feed(chunk) for chunk in chunks) + tag_filter.flush()
+
+
+def test_streamed_sentences_are_not_split_inside_amounts_or_abbreviations():
+    text = "A loan of Rs. 2,50,000 at 11.5% is approx. Rs. 5,000 a month. Shall I"
+    assert text[:sentence_boundary(text)] == "A loan of Rs. 2,50,000 at 11.5% is approx. Rs. 5,000 a month. "
+    # A full stop is only a boundary once whitespace follows it
+    assert sentence_boundary("The rate is 11.") == 0
+    assert sentence_boundary("Great! The rate is 11.5") == len("Great! ")
+
+
+def test_tag_split_across_chunks_never_leaks():
+    text = "Your EMI is Rs. 16,310. " + TAG
+    # Every way of cutting the reply into two chunks, and one character at a time
+    for cut in range(len(text) + 1):
+        assert _filtered([text[:cut], text[cut:]]) == "Your EMI is Rs. 16,310. "
+    assert _filtered(list(text)) == "Your EMI is Rs. 16,310. "
+
+
+def test_brackets_that_are_not_the_tag_pass_through():
+    assert _filtered(["See [no", "te] below", " [EXT"]) == "See [note] below [EXT"
+    # An unterminated tag at the end of the stream is dropped
+    assert _filtered(["Done. [EXTRACTION:amount=5"]) == "Done. "
+
+
+def test_stream_emits_tokens_without_the_tag_then_one_result():
+    agent = SalesAgent("test-key")
+    agent.llm = FakeStreamingLLM(["Great, your EMI is Rs. 16,", "310. Shall I proceed? [EXTRAC", TAG[len("[EXTRAC"):]])
+    customer = get_customer_data("7303201137")
+
+    events = list(agent.negotiate_loan_stream(
+        "yes, that works", customer, [], {"amount": 500000, "tenure": 36, "purpose": "wedding"}, ""
+    ))
+
+    assert [event["type"] for event in events[:-1]] == ["token"] * (len(events) - 1)
+    assert events[-1]["type"] == "result"
+    streamed = "".join(event["text"] for event in events[:-1])
+    assert streamed == "Great, your EMI is Rs. 16,310. Shall I proceed? "
+    assert events[-1]["message"] == streamed.strip()
+    assert events[-1]["ready_for_next_stage"]
+    assert events[-1]["loan_details"]["amount"] == 500000
+    assert agent.llm.calls == 1
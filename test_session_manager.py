@@ -0,0 +1,159 @@
+"""
+Test script for the TTL + LRU session manager in utils/session_manager.py
+"""
+from utils.session_manager import SessionManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _manager(clock, **kwargs):
+    counter = iter(range(1000))
+    return SessionManager(lambda: next(counter), clock=clock, **kwargs)
+
+
+def test_sessions_are_reused_until_they_expire():
+    clock = FakeClock()
+    sessions = _manager(clock, ttl=60)
+    first = sessions.get_or_create("a")
+    clock.now = 50
+    assert sessions.get_or_create("a") == first
+    clock.now = 100  # 50s since last activity: still live
+    assert sessions.get("a") == first
+    clock.now = 161
+    assert sessions.get("a") is None
+    assert sessions.get_or_create("a") != first
+    assert sessions.stats()["expired"] == 1
+
+
+def test_sweep_stops_at_first_live_session():
+    clock = FakeClock()
+    removed = []
+    sessions = _manager(clock, ttl=60, on_evict=lambda sid, reason: removed.append((sid, reason)))
+    for i, sid in enumerate(["a", "b", "c"]):
+        clock.now = i * 10
+        sessions.get_or_create(sid)
+    clock.now = 55
+    sessions.get("a")  # touching "a" moves it behind "c"
+    clock.now = 85
+    assert sessions.expire() == 2
+    assert sessions.keys() == ["a"]
+    assert removed == [("b", "expired"), ("c", "expired")]
+
+
+def test_least_recently_active_session_is_evicted_at_capacity():
+    clock = FakeClock()
+    sessions = _manager(clock, max_sessions=2)
+    sessions.get_or_create("a")
+    sessions.get_or_create("b")
+    sessions.get("a")
+    sessions.get_or_create("c")
+    assert sorted(sessions.keys()) == ["a", "c"]
+    assert sessions.stats()["evicted"] == 1
+
+
+def test_discard_starts_over():
+    sessions = _manager(FakeClock())
+    first = sessions.get_or_create("a")
+    sessions.discard("a")
+    assert "a" not in sessions
+    assert sessions.get_or_create("a") != first
+
+
+class SnapshotAgent:
+    def __init__(self, turns=None):
+        self.turns = list(turns or [])
+
+    def snapshot(self):
+        return {"turns": self.turns}
+
+
+def _spilling_manager(clock, tmp_path, **kwargs):
+    from utils.session_store import SQLiteSessionStore
+    return SessionManager(
+        SnapshotAgent,
+        clock=clock,
+        restore=lambda snapshot: SnapshotAgent(snapshot["turns"]),
+        spill_store=SQLiteSessionStore(str(tmp_path / "spill.db")),
+        **kwargs,
+    )
+
+
+def test_idle_sessions_spill_and_rehydrate(tmp_path):
+    clock = FakeClock()
+    sessions = _spilling_manager(clock, tmp_path, ttl=600, spill_after=60)
+    sessions.get_or_create("a").turns.append("hello")
+    clock.now = 50
+    sessions.get_or_create("b")
+    clock.now = 100
+    assert sessions.spill_idle() == 1
+    assert sessions.stats()["resident"] == 1
+
+    agent = sessions.get("a")
+    assert agent.turns == ["hello"]
+    assert sessions.get("a") is agent
+    assert sessions.stats()["rehydrated"] == 1
+    assert sessions.keys() == ["b", "a"]
+
+
+def test_memory_pressure_spills_least_recent_first(tmp_path):
+    clock = FakeClock()
+    # A 1 KB high-water mark is always exceeded
+    sessions = _spilling_manager(clock, tmp_path, memory_high_water_mb=0.001)
+    for i, sid in enumerate("abcd"):
+        clock.now = i
+        sessions.get_or_create(sid)
+    clock.now = 3 + 61
+    assert sessions.relieve_memory_pressure() == 1  # a quarter of resident sessions per sweep
+    assert sessions.relieve_memory_pressure() == 1
+    assert sessions.stats()["resident"] == 2
+    assert sessions.get("a") is not None
+
+
+def test_spilled_copies_expire_with_their_session(tmp_path):
+    clock = FakeClock()
+    sessions = _spilling_manager(clock, tmp_path, ttl=100, spill_after=10)
+    sessions.get_or_create("a")
+    clock.now = 20
+    sessions.spill_idle()
+    clock.now = 200
+    assert sessions.expire() == 1
+    assert sessions._spill_store.load("a") is None
+
+
+def test_sessions_in_a_turn_are_never_spilled(tmp_path):
+    clock = FakeClock()
+    sessions = _spilling_manager(clock, tmp_path, ttl=600, spill_after=60, memory_high_water_mb=0.001)
+    with sessions.turn("a") as agent:
+        agent.turns.append("thinking")
+        # A long turn: the session looks idle, but is pinned
+        clock.now = 300
+        assert sessions.spill_idle() == 0
+        assert sessions.relieve_memory_pressure() == 0
+        agent.turns.append("answered")
+    assert sessions.spill_idle() == 0  # touched when the turn ended
+
+    clock.now = 400
+    assert sessions.spill_idle() == 1
+    assert sessions.get("a").turns == ["thinking", "answered"]
+
+
+def test_private_spill_file_is_owner_only_and_removed_on_close():
+    import os
+    import stat
+
+    clock = FakeClock()
+    sessions = SessionManager(SnapshotAgent, clock=clock, restore=lambda s: SnapshotAgent(s["turns"]), spill_after=10)
+    sessions.get_or_create("a")
+    clock.now = 20
+    assert sessions.spill_idle() == 1
+    spill_dir = sessions._spill_dir
+    assert stat.S_IMODE(os.stat(spill_dir).st_mode) == 0o700
+
+    sessions.close()
+    assert not os.path.exists(spill_dir)
@@ -0,0 +1,53 @@
+"""
+Test script for the typed orchestrator state in state.py
+"""
+import json
+
+from state import ConversationState, ConversationStage
+
+
+def _sample():
+    state = ConversationState()
+    state.stage = ConversationStage.SECURED_LOAN
+    state.customer_data = {"name": "Riya Sharma", "phone": "7303201137", "salary": 60000}
+    state.loan_request = {"amount": 250000, "tenure": 24, "interest_rate": 11.5}
+    state.awaiting_secured_loan_application = True
+    state.documents_uploaded = True
+    state.manual_data_step = 3
+    state.credit_score = 782
+    state.final_decision = "REJECTED"
+    return state
+
+
+def test_binary_round_trip():
+    state = _sample()
+    restored = ConversationState.from_bytes(state.to_bytes())
+    assert restored.to_dict() == state.to_dict()
+    assert restored.stage is ConversationStage.SECURED_LOAN
+
+    empty = ConversationState.from_bytes(ConversationState().to_bytes())
+    assert empty.credit_score is None
+    assert empty.to_dict() == ConversationState().to_dict()
+
+
+def test_dict_round_trip_matches_legacy_snapshots():
+    data = json.loads(json.dumps(_sample().to_dict()))
+    assert data["stage"] == "secured_loan"
+    assert ConversationState.from_dict(data).to_dict() == _sample().to_dict()
+
+
+def test_stages_behave_like_their_values():
+    state = ConversationState()
+    assert state.stage == "initial"
+    assert json.dumps({"stage": ConversationStage.COMPLETED}) == '{"stage": "completed"}'
+
+
+def test_state_is_slotted():
+    state = ConversationState()
+    assert not hasattr(state, "__dict__")
+    try:
+        state.unknown_field = 1
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("unknown fields should be rejected")
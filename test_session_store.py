@@ -0,0 +1,77 @@
+"""
+Test script for session snapshots in utils/session_store.py: two managers
+sharing one store behave like two workers serving the same conversation
+"""
+from agents.sales import SalesAgent
+from utils.conversation_context import ConversationContext
+from utils.session_manager import SessionManager
+from utils.session_store import MemorySessionStore, SQLiteSessionStore
+
+
+class FakeAgent:
+    def __init__(self, turns=None):
+        self.turns = list(turns or [])
+
+    def snapshot(self):
+        return {"turns": self.turns}
+
+
+def _worker(store):
+    return SessionManager(FakeAgent, store=store, restore=lambda snapshot: FakeAgent(snapshot["turns"]))
+
+
+def test_any_worker_continues_the_conversation(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    first, second = _worker(store), _worker(store)
+
+    first.get_or_create("s").turns.append("hello")
+    first.save("s")
+    agent = second.get_or_create("s")
+    assert agent.turns == ["hello"]
+
+    agent.turns.append("5 lakh")
+    second.save("s")
+    # The first worker's cached copy is stale and gets reloaded
+    assert first.get("s").turns == ["hello", "5 lakh"]
+    assert first.stats()["reloaded"] == 1
+
+    first.discard("s")
+    assert second.get("s") is None
+
+
+def test_unsaved_session_stays_local():
+    store = MemorySessionStore()
+    worker = _worker(store)
+    agent = worker.get_or_create("s")
+    assert worker.get("s") is agent
+    assert store.version("s") is None
+
+
+def test_versions_and_purge(tmp_path):
+    for store in (MemorySessionStore(), SQLiteSessionStore(str(tmp_path / "v.db"))):
+        assert store.save("a", {"n": 1}) == 1
+        assert store.save("a", {"n": 2}) == 2
+        assert store.load("a").snapshot == {"n": 2}
+        assert store.purge(older_than=0) == 0
+        assert store.purge(older_than=float("inf")) == 1
+        assert store.load("a") is None
+
+
+def test_history_and_tracker_round_trip():
+    history = ConversationContext(max_messages=4)
+    for i in range(6):
+        history.append({"role": "user", "content": f"I need {i + 1} lakh"})
+    restored = ConversationContext.from_dict(history.to_dict())
+    assert list(restored) == list(history)
+    assert restored.summary == history.summary
+    assert restored.total_appended == 6
+
+    agent = SalesAgent("test-key")
+    agent.details_tracker.sync(history)
+    snapshot = agent.snapshot(history)
+
+    other = SalesAgent("test-key")
+    other.restore(snapshot, restored)
+    other.details_tracker.sync(restored)  # nothing new: must not rescan
+    assert other.details_tracker.details_with() == agent.details_tracker.details_with()
+    assert other.details_tracker.details_with()["amount"] == 600000
@@ -0,0 +1,99 @@
+"""
+Test script for the two-tier translation memory in utils/translation_memory.py
+"""
+import sqlite3
+import threading
+import time
+from utils.translation_memory import TranslationMemory
+
+
+class FakeTranslator:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    def __call__(self, text, source, target):
+        self.calls += 1
+        time.sleep(self.delay)
+        return f"[{target}] {text}"
+
+
+def test_repeated_strings_are_translated_once(tmp_path):
+    translator = FakeTranslator()
+    memory = TranslationMemory(path=str(tmp_path / "tm.db"))
+
+    for _ in range(3):
+        assert memory.translate("Please upload your salary slip.", "hi", "en", translator, persist=True) == "[hi] Please upload your salary slip."
+    assert memory.translate("Please upload your salary slip.", "ta", "en", translator, persist=True) == "[ta] Please upload your salary slip."
+
+    assert translator.calls == 2
+    stats = memory.stats()
+    assert (stats["memory_hits"], stats["misses"], stats["disk_entries"]) == (2, 2, 2)
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "tm.db")
+    TranslationMemory(path=path).translate("Hello", "hi", "en", FakeTranslator(), persist=True)
+
+    translator = FakeTranslator()
+    restarted = TranslationMemory(path=path)
+    assert restarted.translate("Hello", "hi", "en", translator) == "[hi] Hello"
+    assert translator.calls == 0
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_concurrent_misses_share_one_call():
+    translator = FakeTranslator(delay=0.05)
+    memory = TranslationMemory()
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(memory.translate("Hi", "bn", "en", translator)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["[bn] Hi"] * 5
+    assert translator.calls == 1
+
+
+def test_failures_are_not_cached():
+    memory = TranslationMemory()
+
+    def broken(text, source, target):
+        raise RuntimeError("network down")
+
+    try:
+        memory.translate("Hi", "hi", "en", broken)
+        assert False, "expected the translator error"
+    except RuntimeError:
+        pass
+    assert memory.translate("Hi", "hi", "en", FakeTranslator()) == "[hi] Hi"
+
+
+def test_only_persisted_text_reaches_disk(tmp_path):
+    path = str(tmp_path / "tm.db")
+    memory = TranslationMemory(path=path)
+    memory.translate("My address is 12 MG Road", "hi", "en", FakeTranslator())
+    memory.translate("Please upload your salary slip.", "hi", "en", FakeTranslator(), persist=True)
+
+    rows = sqlite3.connect(path).execute("SELECT text FROM translations").fetchall()
+    assert rows == [("Please upload your salary slip.",)]
+    # The customer's text is still served from memory for the rest of the process
+    assert memory.lookup("My address is 12 MG Road", "hi", "en") == "[hi] My address is 12 MG Road"
+
+
+def test_disk_tier_expires_and_caps_rows(tmp_path):
+    path = str(tmp_path / "tm.db")
+    memory = TranslationMemory(path=path, max_disk_entries=2)
+    for text in ("one", "two", "three"):
+        memory.store(text, "hi", "en", f"[hi] {text}", persist=True)
+        time.sleep(0.01)
+    assert memory.prune() == 1
+    assert memory.stats()["disk_entries"] == 2
+
+    expired = TranslationMemory(path=path, disk_ttl_days=0)
+    assert expired.lookup("three", "hi", "en") is None
+    assert expired.stats()["disk_entries"] == 0
@@ -0,0 +1,70 @@
+"""
+Test script for the deadline-bounded translation pipeline in utils/translation_pipeline.py
+"""
+import threading
+import time
+from utils.translation_memory import TranslationMemory
+from utils.translation_pipeline import TranslationPipeline
+
+
+class FakeTranslator:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def __call__(self, text, source, target):
+        with self._lock:
+            self.requests.append(text)
+        time.sleep(self.delay)
+        return "\n".join(f"[{target}] {line}" for line in text.split("\n"))
+
+
+def _pipeline(translator, deadline=2.0):
+    return TranslationPipeline(memory=TranslationMemory(), translator=translator, deadline=deadline)
+
+
+def test_slow_translation_falls_back_to_source_text():
+    translator = FakeTranslator(delay=0.5)
+    pipeline = _pipeline(translator, deadline=0.05)
+
+    start = time.monotonic()
+    assert pipeline.translate("Hello", "hi") == "Hello"
+    assert time.monotonic() - start < 0.3
+    assert pipeline.stats()["timeouts"] == 1
+
+    # The late result still lands in the memory for the next turn
+    time.sleep(0.6)
+    assert pipeline.translate("Hello", "hi") == "[hi] Hello"
+
+
+def test_segments_are_batched_into_one_request():
+    translator = FakeTranslator()
+    pipeline = _pipeline(translator)
+
+    texts = ["One.", "Two.", "One.", "   ", "Three."]
+    assert pipeline.translate_many(texts, "ta") == ["[ta] One.", "[ta] Two.", "[ta] One.", "   ", "[ta] Three."]
+    assert translator.requests == ["One.\nTwo.\nThree."]
+
+    # Served from memory afterwards
+    assert pipeline.translate_many(["Two.", "Three."], "ta") == ["[ta] Two.", "[ta] Three."]
+    assert len(translator.requests) == 1
+
+
+def test_malformed_batch_falls_back_to_concurrent_requests():
+    def line_dropping(text, source, target):
+        return f"[{target}] {text.replace(chr(10), ' ')}"
+
+    pipeline = _pipeline(line_dropping)
+    assert pipeline.translate_many(["A.", "B."], "bn") == ["[bn] A.", "[bn] B."]
+
+
+def test_independent_translations_run_concurrently():
+    translator = FakeTranslator(delay=0.2)
+    pipeline = _pipeline(translator)
+
+    start = time.monotonic()
+    jobs = [pipeline.submit(f"Line\n{i}", "gu") for i in range(4)]
+    results = [job.result() for job in jobs]
+    assert time.monotonic() - start < 0.6
+    assert results[2] == "[gu] Line\n[gu] 2"
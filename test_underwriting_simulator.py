@@ -0,0 +1,83 @@
+"""
+Test script for the vectorized underwriting what-if simulator
+"""
+import numpy as np
+
+from agents.underwriting import UnderwritingAgent
+from utils.emi_calc import calculate_emi
+from utils.mock_data import get_all_customers
+import underwriting_simulator as sim
+
+
+def _scalar_rates(customers, min_score, max_emi, instant, slip):
+    # The chat's rules, one application at a time, with the bands moved
+    agent = UnderwritingAgent()
+    agent.min_credit_score, agent.max_emi_ratio = min_score, max_emi
+    counts = dict.fromkeys(sim.RATES, 0)
+    total = 0
+    for c in customers.values():
+        for multiple in sim.SYNTHETIC_MULTIPLES:
+            for tenure in sim.SYNTHETIC_TENURES:
+                amount = int(c["pre_approved_limit"] * multiple)
+                total += 1
+                if c["credit_score"] < min_score or amount / c["pre_approved_limit"] > slip:
+                    counts["rejected"] += 1
+                elif amount / c["pre_approved_limit"] <= instant:
+                    counts["approved"] += 1
+                    counts["approved_after_documents"] += 1
+                else:
+                    counts["documents_requested"] += 1
+                    salary = agent.evaluate_with_salary(c["monthly_income"], calculate_emi(amount, 12.0, tenure))
+                    counts["approved_after_documents"] += salary["decision"] == "APPROVED"
+    return {name: count / total for name, count in counts.items()}
+
+
+def test_grid_matches_scalar_rules_at_every_point():
+    customers = get_all_customers()
+    book = sim.synthetic_book(customers)
+    grid = sim.policy_grid([650, 700, 760], [40, 50], [1.0, 1.5], [2.0, 2.5])
+    rates = sim.simulate(book, grid)
+    assert rates["approved"].shape == grid.shape
+
+    for index in np.ndindex(grid.shape):
+        params = [axis[i] for axis, i in zip(grid, index)]
+        expected = _scalar_rates(customers, *params)
+        for name in sim.RATES:
+            assert np.isclose(rates[name][index], expected[name]), (params, name)
+
+
+def test_default_policy_matches_evaluate_loan():
+    customers = get_all_customers()
+    book = sim.synthetic_book(customers)
+    rates = sim.simulate(book, sim.policy_grid())
+    agent = UnderwritingAgent()
+    decisions = [
+        agent.evaluate_loan(c, {"amount": int(c["pre_approved_limit"] * m)}, c["credit_score"])["decision"]
+        for c in customers.values() for m in sim.SYNTHETIC_MULTIPLES for _ in sim.SYNTHETIC_TENURES
+    ]
+    assert np.isclose(rates["approved"].item(), decisions.count("APPROVED") / len(decisions))
+    assert np.isclose(rates["documents_requested"].item(), decisions.count("REQUIRES_SALARY_SLIP") / len(decisions))
+
+
+def test_history_joins_applications_to_customers(tmp_path):
+    customers = get_all_customers()
+    riya = customers["7303201137"]
+    applications = {
+        riya["email"]: [{"amount": 500000, "tenure": 60}, {"amount": 1000000, "tenure": 60}],
+        "someone@else.com": [{"amount": 100000, "tenure": 12}],
+    }
+    book = sim.history_book(applications, customers)
+    assert book.size == 2
+    assert book.pre_approved_limit.tolist() == [riya["pre_approved_limit"]] * 2
+
+    broken = tmp_path / "user_loans.json"
+    broken.write_text("<<<<<<< HEAD\n{}")
+    assert sim.load_applications(str(broken)) == {}
+    assert sim.history_book({}, customers).size == 0
+
+
+def test_applicants_without_a_score_are_rejected():
+    customer = dict(get_all_customers()["7303201137"])
+    del customer["credit_score"]
+    rates = sim.simulate(sim.synthetic_book({"x": customer}), sim.policy_grid([300]))
+    assert rates["rejected"].item() == 1.0
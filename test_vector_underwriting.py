@@ -0,0 +1,76 @@
+"""
+Test script to verify the array underwriting rules in utils/vector_underwriting.py
+and batch_decisions.py match the scalar agents
+"""
+import csv
+import random
+
+import numpy as np
+
+from agents.sales import SalesAgent
+from agents.underwriting import UnderwritingAgent
+from utils.emi_calc import calculate_emi
+from utils.mock_data import get_all_customers
+from utils import vector_underwriting as vu
+import batch_decisions
+
+
+def test_evaluate_loan_and_salary_match_underwriting_agent():
+    rng = random.Random(7)
+    agent = UnderwritingAgent()
+    cases = [(rng.choice([50000, 200000, 500000, 999999, 1000000, 2500000]),
+              rng.choice([100000, 500000, 1000000]),
+              rng.randint(600, 850)) for _ in range(300)]
+    amount, limit, score = (np.array(column) for column in zip(*cases))
+    decision, _ = vu.evaluate_loan(amount, limit, score)
+    expected = [agent.evaluate_loan({"pre_approved_limit": l}, {"amount": a}, s)["decision"] for a, l, s in cases]
+    assert vu.DECISIONS[decision].tolist() == expected
+
+    salary = np.array([rng.randint(20000, 150000) for _ in cases])
+    monthly_emi = np.array([rng.randint(5000, 80000) for _ in cases])
+    approved, _ = vu.evaluate_with_salary(salary, monthly_emi)
+    expected = [agent.evaluate_with_salary(s, e)["decision"] == "APPROVED" for s, e in zip(salary, monthly_emi)]
+    assert approved.tolist() == expected
+
+
+def test_rate_and_emi_match_sales_agent():
+    sales = SalesAgent.__new__(SalesAgent)
+    for amount in (150000, 500000, 1500000):
+        for tenure in (12, 36, 60):
+            for credit, safety in ((820, 0.95), (760, 0.5), (690, 0.2)):
+                customer = {"credit_score": credit, "internal_safety_score": safety}
+                rate = sales._calculate_interest_rate(amount, tenure, customer)
+                assert vu.interest_rate(amount, tenure, credit, safety) == rate
+                assert int(np.floor(vu.emi(amount, rate, tenure))) == sales._calculate_emi(amount, rate, tenure)
+                assert round(float(vu.emi(amount, 12.0, tenure)), 2) == calculate_emi(amount, 12.0, tenure)
+
+
+def test_batch_rows_follow_the_chat_decision_chain(tmp_path):
+    customers = list(get_all_customers().values())
+    requests = batch_decisions.DEFAULT_REQUESTS
+    rows = batch_decisions.decide(customers, requests, [0.5] * len(customers))
+    assert len(rows) == len(customers) * len(requests)
+
+    agent = UnderwritingAgent()
+    field = batch_decisions.FIELDS.index
+    for row in rows:
+        customer = get_all_customers()[row[field("phone")]]
+        request = requests[row[field("request")]]
+        expected = agent.evaluate_loan(customer, request, customer["credit_score"])["decision"]
+        assert row[field("underwriting_decision")] == expected
+        if expected != "REQUIRES_SALARY_SLIP":
+            assert row[field("final_decision")] == expected
+        if row[field("secured_max_amount")] is not None:
+            assert row[field("final_decision")] == "REJECTED"
+
+    path = tmp_path / "decisions.csv"
+    batch_decisions.write_decisions(str(path), rows)
+    with open(path, newline="", encoding="utf-8") as f:
+        written = list(csv.reader(f))
+    assert written[0] == batch_decisions.FIELDS
+    assert len(written) == len(rows) + 1
+
+
+def test_missing_credit_score_is_rejected():
+    decision, _ = vu.evaluate_loan(np.array([100000, 100000]), 500000, np.array([782, np.nan]))
+    assert vu.DECISIONS[decision].tolist() == ["APPROVED", "REJECTED"]
@@ -0,0 +1,52 @@
+"""
+Test script for the /api/chat/stream Server-Sent Events endpoint
+"""
+import json
+import os
+
+import pytest
+
+# main.py loads the risk model, which needs the ML stack
+for _module in ("joblib", "pandas", "shap"):
+    pytest.importorskip(_module)
+
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+os.environ["SESSION_STORE_PATH"] = ""
+
+import web_api  # noqa: E402
+from state import ConversationStage  # noqa: E402
+from utils.mock_data import get_customer_data  # noqa: E402
+from test_sales_streaming import FakeStreamingLLM  # noqa: E402
+
+
+def _events(response):
+    events = []
+    for block in response.get_data(as_text=True).split("\n\n"):
+        if block:
+            event, data = block.split("\n")
+            events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_stream_sends_tokens_then_one_done():
+    client = web_api.app.test_client()
+    greeting = _events(client.post("/api/chat/stream", json={"session_id": "sse-test", "message": "__INIT__"}))
+    assert [event for event, _ in greeting] == ["done"]
+
+    llm = FakeStreamingLLM(["For 5 lakhs over 3 years, your EMI ", "is Rs. 16,310. ", "Does that fit your budget?"])
+    with web_api.sessions.turn("sse-test") as agent:
+        agent.state.stage = ConversationStage.NEEDS_ASSESSMENT
+        agent.state.customer_data = get_customer_data("7303201137")
+        agent.state.loan_request = {"amount": 500000, "tenure": 36, "purpose": "wedding"}
+        agent.sales_agent.llm = llm
+
+    events = _events(client.post("/api/chat/stream", json={"session_id": "sse-test", "message": "what is my EMI?"}))
+    names = [event for event, _ in events]
+    assert names[-1] == "done" and names.count("done") == 1
+    assert names[:-1] and set(names[:-1]) == {"token"}
+
+    tokens = "".join(payload["text"] for _, payload in events[:-1])
+    done = events[-1][1]
+    assert done["reply"] == tokens.strip() == "For 5 lakhs over 3 years, your EMI is Rs. 16,310. Does that fit your budget?"
+    assert done["stage"] == "needs_assessment" and done["final_decision"] is None
+    assert llm.calls == 1
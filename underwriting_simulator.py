@@ -0,0 +1,221 @@
+"""
+What-if simulator for the underwriting policy: how approval, document-request
+and rejection rates move if the minimum credit score, the EMI-to-income cap
+or the pre-approved ratio bands change. Historical applications and the
+customers they belong to are loaded into NumPy arrays once; every grid point
+is evaluated with the evaluate_loan / evaluate_with_salary rules as array
+operations, many grid points per call.
+
+    python underwriting_simulator.py [--min-score 650:750:25] [--max-emi 40,50,60]
+                                     [--instant 1.0] [--slip 1.5:3:0.5] [--synthetic] [--out grid.csv]
+
+Lists are comma-separated values or start:stop:step (inclusive).
+Without usable history (or with --synthetic) each customer is given
+applications at several multiples of their pre-approved limit.
+"""
+import argparse
+import csv
+import json
+import time
+from itertools import product
+from typing import Any, Dict, List, NamedTuple, Sequence
+
+import numpy as np
+
+from agents.underwriting import MIN_CREDIT_SCORE, MAX_EMI_RATIO, INSTANT_APPROVAL_RATIO, SALARY_SLIP_RATIO
+from user_store import STORE_PATH
+from utils.mock_data import get_all_customers
+from utils.vector_underwriting import (
+    APPROVED, REQUIRES_SALARY_SLIP, REJECTED, SALARY_CHECK_RATE,
+    emi, evaluate_loan, evaluate_with_salary,
+)
+
+SYNTHETIC_MULTIPLES = (0.5, 1.0, 1.5, 2.0, 2.5, 3.0)
+SYNTHETIC_TENURES = (12, 36, 60)
+# Bounds the (policies x applications) arrays evaluated at once
+MAX_CELLS_PER_CHUNK = 4_000_000
+
+PARAMETERS = ("min_credit_score", "max_emi_ratio", "instant_ratio", "salary_slip_ratio")
+RATES = ("approved", "documents_requested", "rejected", "approved_after_documents")
+
+
+class ApplicationBook(NamedTuple):
+    """One entry per application: what was asked for and the customer facts the policy reads"""
+    amount: np.ndarray
+    pre_approved_limit: np.ndarray
+    credit_score: np.ndarray
+    salary: np.ndarray
+    salary_check_emi: np.ndarray
+    source: str
+
+    @property
+    def size(self) -> int:
+        return len(self.amount)
+
+
+def load_applications(path: str = STORE_PATH) -> Dict[str, List[Dict[str, Any]]]:
+    """Applications from the user store, keyed by email or phone; empty if the file cannot be read"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read applications from {path}: {e}")
+        return {}
+
+
+def _book(rows: Sequence[tuple], source: str) -> ApplicationBook:
+    columns = np.array(rows, dtype=np.float64).reshape(-1, 5).T
+    amount, tenure, limit, score, salary = columns
+    return ApplicationBook(
+        amount=amount,
+        pre_approved_limit=limit,
+        credit_score=score,
+        salary=salary,
+        salary_check_emi=np.round(emi(amount, SALARY_CHECK_RATE, tenure), 2),
+        source=source,
+    )
+
+
+def _customer_facts(customer: Dict[str, Any]) -> tuple:
+    # A missing score is NaN, which evaluate_loan rejects, as the chat does
+    score = customer.get("credit_score")
+    return (customer["pre_approved_limit"], np.nan if score is None else score,
+            customer.get("salary") or customer.get("monthly_income") or 0)
+
+
+def history_book(applications: Dict[str, List[Dict[str, Any]]], customers: Dict[str, Dict[str, Any]]) -> ApplicationBook:
+    """Historical applications joined to their customer by phone or email; unknown users are skipped"""
+    by_email = {c["email"].lower(): c for c in customers.values() if c.get("email")}
+    rows = []
+    for user_id, apps in applications.items():
+        customer = customers.get(user_id) or by_email.get(user_id.lower())
+        if not customer:
+            continue
+        for app in apps:
+            if app.get("amount") and app.get("tenure"):
+                rows.append((app["amount"], app["tenure"]) + _customer_facts(customer))
+    return _book(rows, "history")
+
+
+def synthetic_book(customers: Dict[str, Dict[str, Any]],
+                   multiples: Sequence[float] = SYNTHETIC_MULTIPLES,
+                   tenures: Sequence[int] = SYNTHETIC_TENURES) -> ApplicationBook:
+    rows = [
+        (int(c["pre_approved_limit"] * multiple), tenure) + _customer_facts(c)
+        for c in customers.values() for multiple, tenure in product(multiples, tenures)
+    ]
+    return _book(rows, "synthetic")
+
+
+class PolicyGrid(NamedTuple):
+    """Values to try per policy parameter; every combination is a grid point"""
+    min_credit_score: np.ndarray
+    max_emi_ratio: np.ndarray
+    instant_ratio: np.ndarray
+    salary_slip_ratio: np.ndarray
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(len(axis) for axis in self)
+
+    def points(self) -> Dict[str, np.ndarray]:
+        """Parameter values per grid point, flattened in the same order as simulate()'s rates"""
+        axes = np.meshgrid(*self, indexing="ij")
+        return {name: axis.ravel() for name, axis in zip(PARAMETERS, axes)}
+
+
+def policy_grid(min_credit_scores: Sequence[float] = (MIN_CREDIT_SCORE,),
+                max_emi_ratios: Sequence[float] = (MAX_EMI_RATIO,),
+                instant_ratios: Sequence[float] = (INSTANT_APPROVAL_RATIO,),
+                salary_slip_ratios: Sequence[float] = (SALARY_SLIP_RATIO,)) -> PolicyGrid:
+    return PolicyGrid(*(np.asarray(values, dtype=np.float64)
+                        for values in (min_credit_scores, max_emi_ratios, instant_ratios, salary_slip_ratios)))
+
+
+def simulate(book: ApplicationBook, grid: PolicyGrid) -> Dict[str, np.ndarray]:
+    """
+    Rates (0-1) per grid point, each an array of grid.shape. The EMI cap only
+    matters for applications sent for documents, so evaluate_loan runs over
+    the other three parameters and the salary check over the caps; approvals
+    after documents combine the two with one matrix product.
+    """
+    scores, caps, instants, slips = grid
+    lending = [axis.ravel()[:, None] for axis in np.meshgrid(scores, instants, slips, indexing="ij")]
+    points = len(lending[0])
+    rates = {name: np.zeros((points, len(caps))) for name in RATES}
+    if not book.size or not points or not len(caps):
+        return {name: rate.reshape(grid.shape) for name, rate in rates.items()}
+
+    salary_ok, _ = evaluate_with_salary(book.salary, book.salary_check_emi, caps[:, None])
+    salary_ok = salary_ok.T.astype(np.float64)
+
+    chunk = max(1, MAX_CELLS_PER_CHUNK // book.size)
+    for start in range(0, points, chunk):
+        sl = slice(start, start + chunk)
+        decision, _ = evaluate_loan(
+            book.amount, book.pre_approved_limit, book.credit_score,
+            min_credit_score=lending[0][sl], instant_ratio=lending[1][sl], salary_slip_ratio=lending[2][sl],
+        )
+        needs_documents = decision == REQUIRES_SALARY_SLIP
+        approved = (decision == APPROVED).mean(axis=1)[:, None]
+        rates["approved"][sl] = approved
+        rates["documents_requested"][sl] = needs_documents.mean(axis=1)[:, None]
+        rates["rejected"][sl] = (decision == REJECTED).mean(axis=1)[:, None]
+        rates["approved_after_documents"][sl] = approved + needs_documents.astype(np.float64) @ salary_ok / book.size
+
+    # (score, instant, slip, cap) -> (score, cap, instant, slip), the PARAMETERS order
+    shape = (len(scores), len(instants), len(slips), len(caps))
+    return {name: rate.reshape(shape).transpose(0, 3, 1, 2) for name, rate in rates.items()}
+
+
+def _values(text: str) -> List[float]:
+    if ":" in text:
+        start, stop, step = (float(part) for part in text.split(":"))
+        return np.arange(start, stop + step / 2, step).round(6).tolist()
+    return [float(part) for part in text.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Approval rates under alternative underwriting policies")
+    parser.add_argument("--min-score", type=_values, default=[MIN_CREDIT_SCORE])
+    parser.add_argument("--max-emi", type=_values, default=[MAX_EMI_RATIO])
+    parser.add_argument("--instant", type=_values, default=[INSTANT_APPROVAL_RATIO])
+    parser.add_argument("--slip", type=_values, default=[SALARY_SLIP_RATIO])
+    parser.add_argument("--synthetic", action="store_true", help="ignore history, use generated applications")
+    parser.add_argument("--out", help="write every grid point to this CSV instead of printing")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    customers = get_all_customers()
+    book = synthetic_book(customers) if args.synthetic else history_book(load_applications(), customers)
+    if not book.size:
+        print("⚠️ No usable historical applications, using synthetic ones")
+        book = synthetic_book(customers)
+    grid = policy_grid(args.min_score, args.max_emi, args.instant, args.slip)
+    loaded = time.perf_counter() - start
+
+    rates = simulate(book, grid)
+    elapsed = time.perf_counter() - start - loaded
+
+    columns = list(grid.points().values()) + [np.round(rates[name].ravel() * 100, 2) for name in RATES]
+    rows = list(zip(*(column.tolist() for column in columns)))
+    points = len(rows)
+    if args.out:
+        with open(args.out, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(list(PARAMETERS) + [f"{name}_pct" for name in RATES])
+            writer.writerows(rows)
+        print(f"Wrote {args.out}")
+    else:
+        print(f"{'min score':>10}{'max emi %':>10}{'instant x':>10}{'slip x':>8}"
+              f"{'approved %':>12}{'docs %':>9}{'rejected %':>12}{'approved+docs %':>17}")
+        for score, emi_cap, instant, slip, approved, docs, rejected, final in rows:
+            print(f"{score:>10.0f}{emi_cap:>10.1f}{instant:>10.2f}{slip:>8.2f}"
+                  f"{approved:>12.2f}{docs:>9.2f}{rejected:>12.2f}{final:>17.2f}")
+
+    print(f"{points:,} policies x {book.size:,} {book.source} applications "
+          f"in {elapsed:.3f}s (load {loaded:.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import re
+from collections import deque
+from typing import Dict, List, Iterable, Optional, Sequence
+
+# Messages kept verbatim per session; older turns are folded into the summary
+MAX_MESSAGES = 20
+
+# Running summary limits. Each folded turn becomes one clipped line; the oldest
+# lines are dropped once the summary exceeds its token budget.
+SUMMARY_MAX_TOKENS = 300
+USER_LINE_CHARS = 160
+ASSISTANT_LINE_CHARS = 100
+
+SUMMARY_HEADER = "Summary of the earlier conversation (oldest first):"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token), no tokenizer needed"""
+    return len(text or "") // 4 + 1
+
+
+def _clip(text: str, limit: int) -> str:
+    text = re.sub(r"\s+", " ", text or "").strip()
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+class ConversationContext:
+    """
+    Bounded conversation history for one session.
+    Behaves like the old list of {"role", "content"} dicts (append, len, index,
+    slice, iterate) but keeps only the last MAX_MESSAGES messages. Evicted turns
+    are folded into a compact running summary, and recent() builds prompt
+    context that fits a token budget.
+    """
+
+    def __init__(
+        self,
+        messages: Optional[Iterable[Dict[str, str]]] = None,
+        max_messages: int = MAX_MESSAGES,
+        summary_max_tokens: int = SUMMARY_MAX_TOKENS,
+    ):
+        self._buffer = deque(maxlen=max_messages)
+        self._summary_lines = deque()
+        self._summary_tokens = 0
+        self.summary_max_tokens = summary_max_tokens
+        # Messages ever appended, including evicted ones. Lets incremental
+        # consumers (LoanDetailsTracker) find new messages in a ring buffer.
+        self.total_appended = 0
+        for message in messages or ():
+            self.append(message)
+
+    # --- list-like access ---
+    def append(self, message: Dict[str, str]):
+        if len(self._buffer) == self._buffer.maxlen:
+            self._fold(self._buffer[0])
+        self._buffer.append(message)
+        self.total_appended += 1
+
+    def extend(self, messages: Iterable[Dict[str, str]]):
+        for message in messages:
+            self.append(message)
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def __iter__(self):
+        return iter(self._buffer)
+
+    def __reversed__(self):
+        return reversed(self._buffer)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._buffer)[index]
+        return self._buffer[index]
+
+    # --- summary ---
+    @property
+    def summary(self) -> str:
+        return "\n".join(self._summary_lines)
+
+    def _fold(self, message: Dict[str, str]):
+        role = message.get("role")
+        if role == "user":
+            line = "Customer: " + _clip(message.get("content"), USER_LINE_CHARS)
+        elif role == "assistant":
+            line = "Agent: " + _clip(message.get("content"), ASSISTANT_LINE_CHARS)
+        else:
+            return
+        self._summary_lines.append(line)
+        self._summary_tokens += estimate_tokens(line)
+        while self._summary_tokens > self.summary_max_tokens and len(self._summary_lines) > 1:
+            self._summary_tokens -= estimate_tokens(self._summary_lines.popleft())
+
+    # --- prompt building ---
+    def recent(self, max_tokens: int, roles: Sequence[str] = ("user", "assistant")) -> List[Dict[str, str]]:
+        """
+        Newest messages that fit in max_tokens, oldest first. If older context
+        exists, the running summary goes first as a system message (its tokens
+        count against the budget). The newest message is always included.
+        """
+        summary = self.summary
+        prefix: List[Dict[str, str]] = []
+        budget = max_tokens
+        if summary:
+            content = f"{SUMMARY_HEADER}\n{summary}"
+            cost = estimate_tokens(content)
+            # Never let the summary crowd out the latest turns
+            if cost <= max_tokens // 2:
+                prefix.append({"role": "system", "content": content})
+                budget -= cost
+
+        selected: List[Dict[str, str]] = []
+        for message in reversed(self._buffer):
+            if message.get("role") not in roles:
+                continue
+            cost = estimate_tokens(message.get("content"))
+            if selected and cost > budget:
+                break
+            selected.append(message)
+            budget -= cost
+        selected.reverse()
+        return prefix + selected
+
+    # --- serialization ---
+    def to_dict(self) -> Dict:
+        """Plain-data form for session stores (see utils/session_store.py)"""
+        return {
+            "messages": list(self._buffer),
+            "summary": list(self._summary_lines),
+            "total_appended": self.total_appended,
+            "max_messages": self._buffer.maxlen,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ConversationContext":
+        context = cls(max_messages=data.get("max_messages", MAX_MESSAGES))
+        context._buffer.extend(data.get("messages", ()))
+        for line in data.get("summary", ()):
+            context._summary_lines.append(line)
+            context._summary_tokens += estimate_tokens(line)
+        context.total_appended = data.get("total_appended", len(context._buffer))
+        return context
+
+    def memory_chars(self) -> int:
+        """Characters held for this session (buffer + summary)"""
+        return sum(len(m.get("content") or "") for m in self._buffer) + len(self.summary)
+
+
+def recent_context(history, max_tokens: int) -> List[Dict[str, str]]:
+    """recent() for either a ConversationContext or a plain message list"""
+    if not isinstance(history, ConversationContext):
+        history = ConversationContext(history, max_messages=max(len(history), 1))
+    return history.recent(max_tokens)
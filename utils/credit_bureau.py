@@ -0,0 +1,249 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from utils.mock_data import get_customer_data
+
+# Bureau endpoint, e.g. http://localhost:8081 for stub_bureau.py; unset reads the
+# scores in the customer database (the demo behaviour)
+BUREAU_URL = os.getenv("CREDIT_BUREAU_URL", "")
+BUREAU_NAME = "CIBIL"
+# Demo only: MockBureau's score for phones without one in the customer database
+# (customers onboarded in the chat). A real bureau's "no record" is not a score.
+DEMO_DEFAULT_SCORE = 700
+
+# Connection pool and request settings for the HTTP bureau
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 60.0
+TIMEOUT_SECONDS = 5.0
+BULK_BATCH_SIZE = 100
+
+# A report is reused until it is this many days past its report_date
+REPORT_VALIDITY_DAYS = int(os.getenv("CREDIT_REPORT_VALIDITY_DAYS", "30"))
+# "No record" answers are re-checked sooner
+NOT_FOUND_TTL_SECONDS = 300
+MAX_CACHED_REPORTS = 10000
+
+
+class BureauError(Exception):
+    """The bureau could not be reached or answered with an error"""
+
+
+class BureauClient:
+    """
+    Source of credit reports, keyed by phone. A report is a dict with
+    phone, score, bureau, max_score and report_date (ISO date); None means
+    the bureau has no record.
+    """
+
+    def pull(self, phone: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def pull_many(self, phones: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        return {phone: self.pull(phone) for phone in phones}
+
+    def close(self):
+        pass
+
+
+class MockBureau(BureauClient):
+    """
+    Scores from the customer database, reported as pulled today; phones
+    without one get DEMO_DEFAULT_SCORE
+    """
+
+    def pull(self, phone: str) -> Optional[Dict[str, Any]]:
+        customer = get_customer_data(phone) or {}
+        return {
+            "phone": customer.get("phone", phone),
+            "score": customer.get("credit_score", DEMO_DEFAULT_SCORE),
+            "bureau": BUREAU_NAME,
+            "max_score": 900,
+            "report_date": date.today().isoformat(),
+        }
+
+
+class HTTPBureau(BureauClient):
+    """
+    Bureau behind an HTTP API (GET /reports/<phone>, POST /reports/bulk).
+    One pooled keep-alive client is shared by every caller; httpx.Client is
+    thread-safe.
+    """
+
+    def __init__(self, base_url: str, timeout: float = TIMEOUT_SECONDS):
+        self.base_url = base_url.rstrip("/")
+        self.client = httpx.Client(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    def pull(self, phone: str) -> Optional[Dict[str, Any]]:
+        try:
+            response = self.client.get(f"/reports/{phone}")
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            report = response.json()
+            if not isinstance(report, dict) or "score" not in report:
+                raise ValueError(f"unexpected report {response.text[:100]!r}")
+            return report
+        except (httpx.HTTPError, ValueError) as e:
+            raise BureauError(f"report for {phone}: {e}") from e
+
+    def pull_many(self, phones: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        reports: Dict[str, Optional[Dict[str, Any]]] = {}
+        for start in range(0, len(phones), BULK_BATCH_SIZE):
+            batch = phones[start:start + BULK_BATCH_SIZE]
+            try:
+                response = self.client.post("/reports/bulk", json={"phones": batch})
+                response.raise_for_status()
+                found = response.json()["reports"]
+            except (httpx.HTTPError, ValueError, KeyError) as e:
+                raise BureauError(f"bulk pull of {len(batch)} reports: {e}") from e
+            reports.update({phone: found.get(phone) for phone in batch})
+        return reports
+
+    def close(self):
+        self.client.close()
+
+
+def report_expiry(report: Optional[Dict[str, Any]], now: float) -> float:
+    """When a cached report stops being served (time.time() seconds)"""
+    if report is None:
+        return now + NOT_FOUND_TTL_SECONDS
+    try:
+        pulled = datetime.fromisoformat(report["report_date"])
+    except (KeyError, TypeError, ValueError):
+        # Undated reports are not cached
+        return now
+    return (pulled + timedelta(days=REPORT_VALIDITY_DAYS)).timestamp()
+
+
+class CachedBureau(BureauClient):
+    """
+    Per-phone report cache in front of a bureau client. A report is served
+    until REPORT_VALIDITY_DAYS after its report_date, so a customer checked
+    minutes earlier in another session is not pulled again. Concurrent pulls
+    for the same phone share one bureau call, and pull_many() sends only the
+    phones that are neither cached nor in flight, as one bulk request.
+    """
+
+    def __init__(self, client: BureauClient, max_reports: int = MAX_CACHED_REPORTS,
+                 clock: Callable[[], float] = time.time):
+        self.client = client
+        self.max_reports = max_reports
+        self._clock = clock
+        self._reports: "OrderedDict[str, tuple]" = OrderedDict()  # phone -> (expires_at, report)
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._bulk_calls = 0
+        self._errors = 0
+
+    def pull(self, phone: str) -> Optional[Dict[str, Any]]:
+        return self.pull_many([phone])[phone]
+
+    def pull_many(self, phones: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        waiting: Dict[str, Future] = {}
+        claimed: Dict[str, Future] = {}
+        now = self._clock()
+        with self._lock:
+            for phone in dict.fromkeys(phones):
+                entry = self._reports.get(phone)
+                if entry is not None and entry[0] > now:
+                    self._reports.move_to_end(phone)
+                    self._hits += 1
+                    results[phone] = entry[1]
+                elif phone in self._inflight:
+                    self._coalesced += 1
+                    waiting[phone] = self._inflight[phone]
+                else:
+                    self._misses += 1
+                    claimed[phone] = self._inflight[phone] = Future()
+
+        if claimed:
+            self._fetch(claimed)
+        for phone, future in {**claimed, **waiting}.items():
+            results[phone] = future.result()
+        return {phone: _copy(results[phone]) for phone in phones}
+
+    def _fetch(self, claimed: Dict[str, Future]):
+        phones = list(claimed)
+        try:
+            if len(phones) == 1:
+                reports = {phones[0]: self.client.pull(phones[0])}
+            else:
+                reports = self.client.pull_many(phones)
+                with self._lock:
+                    self._bulk_calls += 1
+        except Exception as e:
+            with self._lock:
+                self._errors += 1
+                for phone in phones:
+                    self._inflight.pop(phone, None)
+            for future in claimed.values():
+                future.set_exception(e)
+            return
+
+        now = self._clock()
+        with self._lock:
+            for phone in phones:
+                report = reports.get(phone)
+                expires = report_expiry(report, now)
+                if expires > now:
+                    self._reports[phone] = (expires, report)
+                    self._reports.move_to_end(phone)
+                self._inflight.pop(phone, None)
+            while len(self._reports) > self.max_reports:
+                self._reports.popitem(last=False)
+        for phone, future in claimed.items():
+            future.set_result(reports.get(phone))
+
+    def invalidate(self, phones: Iterable[str]):
+        with self._lock:
+            for phone in phones:
+                self._reports.pop(phone, None)
+
+    def close(self):
+        self.client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses + self._coalesced
+            return {
+                "cached_reports": len(self._reports),
+                "hits": self._hits,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+                "bulk_calls": self._bulk_calls,
+                "errors": self._errors,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+            }
+
+
+def _copy(report: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    return dict(report) if report is not None else None
+
+
+def default_bureau() -> CachedBureau:
+    client = HTTPBureau(BUREAU_URL) if BUREAU_URL else MockBureau()
+    return CachedBureau(client)
+
+
+# Shared by every session in the process
+CREDIT_BUREAU = default_bureau()
@@ -0,0 +1,187 @@
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Any, Optional
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+
+# A match is answered locally only when it clears all three bars
+MIN_SCORE = 2.0        # absolute BM25 score
+MIN_COVERAGE = 0.75    # fraction of query terms found in the matched entry
+MIN_MARGIN = 1.25      # best score / runner-up score
+
+# Used for the latency-saved estimate until real LLM timings are available
+ESTIMATED_LLM_LATENCY_MS = 1500.0
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "am", "do", "does", "did",
+    "i", "me", "my", "mine", "we", "our", "you", "your", "it", "its", "this", "that",
+    "what", "which", "who", "whom", "how", "when", "where", "why", "can", "could", "will",
+    "would", "should", "shall", "may", "might", "must", "to", "of", "in", "on", "for",
+    "at", "by", "with", "from", "about", "and", "or", "if", "there", "any", "get", "please",
+    "tell", "know", "want", "need", "us", "so", "just", "also", "then", "than", "as",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords, with plural 's' stripped"""
+    tokens = []
+    for word in re.findall(r"[a-z0-9]+", (text or "").lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def load_faq_corpus() -> List[Dict[str, Any]]:
+    """Load curated FAQ entries from faq_data.json"""
+    try:
+        json_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'faq_data.json')
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)["faqs"]
+    except FileNotFoundError:
+        print("Warning: faq_data.json not found. FAQ answers disabled.")
+        return []
+    except Exception as e:
+        print(f"Error loading FAQ data: {e}. FAQ answers disabled.")
+        return []
+
+
+class FAQIndex:
+    """
+    In-memory BM25 index over the curated FAQ corpus.
+    Each FAQ entry (all its question variants + keywords) is one document.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.entries = entries
+        self._doc_terms: List[Counter] = []
+        self._doc_lengths: List[int] = []
+        self._single_keywords: List[set] = []
+        self._postings: Dict[str, List[int]] = {}
+
+        for i, entry in enumerate(entries):
+            text = " ".join(entry.get("questions", []) + entry.get("keywords", []))
+            terms = Counter(tokenize(text))
+            self._doc_terms.append(terms)
+            self._doc_lengths.append(sum(terms.values()))
+            self._single_keywords.append({t for kw in entry.get("keywords", []) for t in tokenize(kw) if " " not in kw})
+            for term in terms:
+                self._postings.setdefault(term, []).append(i)
+
+        n_docs = len(entries)
+        self._avg_length = (sum(self._doc_lengths) / n_docs) if n_docs else 0.0
+        self._idf = {
+            term: math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self._postings.items()
+        }
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._lookup_seconds = 0.0
+
+    def search(self, query: str, top_k: int = 2) -> List[Dict[str, Any]]:
+        """Return the top_k entries as {"entry", "score", "coverage"}"""
+        query_terms = tokenize(query)
+        if not query_terms:
+            return []
+
+        scores: Dict[int, float] = {}
+        for term in set(query_terms):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for doc in self._postings[term]:
+                tf = self._doc_terms[doc][term]
+                norm = K1 * (1 - B + B * self._doc_lengths[doc] / self._avg_length)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:top_k]
+        unique_terms = set(query_terms)
+        return [
+            {
+                "entry": self.entries[doc],
+                "index": doc,
+                "score": score,
+                "coverage": len(unique_terms & self._doc_terms[doc].keys()) / len(unique_terms),
+                "query_terms": unique_terms,
+            }
+            for doc, score in ranked
+        ]
+
+    def answer(self, question: str) -> Optional[str]:
+        """Return the FAQ answer for a confident match, otherwise None"""
+        start = time.perf_counter()
+        results = self.search(question)
+        answer = None
+        if results and self._is_confident(results):
+            answer = results[0]["entry"]["answer"]
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._lookup_seconds += elapsed
+            if answer:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return answer
+
+    def _is_confident(self, results: List[Dict[str, Any]]) -> bool:
+        best = results[0]
+        if best["score"] < MIN_SCORE or best["coverage"] < MIN_COVERAGE:
+            return False
+        if len(results) > 1 and best["score"] < MIN_MARGIN * results[1]["score"]:
+            return False
+        # A one-word question must hit one of the entry's own keywords
+        if len(best["query_terms"]) == 1:
+            return bool(best["query_terms"] & self._single_keywords[best["index"]])
+        return True
+
+    def stats(self, llm_latency_ms: Optional[float] = None) -> Dict[str, Any]:
+        """Hit rate, mean lookup time and estimated LLM latency saved"""
+        llm_latency_ms = llm_latency_ms or ESTIMATED_LLM_LATENCY_MS
+        with self._lock:
+            lookups = self.hits + self.misses
+            mean_lookup_us = (self._lookup_seconds / lookups * 1_000_000) if lookups else 0.0
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "llm_fallbacks": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "mean_lookup_us": round(mean_lookup_us, 1),
+                "estimated_latency_saved_ms": round(self.hits * (llm_latency_ms - mean_lookup_us / 1000), 1),
+            }
+
+
+# Build the index on module import
+FAQ_INDEX = FAQIndex(load_faq_corpus())
+
+
+# Test function
+if __name__ == "__main__":
+    questions = [
+        "What is prepayment?",
+        "prepayment",
+        "secured vs unsecured",
+        "What happens if I miss an EMI?",
+        "When will I get the money?",
+        "how long is my sanction letter valid",
+        "What is my EMI?",
+        "Can you reduce my interest rate?",
+        "What's the weather like?",
+    ]
+    for q in questions:
+        top = FAQ_INDEX.search(q, top_k=1)
+        best = f"{top[0]['entry']['id']} ({top[0]['score']:.2f}, cov {top[0]['coverage']:.2f})" if top else "-"
+        answer = FAQ_INDEX.answer(q)
+        print(f"{'HIT ' if answer else 'MISS'} {q!r:45} -> {best}")
+    print(FAQ_INDEX.stats())
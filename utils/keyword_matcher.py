@@ -0,0 +1,142 @@
+import re
+from typing import Dict, List, Set, Tuple, FrozenSet, Optional
+
+# --- SHARED KEYWORD SETS ---
+# Keywords match whole words by default; a trailing "*" allows any word ending
+# ("year*" matches "years"). Punctuation such as "?" or "@" is its own token.
+# Order matters where callers pick the first label of a group (purpose, collateral).
+INTENT_KEYWORDS: Dict[str, List[str]] = {
+    # Yes / No replies
+    "affirmative": [
+        "yes*", "yep", "ya", "yeah", "yea", "yup", "y", "sure", "ok*", "alright", "proceed*", "accept*",
+        "correct", "confirm*", "go ahead",
+    ],
+    "negative": ["no", "n", "nope", "nah", "cancel*", "stop", "incorrect", "wrong"],
+
+    # Verification stage
+    "loan_field": ["purpose", "amount", "tenure", "year*", "month*", "lacs", "lakh*"],
+    "change_request": ["change*", "update*", "modif*", "wrong"],
+    "field:address": ["address"],
+    "field:name": ["name"],
+    "field:email": ["email", "e-mail", "@"],
+    "field:phone": ["phone*", "mobile*", "number"],
+
+    # Loan purpose (SalesAgent._extract_purpose)
+    "purpose:business": ["business*", "startup*", "venture*", "shop*", "expansion"],
+    "purpose:wedding": ["wedding*", "marriage*", "shaadi", "function*"],
+    "purpose:medical": ["medical", "health", "hospital*", "surger*", "treatment*"],
+    "purpose:education": ["education", "study", "studies", "college*", "fees", "school*"],
+    "purpose:travel": ["travel*", "vacation*", "holiday*", "trip*"],
+    "purpose:renovation": ["renovate", "renovation", "repair*", "construction", "interior*"],
+    "purpose:debt": ["debt*", "loan*", "card*", "pay off"],
+    "purpose:vehicle": ["car", "cars", "bike*", "vehicle*", "scooter*"],
+    "purpose:personal": ["personal", "urgent*", "need*"],
+
+    # Collateral type (offer_book.parse_collateral)
+    "collateral:fd": ["fixed deposit*", "fd", "fds", "deposit*"],
+    "collateral:property": ["property", "properties", "flat*", "house*", "villa*", "apartment*", "shop*", "bhk", "residential"],
+    "collateral:vehicle": ["vehicle*", "car", "cars", "bike*", "scooter*"],
+    "collateral:gold": ["gold", "jewelry", "jewellery"],
+    "collateral:stocks": ["mutual fund*", "mf", "stock*", "share*"],
+
+    # SalesAgent fast path: the user is asking or negotiating, not just answering
+    "off_script": [
+        "?", "what", "why", "how", "which", "can i", "can you", "could you", "should",
+        "interest", "rate*", "emi*", "secured", "collateral", "eligible", "limit*",
+        "fee*", "charge*", "document*", "help", "explain", "difference", "compare",
+    ],
+
+    # Post-completion Q&A: a question is answered without the customer's history
+    # (and shared through the response cache) only if it names a general loan
+    # topic and has no words pointing at the customer or at earlier turns
+    "generic_topic": [
+        "prepay*", "pre-pay*", "part payment*", "part-payment*", "foreclos*", "emi", "emis",
+        "interest rate*", "apr", "secured", "unsecured", "collateral", "cibil", "credit score*",
+        "processing fee*", "late fee*", "penalt*", "bounce", "noc", "no objection", "moratorium",
+        "floating rate*", "fixed rate*", "nach", "ecs", "auto debit", "kyc", "top up", "top-up",
+        "balance transfer", "co-applicant*", "guarantor*", "sanction letter*", "disburs*",
+        "amortization", "amortisation", "principal", "tenure",
+    ],
+    "context_reference": [
+        "i", "me", "my", "mine", "we", "us", "our", "it", "its", "this", "that", "these", "those",
+        "they", "them", "their", "he", "she", "his", "her", "why",
+    ],
+}
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern keyword matcher over word tokens (a token-level trie, in the
+    spirit of Aho-Corasick). classify() tokenizes a message once and returns
+    every label with a keyword in it. Matching whole tokens gives word-boundary
+    awareness for free; per-token results are memoized, so repeat vocabulary
+    costs one dict lookup.
+    """
+
+    TOKEN_RE = re.compile(r"[a-z]+|[0-9]+|[^\sa-z0-9]")
+    MEMO_LIMIT = 50000
+
+    def __init__(self, keyword_sets: Dict[str, List[str]]):
+        self.labels = list(keyword_sets)
+        self._words: Dict[str, Set[str]] = {}        # exact single-token keywords
+        self._prefixes: Dict[str, Set[str]] = {}     # single-token "word*" keywords
+        self._prefix_lengths: List[int] = []
+        # Multi-token phrases, keyed by first token: (rest tokens, last is prefix, label)
+        self._phrases: Dict[str, List[Tuple[Tuple[str, ...], bool, str]]] = {}
+        self._memo: Dict[str, FrozenSet[str]] = {}
+
+        for label, keywords in keyword_sets.items():
+            for keyword in keywords:
+                prefix = keyword.endswith("*")
+                tokens = self.TOKEN_RE.findall(keyword.rstrip("*").lower())
+                if len(tokens) > 1:
+                    self._phrases.setdefault(tokens[0], []).append((tuple(tokens[1:]), prefix, label))
+                elif prefix:
+                    self._prefixes.setdefault(tokens[0], set()).add(label)
+                else:
+                    self._words.setdefault(tokens[0], set()).add(label)
+        self._prefix_lengths = sorted({len(p) for p in self._prefixes})
+
+    def _token_labels(self, token: str) -> FrozenSet[str]:
+        labels = self._memo.get(token)
+        if labels is None:
+            found = set(self._words.get(token, ()))
+            for size in self._prefix_lengths:
+                if size > len(token):
+                    break
+                found.update(self._prefixes.get(token[:size], ()))
+            labels = frozenset(found)
+            if len(self._memo) < self.MEMO_LIMIT:
+                self._memo[token] = labels
+        return labels
+
+    def classify(self, text: str) -> Set[str]:
+        """Return the set of labels that have at least one keyword in text"""
+        tokens = self.TOKEN_RE.findall(text.lower())
+        memo = self._memo
+        found = set().union(*[memo[t] if t in memo else self._token_labels(t) for t in tokens])
+
+        phrases = self._phrases
+        for i, token in enumerate(tokens):
+            if token not in phrases:
+                continue
+            for rest, prefix, label in phrases[token]:
+                end = i + 1 + len(rest)
+                if end > len(tokens) or tuple(tokens[i + 1:end - 1]) != rest[:-1]:
+                    continue
+                last = tokens[end - 1]
+                if last == rest[-1] or (prefix and last.startswith(rest[-1])):
+                    found.add(label)
+        return found
+
+    def first_of(self, labels: Set[str], prefix: str) -> Optional[str]:
+        """First label (in registry order) starting with prefix, without the prefix"""
+        for label in self.labels:
+            if label.startswith(prefix) and label in labels:
+                return label[len(prefix):]
+        return None
+
+
+# Built once at import, shared by every session
+INTENT_MATCHER = KeywordMatcher(INTENT_KEYWORDS)
+
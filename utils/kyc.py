@@ -0,0 +1,199 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+# KYC verification service, e.g. http://localhost:8082 for stub_kyc.py; unset
+# runs the demo rules in process
+KYC_SERVICE_URL = os.getenv("KYC_SERVICE_URL", "")
+# Per-check deadline: a check still running after this is reported as pending
+KYC_DEADLINE_SECONDS = float(os.getenv("KYC_DEADLINE_SECONDS", "3"))
+KYC_WORKERS = 16
+
+PASSED, FAILED, TIMED_OUT, ERROR = "passed", "failed", "timeout", "error"
+
+# Shared by every session in the process
+KYC_EXECUTOR = ThreadPoolExecutor(max_workers=KYC_WORKERS, thread_name_prefix="kyc")
+
+
+# --- Demo rules (also served by stub_kyc.py) ---
+def phone_rule(subject: Dict[str, Any]) -> bool:
+    return len(re.sub(r"\D", "", str(subject.get("phone", "")))) >= 10
+
+
+def address_rule(subject: Dict[str, Any]) -> bool:
+    # VerificationAgent.verify_address
+    return len(str(subject.get("address", ""))) > 10
+
+
+def identity_rule(subject: Dict[str, Any]) -> bool:
+    return len(str(subject.get("name", "")).strip()) > 2 and "@" in str(subject.get("email", ""))
+
+
+class KYCCheck:
+    """
+    One verification call. `fields` are the customer fields it reads: the
+    call gets only those, and a cached outcome is reused until one of them
+    changes.
+    """
+
+    def __init__(self, name: str, fields: Tuple[str, ...], deadline: float = KYC_DEADLINE_SECONDS):
+        self.name = name
+        self.fields = fields
+        self.deadline = deadline
+
+    def subject(self, customer: Dict[str, Any]) -> Dict[str, Any]:
+        return {field: customer.get(field) for field in self.fields}
+
+    def cache_key(self, customer: Dict[str, Any]) -> Tuple:
+        return (self.name,) + tuple(str(customer.get(field)) for field in self.fields)
+
+    def run(self, subject: Dict[str, Any]) -> bool:
+        raise NotImplementedError
+
+
+class LocalCheck(KYCCheck):
+    def __init__(self, name: str, fields: Tuple[str, ...], rule: Callable[[Dict[str, Any]], bool],
+                 deadline: float = KYC_DEADLINE_SECONDS):
+        super().__init__(name, fields, deadline)
+        self.rule = rule
+
+    def run(self, subject: Dict[str, Any]) -> bool:
+        return self.rule(subject)
+
+
+class HTTPCheck(KYCCheck):
+    """POST <base_url>/verify/<name> with the subject; the service answers {"verified": bool}"""
+
+    def __init__(self, name: str, fields: Tuple[str, ...], base_url: str, client: httpx.Client,
+                 deadline: float = KYC_DEADLINE_SECONDS):
+        super().__init__(name, fields, deadline)
+        self.url = f"{base_url.rstrip('/')}/verify/{name}"
+        self.client = client
+
+    def run(self, subject: Dict[str, Any]) -> bool:
+        # The request gives up at the deadline too, so abandoned calls do not pile up
+        response = self.client.post(self.url, json=subject, timeout=self.deadline)
+        response.raise_for_status()
+        return bool(response.json()["verified"])
+
+
+CHECK_SPECS = [
+    ("phone", ("phone",), phone_rule),
+    ("address", ("address",), address_rule),
+    ("identity", ("name", "email"), identity_rule),
+]
+
+
+def default_checks(base_url: str = KYC_SERVICE_URL) -> List[KYCCheck]:
+    if not base_url:
+        return [LocalCheck(name, fields, rule) for name, fields, rule in CHECK_SPECS]
+    client = httpx.Client(limits=httpx.Limits(max_connections=KYC_WORKERS, max_keepalive_connections=KYC_WORKERS))
+    return [HTTPCheck(name, fields, base_url, client) for name, fields, _ in CHECK_SPECS]
+
+
+class KYCStats:
+    """Process-wide outcome counts per check, and how long verification turns waited"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checks: Dict[str, Dict[str, int]] = {}
+        self._runs = 0
+        self._wait_seconds = 0.0
+
+    def record(self, outcomes: Dict[str, str], cached: List[str], waited: float):
+        with self._lock:
+            self._runs += 1
+            self._wait_seconds += waited
+            for name, outcome in outcomes.items():
+                row = self._checks.setdefault(name, dict.fromkeys((PASSED, FAILED, TIMED_OUT, ERROR, "cached"), 0))
+                row["cached" if name in cached else outcome] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "runs": self._runs,
+                "mean_wait_ms": round(self._wait_seconds / self._runs * 1000, 1) if self._runs else None,
+                "checks": {name: dict(row) for name, row in self._checks.items()},
+            }
+
+
+kyc_stats = KYCStats()
+
+
+class KYCOrchestrator:
+    """
+    Runs the KYC checks concurrently, each against its own deadline, so a
+    verification turn takes as long as the slowest check rather than their
+    sum. Checks that time out or error are reported as pending instead of
+    failing the customer; passed and failed outcomes go into the caller's
+    cache (one per session) and are not re-run while the fields they read
+    are unchanged.
+    """
+
+    def __init__(self, checks: Optional[List[KYCCheck]] = None, executor: ThreadPoolExecutor = KYC_EXECUTOR,
+                 stats: KYCStats = kyc_stats):
+        self.checks = checks if checks is not None else default_checks()
+        self.executor = executor
+        self.stats = stats
+
+    def subject(self, customer: Dict[str, Any]) -> Dict[str, Any]:
+        """The customer fields any check reads"""
+        return {field: customer.get(field) for check in self.checks for field in check.fields}
+
+    def verify(self, customer: Dict[str, Any], cache: Optional[Dict[Tuple, str]] = None) -> Dict[str, Any]:
+        start = time.monotonic()
+        outcomes: Dict[str, str] = {}
+        cached: List[str] = []
+        running = []
+        for check in self.checks:
+            key = check.cache_key(customer)
+            if cache is not None and key in cache:
+                outcomes[check.name] = cache[key]
+                cached.append(check.name)
+            else:
+                running.append((check, key, self.executor.submit(check.run, check.subject(customer))))
+
+        for check, key, future in running:
+            try:
+                passed = future.result(timeout=max(0.0, check.deadline - (time.monotonic() - start)))
+                outcomes[check.name] = PASSED if passed else FAILED
+            except FutureTimeout:
+                future.cancel()
+                outcomes[check.name] = TIMED_OUT
+            except Exception as e:
+                print(f"⚠️ KYC {check.name} check failed: {e}")
+                outcomes[check.name] = ERROR
+            if cache is not None and outcomes[check.name] in (PASSED, FAILED):
+                cache[key] = outcomes[check.name]
+
+        elapsed = time.monotonic() - start
+        self.stats.record(outcomes, cached, elapsed)
+        return self._result(outcomes, elapsed)
+
+    @staticmethod
+    def _result(outcomes: Dict[str, str], elapsed: float) -> Dict[str, Any]:
+        failed = [name for name, outcome in outcomes.items() if outcome == FAILED]
+        pending = [name for name, outcome in outcomes.items() if outcome in (TIMED_OUT, ERROR)]
+        verified = not failed and not pending
+        checks = {f"{name}_verified": outcome == PASSED for name, outcome in outcomes.items()}
+        checks["overall_verified"] = verified
+        if verified:
+            message = "Verification successful"
+        elif failed:
+            message = f"Verification failed: {', '.join(failed)}"
+        else:
+            message = f"Verification pending: {', '.join(pending)}"
+        return {
+            "verified": verified,
+            "checks": checks,
+            "outcomes": outcomes,
+            "failed": failed,
+            "pending": pending,
+            "message": message,
+            "elapsed_ms": round(elapsed * 1000, 1),
+        }
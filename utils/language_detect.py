@@ -0,0 +1,116 @@
+import threading
+import time
+from typing import Dict, Any, Optional
+
+# langdetect is optional: without it, Latin-script text is simply left undetected
+try:
+    from langdetect import DetectorFactory, detect_langs
+    DetectorFactory.seed = 0  # deterministic results
+except ImportError:
+    detect_langs = None
+
+# Unicode blocks are 128 code points wide, so `ord(ch) >> 7` identifies the script
+SCRIPT_BLOCKS = {
+    0x0900 >> 7: "devanagari",
+    0x0980 >> 7: "bengali",
+    0x0A80 >> 7: "gujarati",
+    0x0B80 >> 7: "tamil",
+    0x0C00 >> 7: "telugu",
+}
+
+SCRIPT_LANGUAGES = {
+    "bengali": "bn",
+    "gujarati": "gu",
+    "tamil": "ta",
+    "telugu": "te",
+}
+
+# Devanagari is shared by Hindi and Marathi; these common words tell them apart
+MARATHI_MARKERS = {"आहे", "आहेत", "मला", "मी", "तुम्ही", "तुमचा", "तुमची", "आणि", "नाही", "पाहिजे", "करायचे", "हवे", "साठी"}
+HINDI_MARKERS = {"है", "हैं", "हूँ", "हूं", "मुझे", "मैं", "आप", "और", "नहीं", "चाहिए", "करना", "के", "लिए"}
+
+# Latin text shorter than this (phone numbers, "yes", "ok") is not classified
+MIN_LATIN_LETTERS = 12
+# Statistical detector must be at least this sure
+MIN_CONFIDENCE = 0.9
+
+
+class LanguageDetector:
+    """
+    Script-first language detection.
+    Indic scripts are recognised by Unicode block in a single pass over the
+    text; the statistical detector (langdetect) is only consulted for longer
+    Latin-script text, and only confident results are returned.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.script_hits = 0
+        self.statistical_calls = 0
+        self.undetected = 0
+        self._statistical_seconds = 0.0
+
+    def detect(self, text: str) -> Optional[str]:
+        """ISO 639-1 code, or None when the text is too short or ambiguous"""
+        counts: Dict[str, int] = {}
+        latin = 0
+        for ch in text or "":
+            script = SCRIPT_BLOCKS.get(ord(ch) >> 7)
+            if script:
+                counts[script] = counts.get(script, 0) + 1
+            elif ch.isascii() and ch.isalpha():
+                latin += 1
+
+        if counts:
+            script = max(counts, key=counts.get)
+            if counts[script] >= latin:
+                with self._lock:
+                    self.script_hits += 1
+                return self._devanagari_language(text) if script == "devanagari" else SCRIPT_LANGUAGES[script]
+
+        if latin >= MIN_LATIN_LETTERS and detect_langs is not None:
+            return self._statistical(text)
+
+        with self._lock:
+            self.undetected += 1
+        return None
+
+    def _devanagari_language(self, text: str) -> str:
+        words = set(text.replace("?", " ").replace(".", " ").replace(",", " ").split())
+        return "mr" if len(words & MARATHI_MARKERS) > len(words & HINDI_MARKERS) else "hi"
+
+    def _statistical(self, text: str) -> Optional[str]:
+        start = time.perf_counter()
+        try:
+            candidates = detect_langs(text)
+        except Exception:
+            candidates = []
+        with self._lock:
+            self.statistical_calls += 1
+            self._statistical_seconds += time.perf_counter() - start
+            if candidates and candidates[0].prob >= MIN_CONFIDENCE:
+                return candidates[0].lang
+            self.undetected += 1
+        return None
+
+    def warm(self):
+        """Load langdetect's language profiles now rather than on the first user message"""
+        if detect_langs is not None:
+            try:
+                detect_langs("Warming up the language detector at startup")
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "script_hits": self.script_hits,
+                "statistical_calls": self.statistical_calls,
+                "undetected": self.undetected,
+                "mean_statistical_ms": round(self._statistical_seconds / self.statistical_calls * 1000, 2)
+                if self.statistical_calls else None,
+            }
+
+
+# Shared by every session in the process
+LANGUAGE_DETECTOR = LanguageDetector()
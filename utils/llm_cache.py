@@ -0,0 +1,173 @@
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Any, Optional, Callable
+
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+PERSIST_INTERVAL = 30.0  # seconds between disk writes
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation"""
+    text = re.sub(r"\s+", " ", (text or "").lower()).strip()
+    return text.rstrip("?!. ")
+
+
+def make_cache_key(messages: List[Dict[str, str]], model: str, **params) -> str:
+    """Stable key over normalized messages, model and generation parameters"""
+    payload = {
+        "model": model,
+        "params": {k: v for k, v in sorted(params.items()) if k != "timeout"},
+        "messages": [[m.get("role"), normalize_text(m.get("content"))] for m in messages],
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Bounded TTL + LRU cache for LLM responses.
+    Concurrent requests for the same key are collapsed into one in-flight call,
+    and entries can optionally be persisted to a JSON file across restarts.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, expires_at)
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_persist = clock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+        if self.path:
+            self._load()
+            atexit.register(self.persist)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (value, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._dirty = True
+            should_persist = self.path and self._clock() - self._last_persist > PERSIST_INTERVAL
+        if should_persist:
+            self.persist()
+
+    def get_or_compute(self, key: str, compute: Callable[[], str]) -> str:
+        """Return the cached value, or run compute() once for all concurrent callers"""
+        value = self.get(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = compute()
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        # Cache the value before retiring the in-flight entry, so a caller
+        # arriving in between finds one or the other and never recomputes
+        self.set(key, value)
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            }
+
+    # --- PERSISTENCE ---
+    def persist(self):
+        """Write live entries to disk (atomic replace)"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            now = self._clock()
+            data = {k: [v, exp] for k, (v, exp) in self._entries.items() if exp > now}
+            self._dirty = False
+            self._last_persist = now
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️ Could not persist LLM cache to {self.path}: {e}")
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not load LLM cache from {self.path}: {e}")
+            return
+        now = self._clock()
+        # Oldest expiry first, so LRU order roughly follows insertion age
+        for key, (value, expires_at) in sorted(data.items(), key=lambda kv: kv[1][1]):
+            if expires_at > now:
+                self._entries[key] = (value, expires_at)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import weakref
+from typing import Dict, List, Any, Optional, Iterator, AsyncIterator, Tuple
+
+import httpx
+from groq import Groq, AsyncGroq
+
+# Connection pool settings shared by every session in the process
+MAX_CONNECTIONS = 50
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 60.0  # seconds an idle connection is kept open
+DEFAULT_TIMEOUT = 30.0   # seconds, used when a call does not pass its own
+# Retries with backoff on connection errors, 408/409/429 and 5xx (done by the Groq client)
+MAX_RETRIES = 2
+
+DEFAULT_MODEL = "openai/gpt-oss-120b"
+
+
+class LLMGateway:
+    """
+    Process-wide gateway for Groq chat completions.
+    One pooled keep-alive HTTP client is shared by all sessions, so a worker
+    does not open new connections per conversation. Offers sync and async calls.
+    """
+
+    def __init__(self, api_key: str, transport: Optional[httpx.BaseTransport] = None):
+        self.api_key = api_key
+        self._limits = httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+        # httpx.Client is thread-safe, so Flask worker threads share it;
+        # transport replaces the network for the sync client (tests)
+        self.client = Groq(
+            api_key=api_key,
+            timeout=DEFAULT_TIMEOUT,
+            max_retries=MAX_RETRIES,
+            http_client=httpx.Client(limits=self._limits, timeout=DEFAULT_TIMEOUT, transport=transport),
+        )
+        # httpx.AsyncClient is bound to the event loop that first uses it
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _get_async_client(self) -> AsyncGroq:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = AsyncGroq(
+                    api_key=self.api_key,
+                    timeout=DEFAULT_TIMEOUT,
+                    max_retries=MAX_RETRIES,
+                    http_client=httpx.AsyncClient(limits=self._limits, timeout=DEFAULT_TIMEOUT),
+                )
+                self._async_clients[loop] = client
+            return client
+
+    @staticmethod
+    def _build_kwargs(
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        timeout: Optional[float],
+    ) -> Dict[str, Any]:
+        kwargs = {"model": model, "messages": messages}
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        return kwargs
+
+    def complete(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = DEFAULT_MODEL,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """Blocking chat completion. Returns the stripped assistant text."""
+        text, _ = self.complete_with_usage(messages, model, temperature, max_tokens, timeout)
+        return text
+
+    def complete_with_usage(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = DEFAULT_MODEL,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[str, Dict[str, int]]:
+        """Like complete(), but also returns prompt/completion token counts"""
+        response = self.client.chat.completions.create(
+            **self._build_kwargs(messages, model, temperature, max_tokens, timeout)
+        )
+        return (response.choices[0].message.content or "").strip(), self._usage(response)
+
+    @staticmethod
+    def _usage(response: Any) -> Dict[str, int]:
+        usage = getattr(response, "usage", None)
+        return {
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        }
+
+    async def acomplete(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = DEFAULT_MODEL,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """Async chat completion. Many of these can be in flight on one loop."""
+        client = self._get_async_client()
+        response = await client.chat.completions.create(
+            **self._build_kwargs(messages, model, temperature, max_tokens, timeout)
+        )
+        return (response.choices[0].message.content or "").strip()
+
+    def stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = DEFAULT_MODEL,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[str]:
+        """Blocking streamed completion. Yields text deltas as they arrive."""
+        response = self.client.chat.completions.create(
+            stream=True,
+            **self._build_kwargs(messages, model, temperature, max_tokens, timeout)
+        )
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def astream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = DEFAULT_MODEL,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """Async streamed completion. Yields text deltas as they arrive."""
+        client = self._get_async_client()
+        response = await client.chat.completions.create(
+            stream=True,
+            **self._build_kwargs(messages, model, temperature, max_tokens, timeout)
+        )
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+# --- PROCESS-WIDE REGISTRY ---
+_gateways: Dict[str, LLMGateway] = {}
+_registry_lock = threading.Lock()
+
+
+def get_llm_gateway(api_key: str) -> LLMGateway:
+    """Return the shared gateway for this API key, creating it on first use"""
+    with _registry_lock:
+        gateway = _gateways.get(api_key)
+        if gateway is None:
+            gateway = LLMGateway(api_key)
+            _gateways[api_key] = gateway
+        return gateway
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import os
+import re
+import sys
+from typing import Dict, List, Any, Optional, Callable, Union
+
+# Languages shipped pre-translated in message_catalog.json
+CATALOG_LANGUAGES = ["hi", "ta", "te", "bn", "mr", "gu"]
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "message_catalog.json")
+
+# --- ENGLISH SOURCE TEMPLATES ---
+# str.format templates; run `python -m utils.message_catalog` after editing to
+# translate new or changed entries into message_catalog.json.
+MESSAGES: Dict[str, str] = {
+    # Initial stage / onboarding
+    "profile_found": "Thank you. I found an existing profile linked to this number.\n\nMay I access your profile information to provide you with personalized loan offers?\n\nPlease reply with Yes or No.",
+    "profile_not_found": "I couldn't find your profile in our system. No worries, let me collect your details.\n\nWhat is your full name?",
+    "invalid_phone": "I didn't catch a valid phone number. Could you please provide your 10-digit mobile number?",
+    "ask_city": "Great. What is your city?",
+    "ask_address": "Perfect. What is your complete address?",
+    "ask_email": "Thank you. What is your email address?",
+    "ask_income": "Thanks. What is your monthly income (in rupees)?",
+    "ask_collateral": "Great. One last question:\n\nDo you have any collateral that you would like to use for a secured loan? This could be Property, Vehicle, Gold, or Fixed Deposits.\n\nPlease provide details like '3BHK worth 30 lakhs' or 'Honda City Car'.\n(Or simply type 'none' if you don't have collateral)",
+    "invalid_income": "I didn't catch a valid amount. Please type your monthly income (e.g., 50000).",
+    "conversation_ended": "Our conversation has ended. If you'd like to start over, please type 'restart'.",
+    "something_wrong": "I'm sorry, something went wrong. Let me restart our conversation.",
+
+    # Verification
+    "verification_summary": "Perfect. Let me summarize your request:\n- Amount: Rs. {amount:,}\n- Purpose: {purpose}\n- Tenure: {tenure} months\n- EMI: Rs. {emi:,}\n\nFor security, I need to verify your details:\n- Name: {name}\n- Phone: {phone}\n- Address: {address}\n- Email: {email}\n\nIs this correct? (Yes/No)",
+    "update_loan_details": "Understood. Let's update your loan details.\n",
+    "details_updated_fields": "✅ Updated: {fields}. Let me re-verify:\n\n",
+    "details_updated": "Details updated. Let me re-verify...\n\n",
+    "profile_welcome": "Great. I found your profile, {name}.\n",
+    "pre_approved_limit_question": "You have a pre-approved limit of Rs. {limit:,}.\n\nCould you tell me how much loan amount you are looking for and for what purpose?",
+    "manual_entry": "No problem. Let's enter your details manually. What is your full name?",
+    "checking_credit": "Thank you. Checking your credit profile now...",
+    "which_detail_incorrect": "Oh, I see. Which personal detail is incorrect? (Name, Phone, Address, or Email)",
+    "confirm_details": "Please confirm if your details are correct (Yes/No). Or say 'change amount' if you want to modify the loan.",
+    "kyc_failed": "I couldn't verify some of your details. Which detail is incorrect? (Name, Phone, Address, or Email)",
+    "kyc_pending": "Our verification service is taking longer than usual. Please reply Yes in a moment to try again.",
+
+    # Credit check / underwriting
+    "credit_score_low": "I have reviewed your profile. Your credit score is {score}, which is below our minimum for unsecured loans.",
+    "credit_score_ok": "Your credit score of {score} is strong. Evaluating eligibility...",
+    "credit_check_unavailable": "The credit bureau is not responding right now. Please send any message in a moment and I will check again.",
+    "credit_no_record": "The credit bureau has no credit history on record for you, so I can't offer an unsecured loan right now.",
+    "loan_approved": "Congratulations! Your loan is APPROVED.\n",
+    "salary_slip_needed": "We need to verify your income. Please upload your latest salary slip (type 'upload' or 'manual upload').",
+    "amount_exceeds_limit": "I have reviewed your application. The requested amount of Rs. {amount:,} exceeds our unsecured limits based on your profile.",
+
+    # Document upload
+    "upload_skipped": "No problem. Let's explore alternative options such as secured loans or adjusting the loan amount and tenure.",
+    "upload_unverified": "Unable to verify your income from the document. Please try uploading again by typing 'upload', or enter your income manually.",
+    "upload_approved": "✅ Document verified successfully!\n\nYour monthly income of ₹{income:,} qualifies for this loan.\nEMI-to-Income ratio: {ratio:.1f}%\n\n",
+    "upload_rejected": "❌ Based on your monthly income of ₹{income:,}, the EMI of ₹{emi:,.0f} would be {ratio:.1f}% of your income, which exceeds our 50% limit.\n\n",
+    "upload_prompt": "Please click the upload button (📎) to upload your salary slip, or type 'upload' (demo) or 'skip' to explore other options.",
+
+    # Rejection options
+    "rejection_options_secured": "Here are your options:\n1. Try a lower amount: Rs. {suggested:,} (Reply 'Option 1')\n2. Secured Loan: Get up to Rs. {max_loan:,} using your {collateral_type} (Reply 'Option 2')\n3. Accept Pre-approved: Rs. {pre_approved:,} (Reply 'Option 3')\n",
+    "rejection_options": "Here are your options:\n1. Try a lower amount: Rs. {suggested:,} (Reply 'Option 1')\n2. Accept Pre-approved: Rs. {pre_approved:,} (Reply 'Option 2')\n",
+    "retry_lower_amount": "Okay, let's try for Rs. {amount:,}. Re-evaluating...",
+    "pre_approved_processing": "Great. Processing your pre-approved loan of Rs. {amount:,}.\n",
+
+    # Secured loan
+    "secured_offer": "Perfect choice. Let me explain your Secured Loan option.\n\nCollateral: {description} (Value: Rs. {value:,})\n\nLoan Offer:\n- Maximum Amount: Rs. {max_amount:,}\n- Interest Rate: {rate}% p.a.\n- Tenure: Up to 10 years\n\nHow much would you like to borrow? (Max: Rs. {max_amount:,})",
+    "session_expired": "Session expired. Type 'restart'.",
+    "secured_amount_prompt": "Please specify an amount up to Rs. {max_amount:,}.",
+    "secured_amount_exceeds": "That exceeds the limit. Maximum allowed is Rs. {max_amount:,}. Would you like the maximum?",
+    "secured_approved": "Excellent. Your Secured Loan of Rs. {amount:,} is APPROVED.\n\nLoan Details:\n- Tenure: {tenure} months\n- Interest: {rate}%\n- EMI: Rs. {emi:,}\n\n",
+    "sanction_generated": "Sanction Letter Generated: {path}\n\nOur team will contact you shortly. Is there anything else you would like to know about your loan?",
+}
+
+PLACEHOLDER_RE = re.compile(r"\{[^{}]*\}")
+
+
+def _placeholders(template: str) -> List[str]:
+    return sorted(PLACEHOLDER_RE.findall(template))
+
+
+def source_hash(template: str) -> str:
+    return hashlib.sha1(template.encode("utf-8")).hexdigest()[:12]
+
+
+class CatalogText(str):
+    """
+    An English response that remembers which catalog templates (and params)
+    it was built from. Behaves as a plain str; concatenating with other
+    strings keeps the parts so the whole reply can be localized piecewise.
+    """
+
+    def __new__(cls, parts: List[Union[str, tuple]]):
+        text = "".join(p if isinstance(p, str) else MESSAGES[p[0]].format(**p[1]) for p in parts)
+        obj = super().__new__(cls, text)
+        obj.parts = parts
+        return obj
+
+    def __add__(self, other):
+        if isinstance(other, str):
+            return CatalogText(self.parts + getattr(other, "parts", [str(other)]))
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, str):
+            return CatalogText(getattr(other, "parts", [str(other)]) + self.parts)
+        return NotImplemented
+
+
+class MessageCatalog:
+    """
+    Pre-translated response templates, loaded once at startup.
+    render() builds an English CatalogText; localize() formats it from the
+    pre-translated templates, translating only free text that is not in the
+    catalog (customer-specific prose such as risk explanations).
+    """
+
+    def __init__(self, path: str = CATALOG_PATH):
+        self.path = path
+        self.translations: Dict[str, Dict[str, str]] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            print("Warning: message_catalog.json not found. Responses will be translated at runtime.")
+            return
+        except Exception as e:
+            print(f"Error loading message catalog: {e}. Responses will be translated at runtime.")
+            return
+
+        hashes = data.get("source_hash", {})
+        for language in CATALOG_LANGUAGES:
+            templates = {}
+            for key, template in data.get(language, {}).items():
+                # Skip stale entries (English changed since the build) and any
+                # translation that lost or mangled a placeholder
+                if key not in MESSAGES or hashes.get(key) != source_hash(MESSAGES[key]):
+                    continue
+                if _placeholders(template) != _placeholders(MESSAGES[key]):
+                    continue
+                templates[key] = template
+            self.translations[language] = templates
+
+    def render(self, key: str, **params) -> CatalogText:
+        return CatalogText([(key, params)])
+
+    def localize(self, text: str, language: str, translate_many: Callable[..., List[str]]) -> str:
+        """
+        Text in the user's language. Catalog parts are formatted locally;
+        runs of other text are collected and passed to translate_many in one
+        call (which returns translations in the same order). Its persist
+        argument lists the runs made only of parameter-free catalog text,
+        the ones safe to keep in the translation memory's disk tier.
+        """
+        if language == "en":
+            return str(text)
+        parts = getattr(text, "parts", [str(text)])
+        templates = self.translations.get(language, {})
+
+        pieces: List[Union[str, int]] = []  # localized text, or an index into runs
+        runs: List[str] = []
+        static: List[bool] = []  # per run: only parameter-free catalog text
+        pending: List[str] = []  # consecutive parts without a translation
+        pending_static = True
+
+        def flush():
+            nonlocal pending_static
+            if pending:
+                pieces.append(len(runs))
+                runs.append("".join(pending))
+                static.append(pending_static)
+                pending.clear()
+                pending_static = True
+
+        for part in parts:
+            if isinstance(part, tuple) and part[0] in templates:
+                flush()
+                key, params = part
+                pieces.append(templates[key].format(**params))
+            elif isinstance(part, str):
+                pending.append(part)
+                # Whitespace between catalog parts carries no customer data
+                pending_static = pending_static and not part.strip()
+            else:
+                key, params = part
+                pending.append(MESSAGES[key].format(**params))
+                pending_static = pending_static and not params
+        flush()
+
+        # The translator trims surrounding whitespace; keep the line breaks
+        to_translate = [i for i, run in enumerate(runs) if run.strip()]
+        persist = {runs[i].strip() for i in to_translate if static[i]}
+        translated = translate_many([runs[i].strip() for i in to_translate], persist=persist) if to_translate else []
+        localized_runs = list(runs)
+        for i, value in zip(to_translate, translated):
+            run = runs[i]
+            localized_runs[i] = run[:len(run) - len(run.lstrip())] + value + run[len(run.rstrip()):]
+
+        return "".join(localized_runs[p] if isinstance(p, int) else p for p in pieces)
+
+    def coverage(self) -> Dict[str, float]:
+        return {lang: round(len(t) / len(MESSAGES), 3) for lang, t in self.translations.items()}
+
+
+# --- BUILD STEP ---
+def build_catalog(path: str = CATALOG_PATH, languages: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Translate new or changed MESSAGES into every catalog language and write
+    message_catalog.json. Existing up-to-date translations are kept, so
+    hand-reviewed entries are never overwritten.
+    """
+    from deep_translator import GoogleTranslator
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = {}
+
+    old_hashes = data.get("source_hash", {})
+    new_hashes = {key: source_hash(template) for key, template in MESSAGES.items()}
+    failed = []
+
+    for language in languages or CATALOG_LANGUAGES:
+        current = data.get(language, {})
+        updated = {}
+        for key, template in MESSAGES.items():
+            if key in current and old_hashes.get(key) == new_hashes[key]:
+                updated[key] = current[key]
+                continue
+            # Protect placeholders from the translator as numbered markers
+            placeholders = PLACEHOLDER_RE.findall(template)
+            masked = template
+            for i, placeholder in enumerate(placeholders):
+                masked = masked.replace(placeholder, f"[[{i}]]", 1)
+            try:
+                translated = GoogleTranslator(source="en", target=language).translate(masked)
+            except Exception as e:
+                failed.append((language, key, str(e)))
+                continue
+            for i, placeholder in enumerate(placeholders):
+                translated = translated.replace(f"[[{i}]]", placeholder, 1)
+            if _placeholders(translated) != _placeholders(template):
+                failed.append((language, key, "placeholder lost in translation"))
+                continue
+            updated[key] = translated
+        data[language] = updated
+
+    data["source_hash"] = new_hashes
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return {"failed": failed}
+
+
+# Loaded once at import (server startup)
+CATALOG = MessageCatalog()
+
+
+if __name__ == "__main__":
+    result = build_catalog(languages=sys.argv[1:] or None)
+    for language, key, error in result["failed"]:
+        print(f"⚠️ {language}/{key}: {error}")
+    print(f"Catalog written to {CATALOG_PATH}")
+    print(MessageCatalog().coverage())
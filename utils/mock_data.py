@@ -2,6 +2,8 @@ from typing import Dict, Any, Optional
 import json
 import os
 
+from utils.offer_book import OfferBook
+
 # Load customer database from JSON
 def load_customer_database() -> Dict[str, Dict[str, Any]]:
     """Load customer data from customer_data.json"""
@@ -76,6 +78,8 @@ FALLBACK_CUSTOMER_DATABASE = {
 
 # Load the database on module import
 CUSTOMER_DATABASE = load_customer_database()
+# Offers for every customer, built with the database and kept in step with it
+OFFER_BOOK = OfferBook(CUSTOMER_DATABASE)
 
 def get_customer_data(phone: str) -> Optional[Dict[str, Any]]:
     """Fetch customer data from database by phone number"""
@@ -102,17 +106,14 @@ def get_offer_data(phone: str) -> Optional[Dict[str, Any]]:
     """Get pre-approved offer for customer"""
     customer = get_customer_data(phone)
     if customer:
-        return {
-            "customer_id": customer['id'],
-            "offer_type": "Pre-Approved Personal Loan",
-            "max_amount": customer["pre_approved_limit"],
-            "min_interest_rate": 10.5,
-            "max_tenure": 60,
-            "special_offer": "0% processing fee for this month",
-            "valid_until": "2025-11-30"
-        }
+        return OFFER_BOOK.pre_approved_offer(customer)
     return None
 
+def update_customer(customer: Dict[str, Any]):
+    """Add or replace a customer record and rebuild its offers"""
+    CUSTOMER_DATABASE[customer['phone']] = customer
+    OFFER_BOOK.update(customer)
+
 def get_customer_by_id(customer_id: str) -> Optional[Dict[str, Any]]:
     """Get customer by ID (C01, C02, etc.)"""
     for phone, data in CUSTOMER_DATABASE.items():
@@ -0,0 +1,235 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Any, Optional, Iterator
+
+from utils.llm_gateway import LLMGateway, get_llm_gateway
+from utils.llm_cache import LLMResponseCache, make_cache_key
+
+# Default routing policy. Override by pointing LLM_ROUTING_CONFIG at a JSON file
+# with the same shape; top-level keys in the file replace the defaults.
+DEFAULT_POLICY: Dict[str, Any] = {
+    "tiers": {
+        # Prices are USD per 1M tokens (input, output), used for cost accounting only
+        "small": {"model": "openai/gpt-oss-20b", "input_cost": 0.075, "output_cost": 0.30},
+        "large": {"model": "openai/gpt-oss-120b", "input_cost": 0.15, "output_cost": 0.60},
+    },
+    # First matching route wins. A route may match on task, stage and prompt size.
+    "routes": [
+        {"name": "negotiation", "task": "negotiation", "tier": "large"},
+        {"name": "translation", "task": "translation", "max_prompt_chars": 4000, "tier": "small"},
+        {"name": "post_completion_qa", "task": "post_completion_qa", "max_prompt_chars": 3000, "tier": "small"},
+    ],
+    "default_tier": "large",
+    # Response cache for calls made with cache=True (LLM_CACHE_PATH enables disk persistence)
+    "cache": {"max_entries": 1000, "ttl_seconds": 24 * 60 * 60},
+}
+
+LATENCY_WINDOW = 500  # recent calls kept per route for the median
+
+
+def load_routing_policy(path: Optional[str] = None) -> Dict[str, Any]:
+    """Load the routing policy, falling back to DEFAULT_POLICY"""
+    policy = dict(DEFAULT_POLICY)
+    path = path or os.getenv("LLM_ROUTING_CONFIG")
+    if not path:
+        return policy
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            policy.update(json.load(f))
+        print(f"✅ LLM routing policy loaded from {path}")
+    except Exception as e:
+        print(f"⚠️ Could not load routing policy from {path}: {e}. Using defaults.")
+    return policy
+
+
+class RouteStats:
+    """Latency, token and cost accounting for one route"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.latencies_ms = deque(maxlen=LATENCY_WINDOW)
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "p50_latency_ms": round(latencies[len(latencies) // 2], 1) if latencies else None,
+            "p95_latency_ms": round(latencies[int(len(latencies) * 0.95)], 1) if latencies else None,
+        }
+
+
+class ModelRouter:
+    """
+    Picks a small or large model per LLM call from task type, stage and prompt
+    length, then calls the shared gateway and records per-route stats.
+    """
+
+    def __init__(self, gateway: LLMGateway, policy: Optional[Dict[str, Any]] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.gateway = gateway
+        self.policy = policy or load_routing_policy()
+        self._clock = clock
+        self._stats: Dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+        cache_config = self.policy.get("cache", {})
+        self.cache = LLMResponseCache(
+            max_entries=cache_config.get("max_entries", 1000),
+            ttl_seconds=cache_config.get("ttl_seconds", 24 * 60 * 60),
+            path=cache_config.get("path") or os.getenv("LLM_CACHE_PATH"),
+        )
+
+    def route(self, task: str, messages: List[Dict[str, str]], stage: Optional[str] = None) -> Dict[str, Any]:
+        """Return {"name", "tier", "model"} for this call"""
+        prompt_chars = sum(len(m.get("content") or "") for m in messages)
+        for rule in self.policy["routes"]:
+            if rule.get("task") and rule["task"] != task:
+                continue
+            if rule.get("stages") and stage not in rule["stages"]:
+                continue
+            if rule.get("max_prompt_chars") and prompt_chars > rule["max_prompt_chars"]:
+                continue
+            tier = rule["tier"]
+            return {"name": rule.get("name", task), "tier": tier, "model": self.policy["tiers"][tier]["model"]}
+
+        tier = self.policy["default_tier"]
+        return {"name": f"{task}:default", "tier": tier, "model": self.policy["tiers"][tier]["model"]}
+
+    def complete(
+        self,
+        task: str,
+        messages: List[Dict[str, str]],
+        stage: Optional[str] = None,
+        cache: bool = False,
+        **kwargs
+    ) -> str:
+        """
+        Routed blocking completion. kwargs go to LLMGateway.complete (temperature, max_tokens, timeout).
+        With cache=True, identical (normalized) prompts are served from the response
+        cache and concurrent identical calls share one request. Only use it for
+        prompts that carry no customer-specific context.
+        """
+        route = self.route(task, messages, stage)
+        if not cache:
+            return self._call(route, messages, kwargs)
+
+        key = make_cache_key(messages, route["model"], **kwargs)
+        computed = False
+
+        def compute() -> str:
+            nonlocal computed
+            computed = True
+            return self._call(route, messages, kwargs)
+
+        text = self.cache.get_or_compute(key, compute)
+        if not computed:
+            with self._lock:
+                self._stats.setdefault(route["name"], RouteStats()).cache_hits += 1
+        return text
+
+    def _call(self, route: Dict[str, Any], messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> str:
+        start = self._clock()
+        try:
+            text, usage = self.gateway.complete_with_usage(messages, model=route["model"], **kwargs)
+        except Exception:
+            self._record(route, self._clock() - start, error=True)
+            raise
+        self._record(route, self._clock() - start, usage=usage)
+        return text
+
+    def stream(
+        self,
+        task: str,
+        messages: List[Dict[str, str]],
+        stage: Optional[str] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """Routed streamed completion. Token counts are estimated from text length."""
+        route = self.route(task, messages, stage)
+        start = self._clock()
+        produced = []
+        try:
+            for delta in self.gateway.stream(messages, model=route["model"], **kwargs):
+                produced.append(delta)
+                yield delta
+        except Exception:
+            self._record(route, self._clock() - start, error=True)
+            raise
+        usage = {
+            "prompt_tokens": sum(len(m.get("content") or "") for m in messages) // 4,
+            "completion_tokens": len("".join(produced)) // 4,
+        }
+        self._record(route, self._clock() - start, usage=usage)
+
+    def _record(self, route: Dict[str, Any], elapsed: float, usage: Optional[Dict[str, int]] = None, error: bool = False):
+        tier = self.policy["tiers"][route["tier"]]
+        with self._lock:
+            stats = self._stats.setdefault(route["name"], RouteStats())
+            stats.calls += 1
+            stats.latencies_ms.append(elapsed * 1000)
+            if error:
+                stats.errors += 1
+                return
+            stats.prompt_tokens += usage["prompt_tokens"]
+            stats.completion_tokens += usage["completion_tokens"]
+            stats.cost_usd += (
+                usage["prompt_tokens"] * tier.get("input_cost", 0)
+                + usage["completion_tokens"] * tier.get("output_cost", 0)
+            ) / 1_000_000
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                name: {"model": self._model_for_route(name), **stats.snapshot()}
+                for name, stats in self._stats.items()
+            }
+
+    def _model_for_route(self, name: str) -> str:
+        for rule in self.policy["routes"]:
+            if rule.get("name", rule.get("task")) == name:
+                return self.policy["tiers"][rule["tier"]]["model"]
+        return self.policy["tiers"][self.policy["default_tier"]]["model"]
+
+
+# --- PROCESS-WIDE REGISTRY ---
+_routers: Dict[str, ModelRouter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_model_router(api_key: str) -> ModelRouter:
+    """Return the shared router for this API key, creating it on first use"""
+    with _registry_lock:
+        router = _routers.get(api_key)
+        if router is None:
+            router = ModelRouter(get_llm_gateway(api_key))
+            _routers[api_key] = router
+        return router
+
+
+def get_routing_stats() -> Dict[str, Any]:
+    """Per-route stats across every router in the process"""
+    with _registry_lock:
+        routers = list(_routers.values())
+    merged: Dict[str, Any] = {}
+    for router in routers:
+        merged.update(router.stats())
+    return merged
+
+
+def get_cache_stats() -> List[Dict[str, Any]]:
+    """Response cache stats per router (one per API key, normally just one)"""
+    with _registry_lock:
+        routers = list(_routers.values())
+    return [router.cache.stats() for router in routers]
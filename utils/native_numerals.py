@@ -0,0 +1,149 @@
+import re
+from typing import Dict, Optional
+
+# Native digits (Devanagari, Bengali, Gujarati, Tamil, Telugu) -> ASCII
+_DIGIT_ZEROS = (0x0966, 0x09E6, 0x0AE6, 0x0BE6, 0x0C66)
+DIGIT_TABLE = {zero + i: ord("0") + i for zero in _DIGIT_ZEROS for i in range(10)}
+
+# Unit words, matched as word prefixes so inflected forms (लाखांचे, లక్షల,
+# மாதங்கள்) are covered. Mapped to the units the English extractors expect.
+UNIT_STEMS: Dict[str, tuple] = {
+    "lakh": ("लाख", "लक्ष", "লাখ", "লক্ষ", "લાખ", "லட்ச", "లక్ష", "లక్షల"),
+    "crore": ("करोड़", "करोड", "कोटी", "কোটি", "કરોડ", "கோடி", "కోటి", "కోట్ల"),
+    "k": ("हज़ार", "हजार", "হাজার", "હજાર", "ஆயிர", "వేల", "వేయి"),
+    "years": ("साल", "वर्ष", "বছর", "વર્ષ", "વરસ", "ஆண்டு", "வருட", "సంవత్సర", "ఏళ్ల", "ఏళ్ళ"),
+    "months": ("महीन", "महिन", "মাস", "મહિન", "மாத", "నెల"),
+}
+
+# Number words are only read when a unit word follows them, since several
+# double as ordinary words ("एक" is also "a", "নয়" is also "not")
+NUMBER_WORDS: Dict[str, float] = {
+    # Hindi
+    "आधा": 0.5, "एक": 1, "डेढ़": 1.5, "डेढ": 1.5, "दो": 2, "ढाई": 2.5, "तीन": 3, "चार": 4,
+    "पांच": 5, "पाँच": 5, "छह": 6, "छः": 6, "सात": 7, "आठ": 8, "नौ": 9, "दस": 10,
+    "बारह": 12, "पंद्रह": 15, "बीस": 20, "पच्चीस": 25, "तीस": 30, "चालीस": 40, "पचास": 50,
+    # Marathi
+    "दीड": 1.5, "दोन": 2, "अडीच": 2.5, "पाच": 5, "सहा": 6, "नऊ": 9, "दहा": 10,
+    "बारा": 12, "पंधरा": 15, "वीस": 20, "पंचवीस": 25, "चाळीस": 40, "पन्नास": 50,
+    # Bengali
+    "এক": 1, "দেড়": 1.5, "দুই": 2, "আড়াই": 2.5, "তিন": 3, "চার": 4, "পাঁচ": 5, "ছয়": 6,
+    "সাত": 7, "আট": 8, "নয়": 9, "দশ": 10, "বারো": 12, "পনেরো": 15, "কুড়ি": 20, "বিশ": 20,
+    "পঁচিশ": 25, "ত্রিশ": 30, "চল্লিশ": 40, "পঞ্চাশ": 50,
+    # Gujarati
+    "એક": 1, "દોઢ": 1.5, "બે": 2, "અઢી": 2.5, "ત્રણ": 3, "ચાર": 4, "પાંચ": 5, "છ": 6,
+    "સાત": 7, "આઠ": 8, "નવ": 9, "દસ": 10, "બાર": 12, "પંદર": 15, "વીસ": 20, "પચીસ": 25,
+    "ત્રીસ": 30, "ચાલીસ": 40, "પચાસ": 50,
+    # Tamil
+    "ஒரு": 1, "ஒன்று": 1, "இரண்டு": 2, "மூன்று": 3, "நான்கு": 4, "ஐந்து": 5, "ஆறு": 6,
+    "ஏழு": 7, "எட்டு": 8, "ஒன்பது": 9, "பத்து": 10, "பன்னிரண்டு": 12, "பதினைந்து": 15,
+    "இருபது": 20, "முப்பது": 30, "நாற்பது": 40, "ஐம்பது": 50,
+    # Telugu
+    "ఒక": 1, "ఒకటి": 1, "రెండు": 2, "మూడు": 3, "నాలుగు": 4, "ఐదు": 5, "ఆరు": 6,
+    "ఏడు": 7, "ఎనిమిది": 8, "తొమ్మిది": 9, "పది": 10, "పన్నెండు": 12, "పదిహేను": 15,
+    "ఇరవై": 20, "ముప్పై": 30, "నలభై": 40, "యాభై": 50,
+}
+
+# Words that carry no meaning for a structured answer ("मुझे 5 लाख चाहिए").
+# A message made only of these, numbers and units needs no translation.
+FILLER_WORDS = {
+    # Hindi
+    "मुझे", "चाहिए", "का", "की", "के", "लिए", "लोन", "ऋण", "रुपये", "रुपए", "रुपया", "है", "हैं",
+    "मेरी", "मेरा", "आय", "सैलरी", "वेतन", "लगभग", "करीब", "सिर्फ", "बस", "में", "तक", "प्रति",
+    # Marathi
+    "मला", "पाहिजे", "हवे", "हवा", "कर्ज", "आहे", "माझे", "माझा", "माझी", "पगार",
+    "उत्पन्न", "साठी", "सुमारे", "फक्त",
+    # Bengali
+    "আমার", "চাই", "দরকার", "লোন", "ঋণ", "টাকা", "আয়", "বেতন", "প্রায়", "শুধু", "জন্য",
+    # Gujarati
+    "મને", "મારે", "જોઈએ", "લોન", "રૂપિયા", "મારી", "મારો", "આવક", "પગાર", "લગભગ", "માટે", "છે",
+    # Tamil
+    "எனக்கு", "வேண்டும்", "கடன்", "ரூபாய்", "என்", "சம்பளம்", "வருமானம்", "சுமார்",
+    # Telugu
+    "నాకు", "కావాలి", "రుణం", "లోన్", "రూపాయలు", "నా", "జీతం", "ఆదాయం", "సుమారు",
+}
+
+# Any character from the Indic blocks above (U+0900-U+0C7F)
+_INDIC = "\u0900-\u0c7f"
+_TOKEN = re.compile(rf"[{_INDIC}]+|[^\s{_INDIC}]+")
+_PUNCTUATION = ".,!?;:।॥"
+# What may remain of a structured answer once filler words are dropped
+_STRUCTURED_TOKEN = re.compile(r"^(?:[\d.,+\-/]+(?:lakh|crore|k|years|months)?|lakh|crore|k|years|months)$")
+
+
+# Income answers: a number with an optional unit that ends at a word boundary,
+# so "60000 ctc" or "50000 cash" are not read as crores; "lpa" is lakh per annum
+_INCOME = re.compile(r"(\d+(?:\.\d+)?)\s*(lakhs?|lacs?|lpa|crores?|cr|k|thousand)?\b")
+_PER_YEAR = re.compile(r"\b(?:lpa|pa|p\.a|per annum|annual|annually|yearly|per year|a year)\b")
+INCOME_MULTIPLIERS = {"lakh": 100000, "lac": 100000, "lpa": 100000, "crore": 10000000, "cr": 10000000,
+                      "k": 1000, "thousand": 1000}
+
+
+def _unit_for(token: str) -> Optional[str]:
+    for unit, stems in UNIT_STEMS.items():
+        if token.startswith(stems):
+            return unit
+    return None
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if value == int(value) else str(value)
+
+
+def normalize_numerals(text: str) -> str:
+    """
+    Text with native digits, number words and lakh/crore/thousand/year/month
+    words rewritten in the ASCII forms the English extractors understand:
+    "५ लाख" -> "5 lakh", "ढाई लाख" -> "2.5 lakh", "மூன்று ஆண்டு" -> "3 years".
+    ASCII text is returned unchanged.
+    """
+    if not text or text.isascii():
+        return text
+    text = text.translate(DIGIT_TABLE)
+    tokens = _TOKEN.findall(text)
+    out = []
+    for i, token in enumerate(tokens):
+        word = token.strip(_PUNCTUATION)
+        unit = _unit_for(word)
+        if unit:
+            out.append(unit)
+            continue
+        value = NUMBER_WORDS.get(word)
+        if value is not None and i + 1 < len(tokens) and _unit_for(tokens[i + 1].strip(_PUNCTUATION)):
+            out.append(_format(value))
+            continue
+        out.append(token)
+    return " ".join(out)
+
+
+def structured_english(text: str) -> Optional[str]:
+    """
+    The message in extractor-ready English when it consists only of numbers,
+    units and filler words (e.g. "मुझे ५ लाख चाहिए" -> "5 lakh"), so the caller
+    can skip the translation call. None if anything else needs translating.
+    """
+    kept = []
+    for token in normalize_numerals(text or "").split():
+        word = token.strip(_PUNCTUATION)
+        if word in FILLER_WORDS:
+            continue
+        if not _STRUCTURED_TOKEN.match(word):
+            return None
+        kept.append(word)
+    return " ".join(kept) if kept else None
+
+
+def read_monthly_income(text: str) -> Optional[int]:
+    """
+    Monthly income from a free-text answer in any supported script: "50k",
+    "1.2 lakh", "५० हजार", "60000 ctc". Annual figures ("6 lpa", "9 lakh per
+    annum") are divided by 12. None if the answer has no number.
+    """
+    raw = normalize_numerals(text or "").lower().replace(",", "").strip()
+    match = _INCOME.search(raw)
+    if not match:
+        return None
+    unit = (match.group(2) or "").rstrip("s")
+    amount = float(match.group(1)) * INCOME_MULTIPLIERS.get(unit, 1)
+    if _PER_YEAR.search(raw):
+        amount /= 12
+    return int(amount)
@@ -0,0 +1,215 @@
+import re
+import threading
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from utils.keyword_matcher import INTENT_MATCHER
+
+# Loan-to-value ratio and secured interest rate per collateral type
+COLLATERAL_LTV = {
+    "property": 0.65, "vehicle": 0.75, "gold": 0.75,
+    "fd": 0.90, "mutual_funds": 0.70, "stocks": 0.60, "land": 0.60
+}
+COLLATERAL_RATES = {
+    "property": 9.5, "vehicle": 10.5, "gold": 9.0,
+    "fd": 8.0, "mutual_funds": 11.0, "stocks": 12.0, "land": 10.0
+}
+DEFAULT_LTV = 0.60
+DEFAULT_SECURED_RATE = 10.0
+
+# Pre-approved (unsecured) offer terms
+UNSECURED_RATE = 10.5
+UNSECURED_MAX_TENURE = 60
+SPECIAL_OFFER = "0% processing fee for this month"
+OFFER_VALID_UNTIL = "2025-11-30"
+
+NO_COLLATERAL = {"none", "no", "nil", "na", "nothing"}
+
+_VALUE_PATTERNS = [
+    re.compile(r'₹\s*([\d,]+)', re.IGNORECASE),
+    re.compile(r'value[:\s]+([\d,]+)', re.IGNORECASE),
+    re.compile(r'\b([\d,]{4,})\b', re.IGNORECASE),
+]
+_LAKH = re.compile(r'(\d+(?:\.\d+)?)\s*(?:lakh|lac|l)', re.IGNORECASE)
+_THOUSAND = re.compile(r'(\d+(?:\.\d+)?)\s*k', re.IGNORECASE)
+
+
+def parse_collateral(collateral_str: str) -> Optional[Dict[str, Any]]:
+    """Parse a collateral description into type, value and the LTV-capped loan it secures"""
+    if not collateral_str or collateral_str.lower() in NO_COLLATERAL:
+        return None
+
+    value = None
+    clean_str = collateral_str.replace('â', '').replace('¹', '').strip()
+
+    for pattern in _VALUE_PATTERNS:
+        for match in pattern.findall(clean_str):
+            try:
+                clean_val = int(match.replace(',', '').replace(' ', ''))
+            except ValueError:
+                continue
+            if clean_val > 1000:
+                value = clean_val
+                break
+        if value:
+            break
+
+    if not value:
+        lakh_match = _LAKH.search(clean_str)
+        k_match = _THOUSAND.search(clean_str)
+        if lakh_match:
+            value = int(float(lakh_match.group(1)) * 100000)
+        elif k_match:
+            value = int(float(k_match.group(1)) * 1000)
+
+    if not value:
+        return None
+
+    # First matching type in priority order: fd, property, vehicle, gold, stocks
+    collateral_type = INTENT_MATCHER.first_of(INTENT_MATCHER.classify(clean_str), "collateral:") or "property"
+
+    ltv = COLLATERAL_LTV.get(collateral_type, DEFAULT_LTV)
+    return {
+        "type": collateral_type,
+        "description": collateral_str,
+        "value": value,
+        "max_loan": int(value * ltv),
+        "interest_rate": COLLATERAL_RATES.get(collateral_type, DEFAULT_SECURED_RATE),
+        "ltv_ratio": ltv * 100
+    }
+
+
+def secured_offer(collateral_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not collateral_info:
+        return {"eligible": False, "reason": "No collateral available"}
+    return {
+        "eligible": True,
+        "collateral": collateral_info,
+        "max_amount": collateral_info["max_loan"],
+        "interest_rate": collateral_info["interest_rate"],
+        "min_tenure": 12,
+        "max_tenure": 120,
+        "processing_fee": "1% of loan amount"
+    }
+
+
+def pre_approved_offer(customer: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "customer_id": customer['id'],
+        "offer_type": "Pre-Approved Personal Loan",
+        "max_amount": customer["pre_approved_limit"],
+        "min_interest_rate": UNSECURED_RATE,
+        "max_tenure": UNSECURED_MAX_TENURE,
+        "special_offer": SPECIAL_OFFER,
+        "valid_until": OFFER_VALID_UNTIL
+    }
+
+
+def _copy_secured(offer: Dict[str, Any]) -> Dict[str, Any]:
+    copy = dict(offer)
+    if "collateral" in copy:
+        copy["collateral"] = dict(copy["collateral"])
+    return copy
+
+
+class OfferEntry(NamedTuple):
+    fingerprint: Tuple
+    collateral: Optional[Dict[str, Any]]
+    secured: Dict[str, Any]
+    pre_approved: Dict[str, Any]
+
+
+def _fingerprint(customer: Dict[str, Any]) -> Tuple:
+    # The only record fields offers depend on
+    return customer["id"], customer["pre_approved_limit"], customer.get("collateral", "None")
+
+
+class OfferBook:
+    """
+    Offers for every customer in the database, built once when it loads:
+    parsed collateral, the LTV-capped secured offer and the pre-approved
+    unsecured offer, keyed by phone. Entries are rebuilt one at a time when
+    the fields they depend on change, including records edited in place,
+    which lookups detect by fingerprint. Callers get copies.
+    """
+
+    def __init__(self, customers: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, OfferEntry] = {}
+        # Collateral string -> secured offer, shared by customers pledging the same asset
+        self._by_collateral: Dict[str, Dict[str, Any]] = {}
+        self._builds = 0
+        if customers:
+            self.sync(customers)
+
+    def sync(self, customers: Dict[str, Dict[str, Any]]):
+        """Bring the book in line with the database: rebuild changed records, drop removed ones"""
+        with self._lock:
+            for phone in set(self._entries) - set(customers):
+                del self._entries[phone]
+            for phone, customer in customers.items():
+                self._entry(phone, customer)
+            self._prune_collateral()
+
+    def update(self, customer: Dict[str, Any]):
+        with self._lock:
+            self._entry(customer["phone"], customer)
+
+    def remove(self, phone: str):
+        with self._lock:
+            self._entries.pop(phone, None)
+            self._prune_collateral()
+
+    def pre_approved_offer(self, customer: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._entry(customer["phone"], customer).pre_approved)
+
+    def customer_secured_offer(self, customer: Dict[str, Any]) -> Dict[str, Any]:
+        """Secured offer from the customer's entry; unregistered records fall back to their collateral string"""
+        with self._lock:
+            if customer["phone"] in self._entries:
+                return _copy_secured(self._entry(customer["phone"], customer).secured)
+        return self.secured_offer(customer.get("collateral", "None"))
+
+    def secured_offer(self, collateral: str) -> Dict[str, Any]:
+        """Secured offer for a collateral description; strings from the database are never re-parsed"""
+        with self._lock:
+            offer = self._by_collateral.get(collateral)
+        if offer is None:
+            # Free text no customer has pledged: parsed per call, not kept
+            return secured_offer(parse_collateral(collateral))
+        return _copy_secured(offer)
+
+    def entries(self) -> Iterable[Tuple[str, OfferEntry]]:
+        with self._lock:
+            return list(self._entries.items())
+
+    def __contains__(self, phone: str) -> bool:
+        return phone in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"customers": len(self._entries), "collateral_strings": len(self._by_collateral), "builds": self._builds}
+
+    # --- internals (caller holds the lock) ---
+    def _entry(self, phone: str, customer: Dict[str, Any]) -> OfferEntry:
+        fingerprint = _fingerprint(customer)
+        entry = self._entries.get(phone)
+        if entry is not None and entry.fingerprint == fingerprint:
+            return entry
+        collateral_str = fingerprint[2]
+        offer = self._by_collateral.get(collateral_str)
+        if offer is None:
+            offer = secured_offer(parse_collateral(collateral_str))
+            self._by_collateral[collateral_str] = offer
+        entry = OfferEntry(fingerprint, offer.get("collateral"), offer, pre_approved_offer(customer))
+        self._entries[phone] = entry
+        self._builds += 1
+        return entry
+
+    def _prune_collateral(self):
+        live = {entry.fingerprint[2] for entry in self._entries.values()}
+        for collateral_str in set(self._by_collateral) - live:
+            del self._by_collateral[collateral_str]
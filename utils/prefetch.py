@@ -0,0 +1,87 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+PREFETCH_WORKERS = 4
+
+# Shared by every session in the process
+PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+
+
+class PrefetchStats:
+    """Process-wide counters per consuming stage: hits, misses and the latency users did not wait for"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, float]] = {}
+
+    def record(self, stage: str, hit: bool, saved: float = 0.0, waited: float = 0.0):
+        with self._lock:
+            row = self._stages.setdefault(stage, {"hits": 0, "misses": 0, "saved_seconds": 0.0, "waited_seconds": 0.0})
+            row["hits" if hit else "misses"] += 1
+            row["saved_seconds"] += saved
+            row["waited_seconds"] += waited
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                stage: {
+                    "hits": row["hits"],
+                    "misses": row["misses"],
+                    "latency_saved_ms": round(row["saved_seconds"] * 1000, 1),
+                    "mean_wait_ms": round(row["waited_seconds"] / row["hits"] * 1000, 1) if row["hits"] else None,
+                }
+                for stage, row in self._stages.items()
+            }
+
+
+prefetch_stats = PrefetchStats()
+
+
+class PrefetchCache:
+    """
+    Per-session futures for work a later stage is likely to need. start()
+    runs a call in the background; take() returns its result if it was
+    started with the same arguments (waiting for it if still running), and
+    otherwise makes the call inline. Results are used at most once.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor = PREFETCH_EXECUTOR, stats: PrefetchStats = prefetch_stats):
+        self.executor = executor
+        self.stats = stats
+        self._jobs: Dict[str, Tuple[Tuple, Future]] = {}
+        self._lock = threading.Lock()
+
+    def start(self, key: str, fn: Callable[..., Any], *args):
+        with self._lock:
+            if key in self._jobs and self._jobs[key][0] == args:
+                return
+            self._jobs[key] = (args, self.executor.submit(self._timed, fn, *args))
+
+    def take(self, key: str, fn: Callable[..., Any], *args, stage: str) -> Any:
+        with self._lock:
+            job = self._jobs.pop(key, None)
+        if job is not None and job[0] == args:
+            start = time.perf_counter()
+            try:
+                result, elapsed = job[1].result()
+            except Exception:
+                # A failed prefetch falls back to the inline call
+                pass
+            else:
+                waited = time.perf_counter() - start
+                self.stats.record(stage, hit=True, saved=max(0.0, elapsed - waited), waited=waited)
+                return result
+        self.stats.record(stage, hit=False)
+        return fn(*args)
+
+    def clear(self):
+        with self._lock:
+            self._jobs.clear()
+
+    @staticmethod
+    def _timed(fn: Callable[..., Any], *args) -> Tuple[Any, float]:
+        start = time.perf_counter()
+        result = fn(*args)
+        return result, time.perf_counter() - start
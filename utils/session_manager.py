@@ -0,0 +1,408 @@
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from utils.session_store import SessionStore, SQLiteSessionStore
+
+# Sessions idle for longer than this are dropped
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_MINUTES", "30")) * 60
+
+# Live sessions per process; the least recently active one is evicted beyond this
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "2000"))
+
+# How often the background janitor sweeps expired sessions
+JANITOR_INTERVAL_SECONDS = 30
+
+# Sessions idle for longer than this are spilled to disk and rebuilt on their next message
+SPILL_AFTER_SECONDS = int(os.getenv("SESSION_SPILL_MINUTES", "5")) * 60
+
+# Above this resident set size (MB) the janitor spills the least recently active
+# sessions early; 0 disables the check
+MEMORY_HIGH_WATER_MB = int(os.getenv("SESSION_MEMORY_HIGH_WATER_MB", "1024"))
+
+# Fraction of resident sessions spilled per sweep while over the high-water mark
+HIGH_WATER_SPILL_FRACTION = 0.25
+
+# Even under memory pressure, a session touched more recently than this is not
+# spilled (sessions with a turn in progress are never spilled at all)
+MIN_IDLE_BEFORE_SPILL_SECONDS = 60
+
+
+def resident_mb() -> Optional[float]:
+    """Current resident set size of this process in MB (Linux), or None"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class SessionManager:
+    """
+    Sessions keyed by id (web session id or WhatsApp number), kept in one
+    OrderedDict in least-recently-active order. Every session shares the same
+    TTL, so that order is also expiry order: a sweep pops from the front and
+    stops at the first live session, making expiry amortized O(1). Sweeps run
+    on a background janitor rather than on every request, and creating a
+    session beyond max_sessions evicts the least recently active one.
+
+    With a store, the in-process dict is a cache in front of it: save() writes
+    a snapshot after each turn, and get() reloads a session when another
+    worker has saved a newer version (or when this process never had it).
+
+    With a restore function, idle sessions are also spilled: the janitor
+    replaces the agent with its compressed snapshot on disk (the shared store,
+    or a private SQLite file) and the next get() rebuilds it. Resident
+    sessions have their own LRU order, so spilling is amortized O(1) too.
+    Requests run their turn inside turn(), which pins the session so it is
+    not spilled while the agent is in use, however long the turn takes.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        ttl: float = SESSION_TTL_SECONDS,
+        max_sessions: int = MAX_SESSIONS,
+        on_evict: Optional[Callable[[str, str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        store: Optional[SessionStore] = None,
+        restore: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        spill_after: float = SPILL_AFTER_SECONDS,
+        memory_high_water_mb: float = MEMORY_HIGH_WATER_MB,
+        spill_store: Optional[SessionStore] = None,
+    ):
+        if store is not None and restore is None:
+            raise ValueError("a session store needs a restore function")
+        self.factory = factory
+        self.store = store
+        self.restore = restore
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.on_evict = on_evict
+        self.clock = clock
+        self.spill_after = spill_after
+        self.memory_high_water_mb = memory_high_water_mb
+        self._spill_store = spill_store
+        # id -> [agent (None once spilled), last_activity, stored version (0 = never saved)]
+        self._sessions: "OrderedDict[str, list]" = OrderedDict()
+        # Sessions whose agent is in memory, same order and entries as _sessions
+        self._resident: "OrderedDict[str, list]" = OrderedDict()
+        # id -> turns in progress; pinned sessions are never spilled
+        self._turns: "Counter[str]" = Counter()
+        self._spill_dir: Optional[str] = None
+        self._lock = threading.Lock()
+        self._janitor: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+        self.reloaded = 0
+        self.spilled = 0
+        self.rehydrated = 0
+
+    # --- lookup ---
+    @contextmanager
+    def turn(self, session_id: str, create: bool = True) -> Iterator[Optional[Any]]:
+        """
+        The session's agent (created if needed, unless create=False, in which
+        case it may be None), pinned in memory until the block exits. The
+        session's activity is touched again on exit, so a long turn does not
+        leave it looking idle.
+        """
+        with self._lock:
+            self._turns[session_id] += 1
+        try:
+            yield self.get_or_create(session_id) if create else self.get(session_id)
+        finally:
+            with self._lock:
+                self._turns[session_id] -= 1
+                if not self._turns[session_id]:
+                    del self._turns[session_id]
+                entry = self._sessions.get(session_id)
+                if entry is not None:
+                    entry[1] = self.clock()
+                    self._sessions.move_to_end(session_id)
+                    if entry[0] is not None:
+                        self._resident.move_to_end(session_id)
+
+    def get_or_create(self, session_id: str) -> Any:
+        """Live agent for session_id, touching its activity; creates one if needed"""
+        agent = self.get(session_id)
+        if agent is not None:
+            return agent
+
+        # Built outside the lock; if two requests race, the first one stored wins
+        return self._insert(session_id, self.factory(), 0)
+
+    def get(self, session_id: str) -> Optional[Any]:
+        """Live agent for session_id (touching its activity), or None"""
+        entry = self._touch(session_id)
+        if self.store is None:
+            return self._resident_agent(session_id, entry) if entry else None
+
+        version = self.store.version(session_id)
+        if entry is not None and (version == entry[2] or (version is None and entry[2] == 0)):
+            return self._resident_agent(session_id, entry)
+        if version is None:
+            # Saved once but gone from the store: restarted or purged elsewhere
+            if entry is not None:
+                self.discard(session_id)
+            return None
+
+        record = self.store.load(session_id)
+        if record is None or time.time() - record.updated_at > self.ttl:
+            return None
+        with self._lock:
+            self.reloaded += 1
+        return self._insert(session_id, self.restore(record.snapshot), record.version, replace=True)
+
+    def save(self, session_id: str):
+        """Write the session's snapshot to the store (no-op without one)"""
+        if self.store is None:
+            return
+        with self._lock:
+            entry = self._sessions.get(session_id)
+        if entry is None or entry[0] is None:
+            return
+        version = self.store.save(session_id, entry[0].snapshot())
+        with self._lock:
+            entry[2] = version
+
+    def discard(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._resident.pop(session_id, None)
+        self._forget([session_id])
+        if self.store is not None:
+            self.store.delete(session_id)
+
+    def _touch(self, session_id: str) -> Optional[list]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            now = self.clock()
+            if now - entry[1] > self.ttl:
+                del self._sessions[session_id]
+                self._resident.pop(session_id, None)
+                self.expired += 1
+                expired = True
+            else:
+                entry[1] = now
+                self._sessions.move_to_end(session_id)
+                if entry[0] is not None:
+                    self._resident.move_to_end(session_id)
+                expired = False
+        if expired:
+            self._forget([session_id])
+            self._notify(session_id, "expired")
+            return None
+        return entry
+
+    def _insert(self, session_id: str, agent: Any, version: int, replace: bool = False) -> Any:
+        evicted = []
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None and not replace and entry[0] is not None:
+                entry[1] = self.clock()
+                self._sessions.move_to_end(session_id)
+                self._resident.move_to_end(session_id)
+                return entry[0]
+            entry = [agent, self.clock(), version]
+            self._sessions[session_id] = entry
+            self._sessions.move_to_end(session_id)
+            self._resident[session_id] = entry
+            self._resident.move_to_end(session_id)
+            if version == 0 and not replace:
+                self.created += 1
+            while len(self._sessions) > self.max_sessions:
+                sid, _ = self._sessions.popitem(last=False)
+                self._resident.pop(sid, None)
+                evicted.append(sid)
+                self.evicted += 1
+        self._forget(evicted)
+        for sid in evicted:
+            self._notify(sid, "evicted")
+        return agent
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._sessions)
+
+    # --- spilling ---
+    def _resident_agent(self, session_id: str, entry: list) -> Optional[Any]:
+        """The entry's agent, rebuilt from its spilled snapshot if needed"""
+        agent = entry[0]
+        if agent is not None:
+            return agent
+        record = self._spill_target().load(session_id)
+        if record is None:
+            self.discard(session_id)
+            return None
+        agent = self.restore(record.snapshot)
+        with self._lock:
+            if self._sessions.get(session_id) is not entry:
+                return agent
+            if entry[0] is None:
+                entry[0] = agent
+                self._resident[session_id] = entry
+                self.rehydrated += 1
+            self._resident.move_to_end(session_id)
+            return entry[0]
+
+    def spill_idle(self, idle_for: Optional[float] = None) -> int:
+        """Spill resident sessions idle for longer than idle_for (default spill_after)"""
+        if self.restore is None:
+            return 0
+        cutoff = self.clock() - (self.spill_after if idle_for is None else idle_for)
+        with self._lock:
+            candidates = []
+            for sid, entry in self._resident.items():
+                if entry[1] >= cutoff:
+                    break
+                if sid not in self._turns:
+                    candidates.append((sid, entry))
+        return sum(self._spill(sid, entry) for sid, entry in candidates)
+
+    def relieve_memory_pressure(self) -> int:
+        """Spill the least recently active sessions early while over the high-water mark"""
+        if self.restore is None or not self.memory_high_water_mb:
+            return 0
+        rss = resident_mb()
+        if rss is None or rss < self.memory_high_water_mb:
+            return 0
+        cutoff = self.clock() - MIN_IDLE_BEFORE_SPILL_SECONDS
+        with self._lock:
+            budget = max(1, int(len(self._resident) * HIGH_WATER_SPILL_FRACTION))
+            candidates = []
+            for sid, entry in self._resident.items():
+                if len(candidates) >= budget or entry[1] >= cutoff:
+                    break
+                if sid not in self._turns:
+                    candidates.append((sid, entry))
+        return sum(self._spill(sid, entry) for sid, entry in candidates)
+
+    def _spill(self, session_id: str, entry: list) -> int:
+        agent, touched = entry[0], entry[1]
+        if agent is None:
+            return 0
+        target = self._spill_target()
+        # With a shared store the last save() already holds this state
+        version = entry[2] if self.store is not None and entry[2] else target.save(session_id, agent.snapshot())
+        with self._lock:
+            # Touched, replaced or pinned by a turn while the snapshot was being written: keep it
+            if self._sessions.get(session_id) is not entry or entry[1] != touched or session_id in self._turns:
+                return 0
+            entry[0] = None
+            entry[2] = version if self.store is not None else entry[2]
+            self._resident.pop(session_id, None)
+            self.spilled += 1
+        return 1
+
+    def _spill_target(self) -> SessionStore:
+        if self.store is not None:
+            return self.store
+        with self._lock:
+            if self._spill_store is None:
+                # A directory only this user can read (0700), since the database
+                # and its WAL files hold customer snapshots; removed at exit
+                self._spill_dir = tempfile.mkdtemp(prefix="loan-sessions-spill-")
+                self._spill_store = SQLiteSessionStore(os.path.join(self._spill_dir, "spill.db"))
+                atexit.register(self.close)
+            return self._spill_store
+
+    def close(self):
+        """Stop the janitor and delete the private spill file, if one was created"""
+        self.stop_janitor()
+        with self._lock:
+            spill_store, spill_dir = self._spill_store, self._spill_dir
+            if spill_dir is not None:
+                self._spill_store = self._spill_dir = None
+        if spill_dir is not None:
+            spill_store.close()
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+    def _forget(self, session_ids: List[str]):
+        # Spilled copies in the private spill file die with their sessions;
+        # the shared store purges its own rows
+        if self._spill_store is not None and self.store is None:
+            for sid in session_ids:
+                self._spill_store.delete(sid)
+
+    # --- expiry ---
+    def expire(self) -> int:
+        """Drop sessions idle for longer than the TTL; returns how many"""
+        expired = []
+        with self._lock:
+            cutoff = self.clock() - self.ttl
+            while self._sessions:
+                sid, entry = next(iter(self._sessions.items()))
+                if entry[1] >= cutoff:
+                    break
+                self._sessions.popitem(last=False)
+                self._resident.pop(sid, None)
+                expired.append(sid)
+            self.expired += len(expired)
+        self._forget(expired)
+        for sid in expired:
+            self._notify(sid, "expired")
+        return len(expired)
+
+    def start_janitor(self, interval: float = JANITOR_INTERVAL_SECONDS):
+        """Expire and spill sessions every interval seconds on a daemon thread"""
+        if self._janitor is not None and self._janitor.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.expire()
+                    self.spill_idle()
+                    self.relieve_memory_pressure()
+                    if self.store is not None:
+                        self.store.purge(time.time() - self.ttl)
+                except Exception as e:
+                    print(f"⚠️ Session janitor failed: {e}")
+
+        self._janitor = threading.Thread(target=run, name="session-janitor", daemon=True)
+        self._janitor.start()
+
+    def stop_janitor(self):
+        self._stop.set()
+
+    def _notify(self, session_id: str, reason: str):
+        if self.on_evict is not None:
+            self.on_evict(session_id, reason)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active": len(self._sessions),
+                "resident": len(self._resident),
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl,
+                "created": self.created,
+                "expired": self.expired,
+                "evicted": self.evicted,
+                "reloaded": self.reloaded,
+                "spilled": self.spilled,
+                "rehydrated": self.rehydrated,
+                "resident_mb": round(resident_mb() or 0, 1) or None,
+                "memory_high_water_mb": self.memory_high_water_mb or None,
+                "store": type(self.store).__name__ if self.store is not None else None,
+            }
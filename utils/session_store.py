@@ -0,0 +1,173 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, NamedTuple, Optional
+
+# SQLite file shared by every worker on the host; set SESSION_STORE_PATH="" to
+# keep sessions in process memory only (single worker)
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "sessions.db")
+
+COMPRESSION_LEVEL = 6
+
+
+class StoredSession(NamedTuple):
+    version: int
+    updated_at: float  # time.time() of the last save
+    snapshot: Dict[str, Any]
+
+
+def _plain(value: Any) -> Any:
+    # numpy scalars/arrays from the scoring code
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def encode_snapshot(snapshot: Dict[str, Any]) -> bytes:
+    """Compact JSON, zlib-compressed"""
+    raw = json.dumps(snapshot, separators=(",", ":"), ensure_ascii=False, default=_plain)
+    return zlib.compress(raw.encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decode_snapshot(blob: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class SessionStore:
+    """
+    Where conversation snapshots live between turns. Every save bumps the
+    session's version, so a worker holding a cached agent can tell with one
+    cheap lookup whether another worker has moved the conversation on.
+    """
+
+    def load(self, session_id: str) -> Optional[StoredSession]:
+        raise NotImplementedError
+
+    def version(self, session_id: str) -> Optional[int]:
+        """Current version, or None if the session is not stored"""
+        raise NotImplementedError
+
+    def save(self, session_id: str, snapshot: Dict[str, Any]) -> int:
+        """Store the snapshot and return its new version"""
+        raise NotImplementedError
+
+    def delete(self, session_id: str):
+        raise NotImplementedError
+
+    def purge(self, older_than: float) -> int:
+        """Delete sessions last saved before older_than (time.time()); returns how many"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MemorySessionStore(SessionStore):
+    """In-process store with the same encoding; for a single worker and for tests"""
+
+    def __init__(self):
+        self._rows: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def load(self, session_id: str) -> Optional[StoredSession]:
+        with self._lock:
+            row = self._rows.get(session_id)
+        if row is None:
+            return None
+        return StoredSession(row[0], row[1], decode_snapshot(row[2]))
+
+    def version(self, session_id: str) -> Optional[int]:
+        with self._lock:
+            row = self._rows.get(session_id)
+        return row[0] if row else None
+
+    def save(self, session_id: str, snapshot: Dict[str, Any]) -> int:
+        blob = encode_snapshot(snapshot)
+        with self._lock:
+            version = self._rows[session_id][0] + 1 if session_id in self._rows else 1
+            self._rows[session_id] = (version, time.time(), blob)
+        return version
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._rows.pop(session_id, None)
+
+    def purge(self, older_than: float) -> int:
+        with self._lock:
+            stale = [sid for sid, row in self._rows.items() if row[1] < older_than]
+            for sid in stale:
+                del self._rows[sid]
+        return len(stale)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Snapshots in a SQLite file (WAL mode), so every worker process on the host
+    can continue any conversation.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY, version INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL, data BLOB NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)")
+        self._db.commit()
+
+    def load(self, session_id: str) -> Optional[StoredSession]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT version, updated_at, data FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return StoredSession(row[0], row[1], decode_snapshot(row[2]))
+
+    def version(self, session_id: str) -> Optional[int]:
+        with self._lock:
+            row = self._db.execute("SELECT version FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def save(self, session_id: str, snapshot: Dict[str, Any]) -> int:
+        blob = encode_snapshot(snapshot)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO sessions VALUES (?, 1, ?, ?) ON CONFLICT(session_id) DO UPDATE SET"
+                " version = version + 1, updated_at = excluded.updated_at, data = excluded.data",
+                (session_id, time.time(), blob),
+            )
+            return self._db.execute("SELECT version FROM sessions WHERE session_id = ?", (session_id,)).fetchone()[0]
+
+    def delete(self, session_id: str):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def purge(self, older_than: float) -> int:
+        with self._lock, self._db:
+            return self._db.execute("DELETE FROM sessions WHERE updated_at < ?", (older_than,)).rowcount
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def default_session_store() -> Optional[SessionStore]:
+    """Store configured by SESSION_STORE_PATH, or None for process-local sessions"""
+    path = os.getenv("SESSION_STORE_PATH", DEFAULT_PATH)
+    if not path:
+        return None
+    try:
+        return SQLiteSessionStore(path)
+    except Exception as e:
+        print(f"⚠️ Could not open session store at {path}: {e}. Keeping sessions in memory only.")
+        return None
@@ -0,0 +1,240 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, Tuple
+
+# In-process tier size (entries)
+DEFAULT_MAX_ENTRIES = 5000
+
+# Disk tier: off unless TRANSLATION_MEMORY_PATH names a SQLite file shared by
+# the workers. It only holds text marked persist=True (catalog text, never
+# customer messages or personalised replies), expires rows after a TTL and
+# keeps at most DEFAULT_MAX_DISK_ENTRIES of the newest.
+DEFAULT_DISK_TTL_DAYS = 30
+DEFAULT_MAX_DISK_ENTRIES = 20000
+# Expired and surplus rows are pruned on open and after this many writes
+PRUNE_EVERY_WRITES = 500
+
+Key = Tuple[str, str, str]  # (source language, target language, source text)
+
+
+def _google_translate(text: str, source: str, target: str) -> str:
+    from deep_translator import GoogleTranslator
+    return GoogleTranslator(source=source, target=target).translate(text)
+
+
+class TranslationMemory:
+    """
+    Two-tier translation memory keyed on (source, target, text).
+    Lookups hit an in-process LRU first, then a SQLite table that survives
+    restarts; only a miss in both calls the translator. Concurrent misses for
+    the same string share one translator call. Only translations stored with
+    persist=True reach the disk tier.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path: Optional[str] = None,
+                 disk_ttl_days: float = DEFAULT_DISK_TTL_DAYS, max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.path = path
+        self.disk_ttl_seconds = disk_ttl_days * 86400
+        self.max_disk_entries = max_disk_entries
+        self._writes_since_prune = 0
+        self._entries: "OrderedDict[Key, str]" = OrderedDict()
+        self._inflight: Dict[Key, Future] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._translate_seconds = 0.0
+
+        if self.path:
+            self._open_db()
+
+    def translate(self, text: str, target: str, source: str = "auto", translator=None, persist: bool = False) -> str:
+        """
+        Translated text for (source, target). Raises if the translator fails,
+        so callers keep their own fallback. Failures are never cached.
+        persist=True also writes the result to the disk tier; pass it only
+        for text that carries no customer data.
+        """
+        if not text or not text.strip() or source == target:
+            return text
+        key = (source, target, text)
+
+        value = self.lookup(text, target, source)
+        if value is not None:
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        start = time.perf_counter()
+        try:
+            value = (translator or _google_translate)(text, source, target)
+            if not value:
+                raise ValueError("empty translation")
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self._translate_seconds += time.perf_counter() - start
+
+        self._remember(key, value)
+        if persist:
+            self._db_put(key, value)
+        future.set_result(value)
+        return value
+
+    def lookup(self, text: str, target: str, source: str = "auto") -> Optional[str]:
+        """Stored translation from either tier, or None. Never calls the translator."""
+        key = (source, target, text)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return value
+
+        value = self._db_get(key)
+        if value is not None:
+            with self._lock:
+                self.disk_hits += 1
+            self._remember(key, value)
+        return value
+
+    def store(self, text: str, target: str, source: str, value: str, persist: bool = False):
+        """Record a translation obtained elsewhere (e.g. from a batched request)"""
+        key = (source, target, text)
+        self._remember(key, value)
+        if persist:
+            self._db_put(key, value)
+
+    def _remember(self, key: Key, value: str):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # --- DISK TIER ---
+    def _open_db(self):
+        try:
+            self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " source TEXT NOT NULL, target TEXT NOT NULL, text TEXT NOT NULL,"
+                " translation TEXT NOT NULL, created_at REAL NOT NULL,"
+                " PRIMARY KEY (source, target, text))"
+            )
+            self._db.commit()
+            self.prune()
+        except Exception as e:
+            print(f"⚠️ Could not open translation memory at {self.path}: {e}. Using memory only.")
+            self._db = None
+
+    def prune(self) -> int:
+        """Delete expired rows and all but the newest max_disk_entries; returns rows deleted"""
+        if self._db is None:
+            return 0
+        try:
+            with self._lock:
+                deleted = self._db.execute(
+                    "DELETE FROM translations WHERE created_at < ?", (time.time() - self.disk_ttl_seconds,)
+                ).rowcount
+                deleted += self._db.execute(
+                    "DELETE FROM translations WHERE rowid IN ("
+                    " SELECT rowid FROM translations ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,),
+                ).rowcount
+                self._db.commit()
+                self._writes_since_prune = 0
+        except Exception as e:
+            print(f"⚠️ Translation memory prune failed: {e}")
+            return 0
+        return deleted
+
+    def _db_get(self, key: Key) -> Optional[str]:
+        if self._db is None:
+            return None
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT translation FROM translations WHERE source = ? AND target = ? AND text = ?"
+                    " AND created_at >= ?", (*key, time.time() - self.disk_ttl_seconds)
+                ).fetchone()
+        except Exception as e:
+            print(f"⚠️ Translation memory read failed: {e}")
+            return None
+        return row[0] if row else None
+
+    def _db_put(self, key: Key, value: str):
+        if self._db is None:
+            return
+        try:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)", (*key, value, time.time())
+                )
+                self._db.commit()
+                self._writes_since_prune += 1
+                due = self._writes_since_prune >= PRUNE_EVERY_WRITES
+        except Exception as e:
+            print(f"⚠️ Translation memory write failed: {e}")
+            return
+        if due:
+            self.prune()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses + self.coalesced
+            hits = self.memory_hits + self.disk_hits + self.coalesced
+            stored = None
+            if self._db is not None:
+                try:
+                    stored = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+                except Exception:
+                    pass
+            return {
+                "memory_entries": len(self._entries),
+                "disk_entries": stored,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "mean_translate_ms": round(self._translate_seconds / self.misses * 1000, 1) if self.misses else None,
+            }
+
+
+# Shared by every session in the process
+TRANSLATION_MEMORY = TranslationMemory(
+    path=os.getenv("TRANSLATION_MEMORY_PATH") or None,
+    disk_ttl_days=float(os.getenv("TRANSLATION_MEMORY_TTL_DAYS", DEFAULT_DISK_TTL_DAYS)),
+    max_disk_entries=int(os.getenv("TRANSLATION_MEMORY_MAX_ENTRIES", DEFAULT_MAX_DISK_ENTRIES)),
+)
+
+
+def translate(text: str, target: str, source: str = "auto") -> str:
+    """Translate through the shared translation memory"""
+    return TRANSLATION_MEMORY.translate(text, target, source)
@@ -0,0 +1,198 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, List, Any, Callable, Collection, Optional
+
+from utils.translation_memory import TranslationMemory, TRANSLATION_MEMORY, _google_translate
+
+TRANSLATION_WORKERS = 8
+
+# Seconds a turn will wait for a translation before falling back to English
+# (or, for inbound messages, to the untranslated text)
+DEFAULT_DEADLINE = 4.0
+
+# Segments are batched by joining them on newlines, so only single-line
+# segments can share a request; the reply must come back with as many lines
+BATCH_SEPARATOR = "\n"
+
+
+class PendingTranslation:
+    """A submitted translation with its own deadline and fallback text"""
+
+    def __init__(self, pipeline: "TranslationPipeline", future: Future, fallback: str, deadline_at: float):
+        self._pipeline = pipeline
+        self._future = future
+        self.fallback = fallback
+        self.deadline_at = deadline_at
+
+    def done(self) -> bool:
+        return self._future.done() or time.monotonic() >= self.deadline_at
+
+    def result(self) -> str:
+        return self._pipeline._wait(self._future, self.fallback, self.deadline_at)
+
+
+class TranslationPipeline:
+    """
+    Runs translations on a shared thread pool with per-call deadlines.
+    Independent texts are translated concurrently, several short segments go
+    out as one request, and anything that misses its deadline falls back to
+    the source text. A call that times out keeps running in the background and
+    still lands in the translation memory for next time.
+    """
+
+    def __init__(
+        self,
+        memory: TranslationMemory = TRANSLATION_MEMORY,
+        translator: Callable[[str, str, str], str] = _google_translate,
+        workers: int = TRANSLATION_WORKERS,
+        deadline: float = DEFAULT_DEADLINE,
+    ):
+        self.memory = memory
+        self.translator = translator
+        self.deadline = deadline
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate")
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.batched_requests = 0
+        self.batched_segments = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    # --- single texts ---
+    def submit(self, text: str, target: str, source: str = "en", deadline: Optional[float] = None,
+               persist: bool = False) -> PendingTranslation:
+        """
+        Start translating text now; .result() waits until the deadline at most.
+        persist=True lets the translation reach the memory's disk tier (text
+        without customer data only).
+        """
+        deadline_at = time.monotonic() + (self.deadline if deadline is None else deadline)
+        if not text or not text.strip() or source == target:
+            future = Future()
+            future.set_result(text)
+            return PendingTranslation(self, future, text, deadline_at)
+
+        cached = self.memory.lookup(text, target, source)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+        else:
+            with self._lock:
+                self.requests += 1
+            future = self._executor.submit(self.memory.translate, text, target, source, self.translator, persist)
+        return PendingTranslation(self, future, text, deadline_at)
+
+    def translate(self, text: str, target: str, source: str = "en", deadline: Optional[float] = None,
+                  persist: bool = False) -> str:
+        """Translated text, or text itself if translation fails or misses the deadline"""
+        return self.submit(text, target, source, deadline, persist).result()
+
+    # --- several texts ---
+    def translate_many(
+        self,
+        texts: List[str],
+        target: str,
+        source: str = "en",
+        deadline: Optional[float] = None,
+        persist: Collection[str] = (),
+    ) -> List[str]:
+        """
+        Translate all texts under one shared deadline. Cached texts are served
+        directly; single-line misses share one request, and the rest (or a
+        batch that comes back malformed) are translated concurrently. Texts
+        in persist may be written to the memory's disk tier.
+        """
+        deadline_at = time.monotonic() + (self.deadline if deadline is None else deadline)
+        results = list(texts)
+        misses: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if not text or not text.strip() or source == target:
+                continue
+            cached = self.memory.lookup(text, target, source)
+            if cached is not None:
+                results[i] = cached
+            else:
+                misses.setdefault(text, []).append(i)
+        if not misses:
+            return results
+
+        batchable = [t for t in misses if BATCH_SEPARATOR not in t]
+        singles = [t for t in misses if BATCH_SEPARATOR in t]
+        if len(batchable) > 1:
+            batch = self._executor.submit(self._translate_batch, batchable, target, source, persist)
+            with self._lock:
+                self.requests += 1
+                self.batched_requests += 1
+                self.batched_segments += len(batchable)
+        else:
+            batch = None
+            singles += batchable
+
+        pending = {text: self.submit(text, target, source, persist=text in persist) for text in singles}
+        for text, job in pending.items():
+            job.deadline_at = deadline_at
+            for i in misses[text]:
+                results[i] = job.result()
+
+        if batch is not None:
+            translated = self._wait(batch, None, deadline_at)
+            if translated is None:
+                # Batch failed or came back with the wrong number of lines:
+                # fall back to concurrent single requests for what time is left
+                retry = {text: self.submit(text, target, source, persist=text in persist) for text in batchable}
+                for text, job in retry.items():
+                    job.deadline_at = deadline_at
+                    translated_text = job.result()
+                    for i in misses[text]:
+                        results[i] = translated_text
+            else:
+                for text, translated_text in zip(batchable, translated):
+                    for i in misses[text]:
+                        results[i] = translated_text
+        return results
+
+    def _translate_batch(self, texts: List[str], target: str, source: str,
+                         persist: Collection[str] = ()) -> Optional[List[str]]:
+        joined = self.translator(BATCH_SEPARATOR.join(texts), source, target) or ""
+        lines = joined.split(BATCH_SEPARATOR)
+        if len(lines) != len(texts) or not all(line.strip() for line in lines):
+            return None
+        for text, line in zip(texts, lines):
+            self.memory.store(text, target, source, line.strip(), persist=text in persist)
+        return [line.strip() for line in lines]
+
+    # --- arbitrary work (LLM translations) ---
+    def run(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Run fn on the translation pool; pair with wait() for a deadline"""
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def wait(self, future: Future, fallback: Any, deadline: Optional[float] = None) -> Any:
+        deadline_at = time.monotonic() + (self.deadline if deadline is None else deadline)
+        return self._wait(future, fallback, deadline_at)
+
+    def _wait(self, future: Future, fallback: Any, deadline_at: float) -> Any:
+        try:
+            return future.result(timeout=max(0.0, deadline_at - time.monotonic()))
+        except FutureTimeout:
+            with self._lock:
+                self.timeouts += 1
+        except Exception:
+            with self._lock:
+                self.errors += 1
+        return fallback
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "batched_requests": self.batched_requests,
+                "batched_segments": self.batched_segments,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+                "deadline_seconds": self.deadline,
+            }
+
+
+# Shared by every session in the process
+TRANSLATION_PIPELINE = TranslationPipeline()
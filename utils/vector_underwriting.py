@@ -0,0 +1,64 @@
+import numpy as np
+
+from agents.underwriting import MIN_CREDIT_SCORE, MAX_EMI_RATIO, INSTANT_APPROVAL_RATIO, SALARY_SLIP_RATIO
+
+# Underwriting, pricing and EMI rules over NumPy arrays, for batch and what-if
+# runs. Each function mirrors one scalar method and broadcasts over its
+# arguments, so customers x requests evaluate in one call.
+
+# Decision codes, indexes into DECISIONS
+APPROVED, REQUIRES_SALARY_SLIP, REJECTED = 0, 1, 2
+DECISIONS = np.array(["APPROVED", "REQUIRES_SALARY_SLIP", "REJECTED"])
+
+# MasterAgent._handle_document_upload prices the EMI at a flat rate for the salary check
+SALARY_CHECK_RATE = 12.0
+
+
+def evaluate_loan(amount, pre_approved_limit, credit_score,
+                  min_credit_score=MIN_CREDIT_SCORE,
+                  instant_ratio=INSTANT_APPROVAL_RATIO,
+                  salary_slip_ratio=SALARY_SLIP_RATIO):
+    """
+    UnderwritingAgent.evaluate_loan: returns (decision codes, amount / pre-approved limit).
+    A NaN credit score (no bureau record) is rejected.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.true_divide(amount, pre_approved_limit)
+    decision = np.where(ratio <= instant_ratio, APPROVED,
+                        np.where(ratio <= salary_slip_ratio, REQUIRES_SALARY_SLIP, REJECTED))
+    decision = np.where(np.asarray(credit_score) >= min_credit_score, decision, REJECTED)
+    return decision.astype(np.int8), ratio
+
+
+def evaluate_with_salary(monthly_salary, monthly_emi, max_emi_ratio=MAX_EMI_RATIO):
+    """UnderwritingAgent.evaluate_with_salary: returns (approved mask, EMI as % of salary)"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        emi_ratio = np.true_divide(monthly_emi, monthly_salary) * 100
+    return emi_ratio <= max_emi_ratio, emi_ratio
+
+
+def emi(principal, annual_rate, tenure_months):
+    """Reducing-balance EMI (utils.emi_calc.calculate_emi, unrounded)"""
+    principal = np.asarray(principal, dtype=np.float64)
+    monthly_rate = np.asarray(annual_rate, dtype=np.float64) / (12 * 100)
+    tenure_months = np.asarray(tenure_months, dtype=np.float64)
+    growth = (1 + monthly_rate) ** tenure_months
+    with np.errstate(divide="ignore", invalid="ignore"):
+        amortized = principal * monthly_rate * growth / (growth - 1)
+        flat = principal / tenure_months
+    return np.where(monthly_rate == 0, flat, amortized)
+
+
+def interest_rate(amount, tenure_months, credit_score, safety_score):
+    """SalesAgent._calculate_interest_rate"""
+    amount = np.asarray(amount)
+    tenure_months = np.asarray(tenure_months)
+    credit_score = np.asarray(credit_score)
+    safety_score = np.asarray(safety_score)
+
+    rate = np.full(np.broadcast(amount, tenure_months, credit_score, safety_score).shape, 11.5)
+    rate -= np.select([credit_score >= 800, credit_score >= 750, credit_score < 700], [1.0, 0.5, -1.0], 0.0)
+    rate -= np.select([safety_score >= 0.9, safety_score <= 0.3], [0.25, -0.25], 0.0)
+    rate -= np.select([amount <= 200000, amount >= 1000000], [0.5, -0.5], 0.0)
+    rate -= np.select([tenure_months <= 12, tenure_months >= 48], [0.5, -0.5], 0.0)
+    return np.round(rate, 2)
@@ -1,10 +1,24 @@
 import os
-from datetime import datetime, timedelta
+import json
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
 from dotenv import load_dotenv
 
 from main import MasterAgent  # uses your sales.py, risk.py, etc.
+from agents.sales import fast_path_stats
+from utils.model_router import get_routing_stats, get_cache_stats
+from utils.faq_index import FAQ_INDEX
+from utils.conversation_context import ConversationContext
+from utils.translation_memory import TRANSLATION_MEMORY
+from utils.translation_pipeline import TRANSLATION_PIPELINE
+from utils.message_catalog import CATALOG
+from utils.language_detect import LANGUAGE_DETECTOR
+from utils.session_manager import SessionManager
+from utils.session_store import default_session_store
+from utils.prefetch import prefetch_stats
+from utils.credit_bureau import CREDIT_BUREAU
+from utils.kyc import kyc_stats
+from state import ConversationStage
 
 # ---------- CONFIG ----------
 
@@ -23,34 +37,28 @@ app = Flask(
     static_url_path="/"
 )
 
-# ---------- CHATBOT SESSION LAYER ----------
-
-sessions: dict[str, dict] = {}
-SESSION_TIMEOUT = timedelta(minutes=30)
-
-
-def clean_expired_sessions():
-    now = datetime.now()
-    expired = [
-        sid for sid, data in sessions.items()
-        if now - data["last_activity"] > SESSION_TIMEOUT
-    ]
-    for sid in expired:
-        del sessions[sid]
+# Load language profiles before the first user message arrives
+LANGUAGE_DETECTOR.warm()
 
+# ---------- CHATBOT SESSION LAYER ----------
 
-def get_or_create_session(session_id: str) -> MasterAgent:
-    clean_expired_sessions()
-    if session_id in sessions:
-        sessions[session_id]["last_activity"] = datetime.now()
-        return sessions[session_id]["agent"]
-
+def _new_session() -> MasterAgent:
     agent = MasterAgent(GROQ_API_KEY)
-    sessions[session_id] = {"agent": agent, "last_activity": datetime.now()}
     # send initial greeting from backend
     agent.start_conversation()
     return agent
 
+
+# TTL + LRU bounded; expired sessions are swept by a background janitor.
+# Snapshots go to the shared session store after every turn, so any worker
+# can continue any conversation.
+sessions = SessionManager(
+    _new_session,
+    store=default_session_store(),
+    restore=lambda snapshot: MasterAgent(GROQ_API_KEY).restore(snapshot),
+)
+sessions.start_janitor()
+
 from user_store import get_applications
 
 @app.get("/api/profile")
@@ -100,32 +108,34 @@ def upload_document():
     file.save(filepath)
     
     # Update the agent's state
-    if session_id in sessions:
-        agent = sessions[session_id]["agent"]
-        agent.state["documents_uploaded"] = True
-        agent.state["uploaded_file"] = filename
-
-        # Try to auto-read salary from the PDF
-        try:
-            analysis = agent.upload_agent.analyze_uploaded_file(filepath)
-        except Exception as e:
-            analysis = {"success": False, "message": f"Analyzer error: {e}"}
-
-        if analysis.get("monthly_salary"):
-            # Update customer salary from slip
-            agent.state.setdefault("customer_data", {})
-            agent.state["customer_data"]["salary"] = int(analysis["monthly_salary"])
-
-        # Process the upload through the agent (moves stage forward)
-        reply = agent.process_message(f"I have uploaded my document: {filename}")
-
-        return jsonify({
-            "success": True,
-            "filename": filename,
-            "reply": reply,
-            "stage": agent.state.get("stage"),
-            "analysis": analysis,
-        })
+    with sessions.turn(session_id, create=False) as agent:
+        if agent is not None:
+            agent.state.documents_uploaded = True
+            agent.state.uploaded_file = filename
+
+            # Try to auto-read salary from the PDF
+            try:
+                analysis = agent.upload_agent.analyze_uploaded_file(filepath)
+            except Exception as e:
+                analysis = {"success": False, "message": f"Analyzer error: {e}"}
+
+            if analysis.get("monthly_salary"):
+                # Update customer salary from slip
+                if agent.state.customer_data is None:
+                    agent.state.customer_data = {}
+                agent.state.customer_data["salary"] = int(analysis["monthly_salary"])
+
+            # Process the upload through the agent (moves stage forward)
+            reply = agent.process_message(f"I have uploaded my document: {filename}")
+            sessions.save(session_id)
+
+            return jsonify({
+                "success": True,
+                "filename": filename,
+                "reply": reply,
+                "stage": agent.state.stage,
+                "analysis": analysis,
+            })
     
     return jsonify({
         "success": True,
@@ -143,68 +153,141 @@ def chat():
     if not session_id:
         return jsonify({"error": "session_id required"}), 400
 
+    # Restart and initial greeting never touch the LLM
+    control_reply = _handle_control_message(session_id, message, language)
+    if control_reply:
+        return jsonify(control_reply)
+
+    if not message:
+        return jsonify({"error": "message required"}), 400
+
+    with sessions.turn(session_id) as agent:
+        agent.user_language = language  # ADD THIS
+        agent.sales_agent.set_language(language)
+        reply = agent.process_message(message)
+        sessions.save(session_id)
+
+        return jsonify({
+            "reply": reply,
+            "stage": agent.state.stage,
+            "final_decision": agent.state.final_decision,
+        })
+
+
+@app.post("/api/chat/stream")
+def chat_stream():
+    """
+    Server-Sent Events variant of /api/chat.
+    Emits "token" events as the LLM reply is generated, then one "done" event
+    with the same payload /api/chat returns (its reply is authoritative).
+    """
+    data = request.get_json(force=True)
+    session_id = data.get("session_id")
+    message = data.get("message", "").strip()
+    language = data.get("language", "en")
+
+    if not session_id:
+        return jsonify({"error": "session_id required"}), 400
+
+    control_reply = _handle_control_message(session_id, message, language)
+    if not control_reply and not message:
+        return jsonify({"error": "message required"}), 400
+
+    def generate():
+        if control_reply:
+            yield _sse("done", control_reply)
+            return
+
+        # Pinned for the whole stream, however long the client holds it open
+        with sessions.turn(session_id) as agent:
+            agent.user_language = language
+            agent.sales_agent.set_language(language)
+            for event in agent.process_message_stream(message):
+                if event["type"] == "token":
+                    yield _sse("token", {"text": event["text"]})
+                else:
+                    sessions.save(session_id)
+                    yield _sse("done", {
+                        "reply": event["reply"],
+                        "stage": agent.state.stage,
+                        "final_decision": agent.state.final_decision,
+                    })
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _handle_control_message(session_id: str, message: str, language: str):
+    """Handle restart / __INIT__ messages. Returns a reply payload, or None."""
     text = message.lower()
 
-    # ---------- NEW: restart handling ----------
+    # ---------- restart handling ----------
     if text in ["restart", "**restart**", "start new", "new loan"]:
         # drop old session (if any)
-        if session_id in sessions:
-            del sessions[session_id]
-
-        # create a fresh agent
-        agent = get_or_create_session(session_id)
+        sessions.discard(session_id)
 
         reply = (
             "Starting a fresh loan application. 👋\n\n"
             "Please share your registered phone number to begin."
         )
 
-        # reset state + history for safety
-        agent.conversation_history = [{"role": "assistant", "content": reply}]
-        agent.state["stage"] = "initial"
-        agent.state["final_decision"] = None
-
-        return jsonify({
+        # create a fresh agent
+        with sessions.turn(session_id) as agent:
+            # reset state + history for safety
+            agent.conversation_history = ConversationContext([{"role": "assistant", "content": reply}])
+            agent.state.stage = ConversationStage.INITIAL
+            agent.state.final_decision = None
+            sessions.save(session_id)
+
+        return {
             "reply": reply,
             "stage": "initial",
             "final_decision": None,
-        })
-    # ---------- END NEW BLOCK ----------
+        }
 
-        # Handle initial greeting request
+    # Handle initial greeting request
     if message == "__INIT__":
-        agent = get_or_create_session(session_id)
-        agent.user_language = language  # ADD THIS
-        agent.sales_agent.set_language(language)
-        greeting = agent.sales_agent.get_initial_greeting()
-        agent.conversation_history = [{"role": "assistant", "content": greeting}]
-        return jsonify({
-        "reply": greeting,
-        "stage": "initial",
-        "final_decision": None,
-    })
-
-    if not message:
-        return jsonify({"error": "message required"}), 400
-
-    agent = get_or_create_session(session_id)
-    agent.user_language = language  # ADD THIS
-    agent.sales_agent.set_language(language)
-    reply = agent.process_message(message)
-
+        with sessions.turn(session_id) as agent:
+            agent.user_language = language
+            agent.sales_agent.set_language(language)
+            greeting = agent.sales_agent.get_initial_greeting()
+            agent.conversation_history = ConversationContext([{"role": "assistant", "content": greeting}])
+            sessions.save(session_id)
+        return {
+            "reply": greeting,
+            "stage": "initial",
+            "final_decision": None,
+        }
 
-    return jsonify({
-        "reply": reply,
-        "stage": agent.state["stage"],
-        "final_decision": agent.state.get("final_decision"),
-    })
+    return None
 
 
 @app.get("/api/status")
 def status():
+    llm_routes = get_routing_stats()
+    qa_latency_ms = llm_routes.get("post_completion_qa", {}).get("p50_latency_ms")
     return {
         "status": "ok",
         "active_sessions": len(sessions),
+        "sessions": sessions.stats(),
+        "sales_fast_path": fast_path_stats.snapshot(),
+        "llm_routes": llm_routes,
+        "llm_cache": get_cache_stats(),
+        "faq_index": FAQ_INDEX.stats(llm_latency_ms=qa_latency_ms),
+        "translation_memory": TRANSLATION_MEMORY.stats(),
+        "translation_pipeline": TRANSLATION_PIPELINE.stats(),
+        "message_catalog_coverage": CATALOG.coverage(),
+        "language_detection": LANGUAGE_DETECTOR.stats(),
+        "prefetch": prefetch_stats.snapshot(),
+        "credit_bureau": CREDIT_BUREAU.stats(),
+        "kyc": kyc_stats.snapshot(),
     }
 
 # ---------- SERVE FRONTEND ----------
@@ -4,8 +4,10 @@ from twilio.rest import Client
 from twilio.twiml.messaging_response import MessagingResponse
 from dotenv import load_dotenv
 from main import MasterAgent
+from utils.language_detect import LANGUAGE_DETECTOR
+from utils.session_manager import SessionManager
+from utils.session_store import default_session_store
 import json
-from datetime import datetime, timedelta
 
 import os
 from dotenv import load_dotenv
@@ -36,6 +38,9 @@ else:
 
 app = Flask(__name__)
 
+# Load language profiles before the first user message arrives
+LANGUAGE_DETECTOR.warm()
+
 # Directory where sanction letters are stored (same as web API)
 SANCTION_DIR = os.path.join(os.path.dirname(__file__), "sanction_letters")
 
@@ -55,47 +60,20 @@ if not all([GROQ_API_KEY, TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_WHATSAPP
 else:
     print("✅ All credentials loaded successfully.")
 
-# In-memory session storage (use Redis in production)
-# Structure: {phone_number: {"agent": MasterAgent, "last_activity": datetime}}
-sessions = {}
-
-# Session timeout (30 minutes)
-SESSION_TIMEOUT = timedelta(minutes=30)
+def _log_removed_session(phone_number: str, reason: str):
+    print(f"🗑️ Cleaned {reason} session for {phone_number}")
 
 
-def get_or_create_session(phone_number: str) -> MasterAgent:
-    """
-    Get existing session or create a new one for the phone number
-    """
-    # Clean expired sessions
-    clean_expired_sessions()
-    
-    if phone_number in sessions:
-        # Update last activity
-        sessions[phone_number]["last_activity"] = datetime.now()
-        return sessions[phone_number]["agent"]
-    else:
-        # Create new session
-        agent = MasterAgent(GROQ_API_KEY)
-        sessions[phone_number] = {
-            "agent": agent,
-            "last_activity": datetime.now()
-        }
-        return agent
-
-
-def clean_expired_sessions():
-    """
-    Remove sessions that have been inactive for more than SESSION_TIMEOUT
-    """
-    now = datetime.now()
-    expired = [
-        phone for phone, data in sessions.items()
-        if now - data["last_activity"] > SESSION_TIMEOUT
-    ]
-    for phone in expired:
-        del sessions[phone]
-        print(f"🗑️ Cleaned expired session for {phone}")
+# Sessions keyed by phone number, bounded by TTL and count (see
+# utils/session_manager.py). Snapshots go to the shared session store after
+# every turn, so any worker can pick up the next message.
+sessions = SessionManager(
+    lambda: MasterAgent(GROQ_API_KEY),
+    on_evict=_log_removed_session,
+    store=default_session_store(),
+    restore=lambda snapshot: MasterAgent(GROQ_API_KEY).restore(snapshot),
+)
+sessions.start_janitor()
 
 
 def send_whatsapp_message(to_number: str, message: str, media_url: str = None):
@@ -142,27 +120,27 @@ def webhook():
 
         print(f"📱 Received from {from_number}: {incoming_msg} (media count: {num_media})")
         
-        # Get or create agent for this user
-        agent = get_or_create_session(from_number)
-
-        # If user has sent a media file (e.g., salary slip PDF), acknowledge it.
-        # Note: The core loan logic currently simulates uploads; here we at least
-        # mirror that behaviour for WhatsApp by confirming receipt.
-        if num_media > 0:
-            media_content_type = request.values.get("MediaContentType0", "")
-            media_url = request.values.get("MediaUrl0", "")
-            print(f"📎 Incoming media: {media_url} ({media_content_type})")
-
-            if media_content_type == "application/pdf":
-                incoming_msg = f"I have uploaded my salary slip via WhatsApp: {media_url}"
+        # Get or create agent for this user, pinned until its reply is saved
+        with sessions.turn(from_number) as agent:
+            # If user has sent a media file (e.g., salary slip PDF), acknowledge it.
+            # Note: The core loan logic currently simulates uploads; here we at least
+            # mirror that behaviour for WhatsApp by confirming receipt.
+            if num_media > 0:
+                media_content_type = request.values.get("MediaContentType0", "")
+                media_url = request.values.get("MediaUrl0", "")
+                print(f"📎 Incoming media: {media_url} ({media_content_type})")
+
+                if media_content_type == "application/pdf":
+                    incoming_msg = f"I have uploaded my salary slip via WhatsApp: {media_url}"
+                else:
+                    incoming_msg = f"I have uploaded a document via WhatsApp: {media_url}"
+
+            # Handle first message
+            if not agent.conversation_history:
+                reply_text = agent.start_conversation()
             else:
-                incoming_msg = f"I have uploaded a document via WhatsApp: {media_url}"
-
-        # Handle first message
-        if not agent.conversation_history:
-            reply_text = agent.start_conversation()
-        else:
-            reply_text = agent.process_message(incoming_msg)
+                reply_text = agent.process_message(incoming_msg)
+            sessions.save(from_number)
 
         print(f"🤖 Replying with: {reply_text}")
 
@@ -209,7 +187,8 @@ def status():
     return {
         "status": "running",
         "active_sessions": len(sessions),
-        "sessions": list(sessions.keys())
+        "sessions": sessions.keys(),
+        "session_limits": sessions.stats()
     }
 
 